@@ -6,9 +6,19 @@ __email__ = "mathis.nicoli@gmail.com"
 VERSION = (0, 2, 0)
 __version__ = ".".join(map(str, VERSION))
 
+# Library logger is silent by default, command line interfaces call enable_logging
 logger: logging.Logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+logger.addHandler(logging.NullHandler())
 
-logger.addHandler(console_handler)
+
+def enable_logging(level: int = logging.DEBUG) -> None:
+    """Print game logs in the console
+
+    Args:
+        level (int, optional): logging level. Defaults to logging.DEBUG.
+    """
+    logger.setLevel(level)
+    if not any(isinstance(handler, logging.StreamHandler) for handler in logger.handlers):
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+        logger.addHandler(console_handler)
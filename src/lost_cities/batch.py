@@ -0,0 +1,197 @@
+from typing import Literal, Optional, Union
+
+import numpy as np
+
+from lost_cities.scoring import EMPTY, MAX_EXPEDITION, score_boards
+
+HAND_SIZE: int = 8
+
+
+def encode(color_id: Union[int, np.ndarray], value: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+    """Encode a card as an integer
+
+    Args:
+        color_id (Union[int, np.ndarray]): color index in lost_cities.card.COLORS
+        value (Union[int, np.ndarray]): value of the card, 0 for a wager
+
+    Returns:
+        Union[int, np.ndarray]: card code
+    """
+    return color_id * 16 + value
+
+
+class BatchLostCitiesGame:
+    """Many independent games played in lockstep over numpy arrays. Cards are encoded as color_id * 16 + value, every
+    game shares the same turn counter and finished games (empty deck) are masked out of every operation."""
+
+    def __init__(self, nb_games: int, version: Literal[5, 6] = 5, seed: Optional[int] = None) -> None:
+        """Constructor of a batch of games
+
+        Args:
+            nb_games (int): number of games played in lockstep
+            version (Literal[5, 6], optional): Which version to play. Defaults to 5.
+            seed (Optional[int], optional): seed of the numpy generator. Defaults to None.
+        """
+        if version not in (5, 6):
+            raise AttributeError(f"version should be 5 or 6 not {version}")
+        self.nb_games: int = nb_games
+        self.nb_colors: int = version
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+        self.deck_total: int = version * MAX_EXPEDITION
+        self.current_player: int = 0
+
+        n, c = nb_games, version
+        self.deck: np.ndarray = np.empty((n, self.deck_total), dtype=np.int16)
+        self.deck_size: np.ndarray = np.zeros(n, dtype=np.int16)
+        self.hands: np.ndarray = np.full((n, 2, HAND_SIZE), EMPTY, dtype=np.int16)
+        self.boards: np.ndarray = np.full((n, 2, c, MAX_EXPEDITION), EMPTY, dtype=np.int16)
+        self.board_count: np.ndarray = np.zeros((n, 2, c), dtype=np.int16)
+        self.board_top: np.ndarray = np.full((n, 2, c), EMPTY, dtype=np.int16)
+        self.discard_piles: np.ndarray = np.full((n, c, MAX_EXPEDITION), EMPTY, dtype=np.int16)
+        self.discard_size: np.ndarray = np.zeros((n, c), dtype=np.int16)
+        self.discarded_color: np.ndarray = np.full(n, EMPTY, dtype=np.int16)
+        self._games: np.ndarray = np.arange(n)
+
+    @property
+    def active(self) -> np.ndarray:
+        """Mask of games still running, a game ends when its deck is empty"""
+        return self.deck_size > 0
+
+    def setup(self) -> None:
+        """Shuffles every deck and gives 8 cards to each player, dealing in the same order as LostCitiesGame"""
+        values = np.array(list(range(2, 11)) + [0] * 3, dtype=np.int16)
+        prototype = encode(
+            np.repeat(np.arange(self.nb_colors, dtype=np.int16), len(values)), np.tile(values, self.nb_colors)
+        )
+        self.deck[:] = self.rng.permuted(np.broadcast_to(prototype, self.deck.shape), axis=1)
+
+        dealt = self.deck[:, : -2 * HAND_SIZE - 1 : -1]
+        self.hands[:, 0] = dealt[:, 0::2]
+        self.hands[:, 1] = dealt[:, 1::2]
+        self.deck_size[:] = self.deck_total - 2 * HAND_SIZE
+
+        self.boards.fill(EMPTY)
+        self.board_count.fill(0)
+        self.board_top.fill(EMPTY)
+        self.discard_piles.fill(EMPTY)
+        self.discard_size.fill(0)
+        self.discarded_color.fill(EMPTY)
+        self.current_player = 0
+
+    def switch_player(self) -> None:
+        """Change player cursor"""
+        self.current_player = 1 - self.current_player
+
+    def playable(self) -> np.ndarray:
+        """Which cards of the current player's hand can be played
+
+        Returns:
+            np.ndarray: boolean mask (games x hand slots)
+        """
+        hand = self.hands[:, self.current_player]
+        colors = np.where(hand >= 0, hand >> 4, 0)
+        tops = np.take_along_axis(self.board_top[:, self.current_player], colors, axis=1)
+        return (hand >= 0) & ((hand & 15) >= tops) & self.active[:, None]
+
+    def play_card(self, slots: np.ndarray) -> np.ndarray:
+        """Play a card of the current player's hand in each game, if allowed
+
+        Args:
+            slots (np.ndarray): hand slot to play for each game
+
+        Returns:
+            np.ndarray: mask of games where the card has been played
+        """
+        played = np.take_along_axis(self.playable(), slots[:, None], axis=1)[:, 0]
+        games, slots = self._games[played], slots[played]
+        hand = self.hands[:, self.current_player]
+        cards = hand[games, slots]
+        colors, values = cards >> 4, cards & 15
+        p = self.current_player
+
+        self.boards[games, p, colors, self.board_count[games, p, colors]] = values
+        self.board_count[games, p, colors] += 1
+        self.board_top[games, p, colors] = values
+        hand[games, slots] = EMPTY
+
+        return played
+
+    def discard_card(self, slots: np.ndarray, mask: Optional[np.ndarray] = None) -> None:
+        """Discard a card of the current player's hand in each running game
+
+        Args:
+            slots (np.ndarray): hand slot to discard for each game
+            mask (Optional[np.ndarray], optional): games where to discard. Defaults to None, every running game.
+        """
+        hand = self.hands[:, self.current_player]
+        selected = self.active & (hand[self._games, slots] >= 0)
+        if mask is not None:
+            selected &= mask
+        games = self._games[selected]
+        slots = slots[games]
+
+        cards = hand[games, slots]
+        colors = cards >> 4
+        self.discard_piles[games, colors, self.discard_size[games, colors]] = cards
+        self.discard_size[games, colors] += 1
+        self.discarded_color[games] = colors
+        hand[games, slots] = EMPTY
+
+    def pick_card(self, piles: np.ndarray) -> None:
+        """Pick a card either in deck either in a discard pile, for each running game missing a card
+
+        Args:
+            piles (np.ndarray): color index of the discard pile to pick in, EMPTY for the deck. Falls back to the deck
+                when the pile is empty or holds the card discarded this turn.
+        """
+        hand = self.hands[:, self.current_player]
+        missing = (hand == EMPTY).any(axis=1) & self.active
+        colors = np.clip(piles, 0, self.nb_colors - 1)
+        sizes = np.take_along_axis(self.discard_size, colors[:, None], axis=1)[:, 0]
+        from_discard = missing & (piles >= 0) & (sizes > 0) & (piles != self.discarded_color)
+        from_deck = missing & ~from_discard
+        self.discarded_color.fill(EMPTY)
+
+        slots = np.argmax(hand == EMPTY, axis=1)
+        games = self._games[from_deck]
+        self.deck_size[games] -= 1
+        hand[games, slots[games]] = self.deck[games, self.deck_size[games]]
+
+        games, colors = self._games[from_discard], colors[from_discard]
+        self.discard_size[games, colors] -= 1
+        hand[games, slots[games]] = self.discard_piles[games, colors, self.discard_size[games, colors]]
+        self.discard_piles[games, colors, self.discard_size[games, colors]] = EMPTY
+
+    def play_random_round(self) -> None:
+        """Play one round in every running game: a random playable card (or a random discard if nothing is playable)
+        then the deck or a random discard pile, with even odds"""
+        n = self.nb_games
+        playable = self.playable()
+        noise = self.rng.random((n, HAND_SIZE))
+        can_play: np.ndarray = np.asarray(playable.any(axis=1))
+        slots = np.where(can_play, np.argmax(np.where(playable, noise, -1.0), axis=1), np.argmax(noise, axis=1))
+
+        self.play_card(slots)
+        self.discard_card(slots, mask=~can_play)
+        piles = self.rng.integers(0, self.nb_colors, n, dtype=np.int16)
+        self.pick_card(np.where(self.rng.random(n) < 0.5, piles, EMPTY))
+        self.switch_player()
+
+    def play_random_games(self) -> np.ndarray:
+        """Setup and play every game until the end with random players
+
+        Returns:
+            np.ndarray: final scores (games x players)
+        """
+        self.setup()
+        while self.active.any():
+            self.play_random_round()
+        return self.compute_score()[0]
+
+    def compute_score(self) -> tuple[np.ndarray, np.ndarray]:
+        """Compute scores with the rules of Player.compute_one_score
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: total scores (games x players) and detail by color (games x players x colors)
+        """
+        return score_boards(self.boards)
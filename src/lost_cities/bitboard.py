@@ -0,0 +1,212 @@
+from typing import TYPE_CHECKING, Iterable, Iterator, Literal
+
+from lost_cities.card import VALUE_INDEXES, VALUES, Card
+
+if TYPE_CHECKING:  # pragma: nocover
+    from lost_cities.engine import GameState
+    from lost_cities.game import LostCitiesGame
+
+# A color of a hand or a board is a 12 bits mask: bits 0 to 2 are the wager copies (filled from bit 0), bits 3 to 11
+# are the values 2 to 10 (bit value + 1).
+WAGER_BITS: int = 0b111
+FULL_MASK: int = 0xFFF
+EMPTY_TOP: int = -1
+
+# PLAYABLE[top + 1]: cards of a color that can be played on an expedition ending with top (-1 when empty)
+PLAYABLE: tuple[int, ...] = tuple(
+    FULL_MASK if top <= 0 else FULL_MASK & ~((1 << (top + 1)) - 1) for top in range(-1, 11)
+)
+POPCOUNT: tuple[int, ...] = tuple(bin(mask).count("1") for mask in range(FULL_MASK + 1))
+# SUM[mask >> 3]: sum of the numbered cards of a mask
+SUM: tuple[int, ...] = tuple(sum(value for value in range(2, 11) if mask >> (value - 2) & 1) for mask in range(512))
+# CLOSE[top]: numbered cards 1 or 2 above the top of an expedition
+CLOSE: tuple[int, ...] = tuple(
+    sum(1 << (value + 1) for value in range(max(top + 1, 2), min(top + 2, 10) + 1)) for top in range(11)
+)
+# VALUES_OF[mask]: values of the cards of a mask, from the lowest
+VALUES_OF: tuple[tuple[int, ...], ...] = tuple(
+    tuple([0] * POPCOUNT[mask & WAGER_BITS] + [value for value in range(2, 11) if mask >> (value + 1) & 1])
+    for mask in range(FULL_MASK + 1)
+)
+
+
+def add_to_mask(mask: int, value: int) -> int:
+    """Add a card value to a color mask
+
+    Args:
+        mask (int): color mask
+        value (int): value of the card, 0 for a wager
+
+    Returns:
+        int: new mask
+    """
+    if value == 0:
+        return mask | ((mask & WAGER_BITS) << 1 & WAGER_BITS) | 1
+    return mask | 1 << (value + 1)
+
+
+def remove_from_mask(mask: int, value: int) -> int:
+    """Remove a card value from a color mask, the card must be in the mask
+
+    Args:
+        mask (int): color mask
+        value (int): value of the card, 0 for a wager
+
+    Returns:
+        int: new mask
+    """
+    if value == 0:
+        return (mask & ~WAGER_BITS) | (mask & WAGER_BITS) >> 1
+    return mask & ~(1 << (value + 1))
+
+
+def hand_masks(cards: Iterable[Card], nb_colors: int) -> list[int]:
+    """Masks of cards by color index
+
+    Args:
+        cards (Iterable[Card]): cards of a hand
+        nb_colors (int): number of colors in play, 5 or 6
+
+    Returns:
+        list[int]: mask of each color
+    """
+    masks: list[int] = [0] * nb_colors
+    for card in cards:
+        masks[card.color_id] = add_to_mask(masks[card.color_id], card.value)
+    return masks
+
+
+def mask_card(color_id: int, value: int) -> Card:
+    """Interned card of a color index and a value read from a mask"""
+    return Card.from_id(color_id * len(VALUES) + VALUE_INDEXES[value])
+
+
+def score_mask(mask: int) -> int:
+    """Score of an expedition, same rules as Player.compute_one_score
+
+    Args:
+        mask (int): board mask of the expedition
+
+    Returns:
+        int: score of the expedition
+    """
+    count: int = POPCOUNT[mask]
+    if count == 0:
+        return 0
+    return (SUM[mask >> 3] - 20) * (POPCOUNT[mask & WAGER_BITS] + 1) + (20 if count >= 8 else 0)
+
+
+class Bitboard:
+    """Compact game state: per player and per color a hand mask, a board mask and the top of the expedition"""
+
+    __slots__ = ("nb_colors", "hands", "boards", "tops")
+
+    def __init__(self, version: Literal[5, 6] = 5) -> None:
+        """Empty bitboard
+
+        Args:
+            version (Literal[5, 6], optional): Which version to play. Defaults to 5.
+        """
+        self.nb_colors: int = version
+        self.hands: list[list[int]] = [[0] * version, [0] * version]
+        self.boards: list[list[int]] = [[0] * version, [0] * version]
+        self.tops: list[list[int]] = [[EMPTY_TOP] * version, [EMPTY_TOP] * version]
+
+    @classmethod
+    def from_cards(cls, hands: Iterable[Iterable[Card]], boards: Iterable[Iterable[Iterable[Card]]]) -> "Bitboard":
+        """Encode hands and boards
+
+        Args:
+            hands (Iterable[Iterable[Card]]): cards in hand of each player
+            boards (Iterable[Iterable[Iterable[Card]]]): expeditions of each player, ordered by color index
+
+        Returns:
+            Bitboard
+        """
+        boards = [list(board) for board in boards]
+        bitboard = cls(len(boards[0]))  # type: ignore
+        for player, hand in enumerate(hands):
+            for card in hand:
+                bitboard.add_card(player, card.color_id, card.value)
+        for player, board in enumerate(boards):
+            for color_id, expedition in enumerate(board):
+                for card in expedition:
+                    bitboard.boards[player][color_id] = add_to_mask(bitboard.boards[player][color_id], card.value)
+                    bitboard.tops[player][color_id] = card.value
+        return bitboard
+
+    @classmethod
+    def from_game(cls, game: "LostCitiesGame") -> "Bitboard":
+        """Encode a LostCitiesGame"""
+        return cls.from_cards(
+            [player.hand for player in game.players],
+            [[player.board[color] for color in game.colors] for player in game.players],
+        )
+
+    @classmethod
+    def from_state(cls, state: "GameState") -> "Bitboard":
+        """Encode a GameState of lost_cities.engine"""
+        return cls.from_cards(state.hands, state.boards)
+
+    def add_card(self, player: int, color_id: int, value: int) -> None:
+        """Add a card to a hand"""
+        self.hands[player][color_id] = add_to_mask(self.hands[player][color_id], value)
+
+    def remove_card(self, player: int, color_id: int, value: int) -> None:
+        """Remove a card from a hand"""
+        self.hands[player][color_id] = remove_from_mask(self.hands[player][color_id], value)
+
+    def has_card(self, player: int, color_id: int, value: int) -> bool:
+        """Whether a card is in a hand"""
+        return bool(self.hands[player][color_id] & (1 if value == 0 else 1 << (value + 1)))
+
+    def playable_mask(self, player: int, color_id: int) -> int:
+        """Cards of a color in hand that can be played
+
+        Args:
+            player (int): player index
+            color_id (int): color index
+
+        Returns:
+            int: mask of playable cards
+        """
+        return self.hands[player][color_id] & PLAYABLE[self.tops[player][color_id] + 1]
+
+    def can_play(self, player: int, color_id: int, value: int) -> bool:
+        """Whether a card in hand can be played"""
+        return self.has_card(player, color_id, value) and value >= self.tops[player][color_id]
+
+    def legal_plays(self, player: int) -> Iterator[tuple[int, int]]:
+        """Distinct playable cards of a player
+
+        Args:
+            player (int): player index
+
+        Yields:
+            Iterator[tuple[int, int]]: color index and value
+        """
+        for color_id in range(self.nb_colors):
+            mask: int = self.playable_mask(player, color_id)
+            if mask:
+                if mask & 1:
+                    yield color_id, 0
+                for value in VALUES_OF[mask & ~WAGER_BITS]:
+                    yield color_id, value
+
+    def playable_cards(self, player: int) -> list[Card]:
+        """Distinct playable cards of a player, as Card objects"""
+        return [mask_card(color_id, value) for color_id, value in self.legal_plays(player)]
+
+    def play(self, player: int, color_id: int, value: int) -> None:
+        """Move a card from the hand to the expedition, legality must be checked with can_play"""
+        self.remove_card(player, color_id, value)
+        self.boards[player][color_id] = add_to_mask(self.boards[player][color_id], value)
+        self.tops[player][color_id] = value
+
+    def score(self, player: int) -> int:
+        """Score of a player, same rules as Player.compute_score"""
+        return sum(score_mask(mask) for mask in self.boards[player])
+
+    def score_detail(self, player: int) -> list[int]:
+        """Score of each expedition of a player, ordered by color index"""
+        return [score_mask(mask) for mask in self.boards[player]]
@@ -1,33 +1,96 @@
-from typing import Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional
 
-import numpy as np
-import pygame
+if TYPE_CHECKING:  # pragma: nocover
+    import numpy as np
+    import pygame
 
-from lost_cities.gui.utils import extract_card
+COLORS: tuple[str, ...] = ("Yellow", "Blue", "White", "Green", "Red", "Purple")
+VALUES: tuple[int, ...] = (0, 2, 3, 4, 5, 6, 7, 8, 9, 10)
+
+COLOR_IDS: dict[str, int] = {color: i for i, color in enumerate(COLORS)}
+VALUE_INDEXES: dict[int, int] = {value: i for i, value in enumerate(VALUES)}
+# distinct cards of the 6 colors version, the 3 wagers of a color are the same card
+NB_CARD_IDS: int = len(COLORS) * len(VALUES)
+# rank of each color id in alphabetical order, hands are sorted by color name then value
+_COLOR_RANKS: tuple[int, ...] = tuple(sorted(COLORS).index(color) for color in COLORS)
 
 
 class Card:
-    def __init__(self, color: str, value: int, x: int = 0, y: int = 0) -> None:
+    """Pure logic card: color and value are integer encoded, pygame objects are only built when the GUI asks for them.
+    Equal cards share an id between 0 and NB_CARD_IDS, and an interned instance returned by Card.from_id. Cards hold no
+    position nor orientation, the GUI places them, so interned cards are shared by every game."""
+
+    __slots__ = ("color_id", "value", "card_id", "_sort_key")
+
+    def __init__(self, color: str, value: int) -> None:
         """Instanciate Card
 
         Args:
             color (str): color of the card
             value (int): value of the card
-            x (int): x coord board
-            y (int): y coord board
         """
-        if color not in ["Yellow", "Blue", "White", "Green", "Red", "Purple"]:
+        color_id: Optional[int] = COLOR_IDS.get(color) if isinstance(color, str) else None
+        if color_id is None:
             raise AttributeError(f"color can not be {color}")
-        if value not in [i for i in range(2, 11)] and value != 0:
-            raise AttributeError("value must be between 2 and 10 or a 0")
-        self.color = str(color)
-        self.value = value
-        self.img = extract_card(self.color, self.value)
-        self.surface = pygame.pixelcopy.make_surface(np.flipud(np.rot90(self.img)))
-        self.x = x
-        self.y = y
-        self.rect = self.surface.get_rect()
-        self.rect.topleft = (self.x, self.y)
+        try:
+            value_index: int = VALUE_INDEXES[value]
+        except (KeyError, TypeError):
+            raise AttributeError("value must be between 2 and 10 or a 0") from None
+        self.color_id: int = color_id
+        self.value: int = value
+        self.card_id: int = color_id * len(VALUES) + value_index
+        self._sort_key: int = _COLOR_RANKS[color_id] * 16 + value
+
+    @staticmethod
+    def from_id(card_id: int) -> "Card":
+        """Interned card of an id, shared by every caller
+
+        Args:
+            card_id (int): id of the card, see Card.card_id
+
+        Returns:
+            Card: card shared by every caller
+        """
+        return _INTERNED[card_id]
+
+    @staticmethod
+    def intern(color: str, value: int) -> "Card":
+        """Interned card of a color and a value, see Card.from_id
+
+        Args:
+            color (str): color of the card
+            value (int): value of the card
+
+        Raises:
+            AttributeError: if the color or the value does not exist
+
+        Returns:
+            Card: card shared by every caller
+        """
+        try:
+            return _INTERNED[COLOR_IDS[color] * len(VALUES) + VALUE_INDEXES[value]]
+        except (KeyError, TypeError):
+            raise AttributeError(f"no card {value} of color {color}") from None
+
+    @property
+    def color(self) -> str:
+        """Name of the color"""
+        return COLORS[self.color_id]
+
+    @property
+    def img(self) -> "np.ndarray":
+        """Graphical card, extracted on demand and shared with all identical cards"""
+        from lost_cities.gui.utils import get_card_image
+
+        return get_card_image(self.color, self.value)
+
+    @property
+    def surface(self) -> "pygame.Surface":
+        """Upright pygame surface of the card, taken from the sprite cache"""
+        from lost_cities.gui.utils import get_card_surface
+
+        return get_card_surface(self.color, self.value)
 
     def __repr__(self) -> str:
         """Representation of a card
@@ -37,6 +100,14 @@ class Card:
         """
         return f"{self.value}:{self.color}"
 
+    def __hash__(self) -> int:
+        """Hash based on color and value, consistent with __eq__
+
+        Returns:
+            int
+        """
+        return self.card_id
+
     def __lt__(self, card: Any) -> bool:
         """lower than, used to sort list
 
@@ -46,7 +117,7 @@ class Card:
         Returns:
             bool: if this card is lower than a given card
         """
-        return self.color < card.color or self.color == card.color and self.value < card.value
+        return self._sort_key < card._sort_key
 
     def __eq__(self, card: Any) -> bool:
         """equal to
@@ -57,23 +128,26 @@ class Card:
         Returns:
             bool: if this card is equal to a given card
         """
-        return self.color == card.color and self.value == card.value
+        if not isinstance(card, Card):
+            return NotImplemented
+        return self.card_id == card.card_id
 
-    def rotate_surface_to_discard(self) -> None:
-        """change surface value to rotate for discard view"""
-        self.surface = pygame.pixelcopy.make_surface(np.flipud(self.img))
 
-    def unrotate_surface_to_discard(self) -> None:
-        """change surface value to unrotate for hand view"""
-        self.surface = pygame.pixelcopy.make_surface(np.flipud(np.rot90(self.img)))
+_INTERNED: tuple[Card, ...] = tuple(Card(color, value) for color in COLORS for value in VALUES)
 
-    def set_coord(self, x: int, y: int) -> None:
-        """Set x and y coord for pygame view
 
-        Args:
-            x (int): x coord
-            y (int): y coord
-        """
-        self.x = x
-        self.y = y
-        self.rect.topleft = (self.x, self.y)
+@lru_cache(maxsize=None)
+def deck_prototype(nb_colors: int) -> tuple[Card, ...]:
+    """Interned cards of a new deck, color after color from 2 to 10 then the 3 wagers. Built once per version, a new
+    game shuffles a copy of it.
+
+    Args:
+        nb_colors (int): number of colors in play, 5 or 6
+
+    Returns:
+        tuple[Card, ...]: 12 cards per color
+    """
+    value_ids: list[int] = [VALUE_INDEXES[value] for value in [*range(2, 11), 0, 0, 0]]
+    return tuple(
+        _INTERNED[color_id * len(VALUES) + value_id] for color_id in range(nb_colors) for value_id in value_ids
+    )
@@ -0,0 +1,240 @@
+import random
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from lost_cities.card import NB_CARD_IDS, Card
+from lost_cities.engine import DECK, DISCARD, PLAY, Action, GameState, apply, is_over, legal_actions
+from lost_cities.player import Player
+
+_KINDS: int = NB_CARD_IDS
+_COPIES: int = 3
+_MAX_DISCARD: int = 12  # cards of a color
+_rng = random.Random(20230801)
+# keys of a card kind and copy index, for the hands and boards of both players and the deck (a multiset)
+LOCATION_KEYS: list[list[int]] = [[_rng.getrandbits(64) for _ in range(_KINDS * _COPIES)] for _ in range(5)]
+# discard piles are stacks, their keys depend on the position in the pile of the card color
+DISCARD_KEYS: list[list[int]] = [[_rng.getrandbits(64) for _ in range(_KINDS)] for _ in range(_MAX_DISCARD)]
+PLAYER_KEY: int = _rng.getrandbits(64)
+
+
+def _hash_cards(keys: list[int], cards: Iterable[Card]) -> int:
+    """Xor of the keys of sorted cards, equal cards get successive copy indexes"""
+    value: int = 0
+    previous: int = -1
+    copy: int = 0
+    for card in cards:
+        kind: int = card.card_id
+        copy = copy + 1 if kind == previous else 0
+        previous = kind
+        value ^= keys[kind * _COPIES + copy]
+    return value
+
+
+def zobrist_hash(state: GameState) -> int:
+    """Zobrist hash of a state, the order of the deck is ignored as it is unknown to both players
+
+    Args:
+        state (GameState): state of the game
+
+    Returns:
+        int: 64 bits hash
+    """
+    value: int = PLAYER_KEY if state.current_player else 0
+    for player in range(2):
+        value ^= _hash_cards(LOCATION_KEYS[player], state.hands[player])
+        value ^= _hash_cards(LOCATION_KEYS[2 + player], (card for exp in state.boards[player] for card in exp))
+    value ^= _hash_cards(LOCATION_KEYS[4], sorted(state.deck))
+    for pile in state.discard_piles:
+        for position, card in enumerate(pile):
+            value ^= DISCARD_KEYS[position][card.card_id]
+    return value
+
+
+@lru_cache(maxsize=None)
+def expedition_score(expedition: tuple[Card, ...]) -> int:
+    """Memoized Player.compute_one_score, expeditions repeat a lot in a search tree"""
+    return Player.compute_one_score(list(expedition))
+
+
+def score_difference(state: GameState) -> int:
+    """Score of player 0 minus score of player 1"""
+    return sum(expedition_score(expedition) for expedition in state.boards[0]) - sum(
+        expedition_score(expedition) for expedition in state.boards[1]
+    )
+
+
+class TranspositionTable:
+    def __init__(self, max_entries: int = 100_000) -> None:
+        """Bounded table of evaluated positions with least recently used eviction
+
+        Args:
+            max_entries (int, optional): maximum number of positions. Defaults to 100_000.
+        """
+        self.max_entries: int = max_entries
+        self.entries: OrderedDict[int, tuple[int, float, bool]] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: int, depth: int) -> Optional[tuple[float, bool]]:
+        """Value of a position searched at least at this depth
+
+        Args:
+            key (int): zobrist hash
+            depth (int): remaining depth needed
+
+        Returns:
+            Optional[tuple[float, bool]]: value and whether it is exact, None if unknown
+        """
+        entry: Optional[tuple[int, float, bool]] = self.entries.get(key)
+        if entry is None or (entry[0] < depth and not entry[2]):
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def put(self, key: int, depth: int, value: float, exact: bool) -> None:
+        """Store a position, evicting the least recently used one when full
+
+        Args:
+            key (int): zobrist hash
+            depth (int): remaining depth of the search
+            value (float): value of the position
+            exact (bool): whether the search reached the end of the game everywhere
+        """
+        self.entries[key] = (depth, value, exact)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class SearchTimeout(Exception):
+    """Raised when the latency budget of the solver is exhausted"""
+
+
+class EndgameSolver:
+    def __init__(self, max_entries: int = 100_000, time_budget: float = 0.5, max_depth: int = 12) -> None:
+        """Expectimax solver for the end of a game: players maximize their score difference and the deck draws are
+        chance nodes over the remaining cards. Values are always score of player 0 minus score of player 1, so the
+        transposition table stays valid from one move to the next. Drawing from a discard pile does not shrink the
+        deck, so a search is only exact when the discard piles can not be drawn from until the end.
+
+        Args:
+            max_entries (int, optional): size of the transposition table. Defaults to 100_000.
+            time_budget (float, optional): seconds per solve, iterative deepening stops when exhausted. Defaults to 0.5.
+            max_depth (int, optional): maximum number of turns searched. Defaults to 12.
+        """
+        self.table = TranspositionTable(max_entries)
+        self.time_budget: float = time_budget
+        self.max_depth: int = max_depth
+        self.nodes: int = 0
+        self.depth: int = 0
+        self._deadline: float = 0.0
+
+    def _value(self, state: GameState, depth: int) -> tuple[float, bool]:
+        """Value of a state searched to depth turns, and whether it is exact"""
+        if is_over(state):
+            return score_difference(state), True
+        if depth == 0:
+            return score_difference(state), False
+
+        key: int = zobrist_hash(state)
+        cached: Optional[tuple[float, bool]] = self.table.get(key, depth)
+        if cached is not None:
+            return cached
+
+        self.nodes += 1
+        if self.nodes % 256 == 0 and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        if depth == 1:
+            values = self._horizon_values(state)
+        else:
+            values = [self._action_value(state, action, depth) for action in legal_actions(state)]
+        best: float = max(v for v, _ in values) if state.current_player == 0 else min(v for v, _ in values)
+        exact: bool = all(e for _, e in values)
+        self.table.put(key, depth, best, exact)
+        return best, exact
+
+    @staticmethod
+    def _horizon_values(state: GameState) -> list[tuple[float, bool]]:
+        """Values of the legal actions one turn before the search horizon. Scores only depend on the boards so the
+        drawn card does not matter and the children are not generated."""
+        player: int = state.current_player
+        base: int = score_difference(state)
+        sign: int = 1 if player == 0 else -1
+        last_draw: bool = len(state.deck) == 1
+        values: list[tuple[float, bool]] = []
+        for action in legal_actions(state):
+            if action.kind == PLAY:
+                expedition: tuple[Card, ...] = state.boards[player][action.card.color_id]
+                delta: int = expedition_score(expedition + (action.card,)) - expedition_score(expedition)
+                values.append((base + sign * delta, last_draw and action.pile == DECK))
+            else:
+                # drawing from a discard pile leaves the last card in the deck, the game goes on
+                values.append((base, last_draw and action.pile == DECK))
+        return values
+
+    def _action_value(self, state: GameState, action: Action, depth: int) -> tuple[float, bool]:
+        """Value of a turn, averaged over the possible deck draws"""
+        if action.pile == DISCARD:
+            return self._value(apply(state, action), depth - 1)
+
+        total: float = 0.0
+        exact: bool = True
+        deck: list[Card] = list(state.deck)
+        for card in set(deck):
+            arranged: list[Card] = list(deck)
+            arranged.remove(card)
+            arranged.append(card)
+            value, child_exact = self._value(apply(state._replace(deck=tuple(arranged)), action), depth - 1)
+            total += value * deck.count(card)
+            exact = exact and child_exact
+        return total / len(deck), exact
+
+    def evaluate_actions(self, state: GameState) -> tuple[dict[Action, float], bool]:
+        """Value of every legal action for the current player with iterative deepening under the time budget
+
+        Args:
+            state (GameState): state of the game, fully known except the deck order
+
+        Returns:
+            tuple[dict[Action, float], bool]: score difference for the current player of each action, and whether
+                the values are exact
+        """
+        self._deadline = time.perf_counter() + self.time_budget
+        self.nodes = 0
+        self.depth = 0
+        sign: int = 1 if state.current_player == 0 else -1
+        actions: list[Action] = legal_actions(state)
+        best_values: dict[Action, float] = {action: 0.0 for action in actions}
+        exact: bool = False
+        for depth in range(1, self.max_depth + 1):
+            try:
+                values = {action: self._action_value(state, action, depth) for action in actions}
+            except SearchTimeout:
+                break
+            best_values = {action: sign * value for action, (value, _) in values.items()}
+            self.depth = depth
+            exact = all(action_exact for _, action_exact in values.values())
+            if exact:
+                break
+        return best_values, exact
+
+    def solve(self, state: GameState) -> tuple[Action, float, bool]:
+        """Best action for the current player
+
+        Args:
+            state (GameState): state of the game, fully known except the deck order
+
+        Returns:
+            tuple[Action, float, bool]: best action, its expected score difference and whether it is exact
+        """
+        values, exact = self.evaluate_actions(state)
+        best: Action = max(values, key=lambda action: values[action])
+        return best, values[best], exact
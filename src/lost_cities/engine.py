@@ -0,0 +1,193 @@
+import random
+from typing import Literal, NamedTuple, Optional
+
+from lost_cities.card import COLOR_IDS, COLORS, Card, deck_prototype
+from lost_cities.game import LostCitiesGame
+from lost_cities.player import Player
+
+PLAY: Literal["play"] = "play"
+DISCARD: Literal["discard"] = "discard"
+DECK: Literal["deck"] = "deck"
+
+
+class Action(NamedTuple):
+    """A full turn: play or discard a card, then draw from the deck or the discard pile of a color"""
+
+    kind: Literal["play", "discard"]
+    card: Card
+    pile: Literal["deck", "discard"]
+    color: Optional[str] = None
+
+
+class GameState(NamedTuple):
+    """Immutable snapshot of a game. Boards are indexed by player then by color index, discard piles by color index"""
+
+    deck: tuple[Card, ...]
+    hands: tuple[tuple[Card, ...], ...]
+    boards: tuple[tuple[tuple[Card, ...], ...], ...]
+    discard_piles: tuple[tuple[Card, ...], ...]
+    current_player: int = 0
+
+    @property
+    def colors(self) -> tuple[str, ...]:
+        """Colors in play, ordered as boards"""
+        return COLORS[: len(self.boards[0])]
+
+
+def new_state(version: Literal[5, 6] = 5, rng: Optional[random.Random] = None) -> GameState:
+    """Shuffle a deck and deal 8 cards to each player, as LostCitiesGame.setup does
+
+    Args:
+        version (Literal[5, 6], optional): Which version to play. Defaults to 5.
+        rng (Optional[random.Random], optional): random generator. Defaults to None, the random module.
+
+    Returns:
+        GameState: first state of the game
+    """
+    deck: list[Card] = list(deck_prototype(version))
+    (rng or random).shuffle(deck)
+    hands: tuple[list[Card], list[Card]] = ([], [])
+    for _ in range(8):
+        for hand in hands:
+            hand.append(deck.pop())
+    empty_board: tuple[tuple[Card, ...], ...] = ((),) * version
+    return GameState(tuple(deck), tuple(tuple(sorted(hand)) for hand in hands), (empty_board, empty_board), empty_board)
+
+
+def from_game(game: LostCitiesGame) -> GameState:
+    """Snapshot of a LostCitiesGame
+
+    Args:
+        game (LostCitiesGame): game to copy
+
+    Returns:
+        GameState: state of the game
+    """
+    return GameState(
+        tuple(game.deck),
+        tuple(tuple(sorted(player.hand)) for player in game.players),
+        tuple(tuple(tuple(player.board[color]) for color in game.colors) for player in game.players),
+        tuple(tuple(pile) for pile in game.discard_piles.piles),
+        game.current_player,
+    )
+
+
+def is_over(state: GameState) -> bool:
+    """Whether the game is finished, when the deck is empty"""
+    return not state.deck
+
+
+def can_play(state: GameState, card: Card) -> bool:
+    """Whether the current player can play this card on its expedition
+
+    Args:
+        state (GameState): state of the game
+        card (Card): card to play
+
+    Returns:
+        bool
+    """
+    expedition: tuple[Card, ...] = state.boards[state.current_player][card.color_id]
+    return not expedition or card.value >= expedition[-1].value
+
+
+def legal_actions(state: GameState) -> list[Action]:
+    """Every legal turn of the current player: each card is played or discarded, then the deck or any discard pile is
+    picked. Identical cards give a single action and the card just discarded can not be picked back.
+
+    Args:
+        state (GameState): state of the game
+
+    Returns:
+        list[Action]: legal actions, empty when the game is over
+    """
+    if is_over(state):
+        return []
+    actions: list[Action] = []
+    colors: tuple[str, ...] = state.colors
+    piles: list[int] = [color_id for color_id, pile in enumerate(state.discard_piles) if pile]
+    previous: Optional[Card] = None
+    for card in state.hands[state.current_player]:
+        if card == previous:
+            continue
+        previous = card
+        if can_play(state, card):
+            actions.append(Action(PLAY, card, DECK))
+            actions.extend(Action(PLAY, card, DISCARD, colors[color_id]) for color_id in piles)
+        actions.append(Action(DISCARD, card, DECK))
+        actions.extend(
+            Action(DISCARD, card, DISCARD, colors[color_id]) for color_id in piles if color_id != card.color_id
+        )
+    return actions
+
+
+def apply(state: GameState, action: Action) -> GameState:
+    """Play a turn, without any input or logging
+
+    Args:
+        state (GameState): state of the game
+        action (Action): turn to play
+
+    Raises:
+        ValueError: if the action is not legal
+
+    Returns:
+        GameState: state after the turn, the other player is now the current player
+    """
+    if action.pile not in (DECK, DISCARD):
+        raise ValueError(f"{action.pile} is not a valid pile")
+    if action.pile == DECK and not state.deck:
+        raise ValueError("the deck is empty")
+    player: int = state.current_player
+    hand: list[Card] = list(state.hands[player])
+    try:
+        hand.remove(action.card)
+    except ValueError:
+        raise ValueError(f"{action.card} is not in the hand of player {player}")
+
+    boards = state.boards
+    discard_piles: list[tuple[Card, ...]] = list(state.discard_piles)
+    if action.kind == PLAY:
+        if not can_play(state, action.card):
+            raise ValueError(f"{action.card} can not be played")
+        board: list[tuple[Card, ...]] = list(boards[player])
+        board[action.card.color_id] += (action.card,)
+        boards = (tuple(board), boards[1]) if player == 0 else (boards[0], tuple(board))
+    elif action.kind == DISCARD:
+        discard_piles[action.card.color_id] += (action.card,)
+    else:
+        raise ValueError(f"{action.kind} is not a valid action")
+
+    deck = state.deck
+    if action.pile == DISCARD:
+        color_id: int = COLOR_IDS.get(action.color, -1) if isinstance(action.color, str) else -1
+        if (
+            not 0 <= color_id < len(discard_piles)
+            or not state.discard_piles[color_id]
+            or (action.kind == DISCARD and color_id == action.card.color_id)
+        ):
+            raise ValueError(f"can not pick in the discard pile {action.color}")
+        hand.append(discard_piles[color_id][-1])
+        discard_piles[color_id] = discard_piles[color_id][:-1]
+    else:
+        hand.append(deck[-1])
+        deck = deck[:-1]
+    hand.sort()
+
+    hands = (tuple(hand), state.hands[1]) if player == 0 else (state.hands[0], tuple(hand))
+    return GameState(deck, hands, boards, tuple(discard_piles), 1 - player)
+
+
+def scores(state: GameState) -> tuple[int, int]:
+    """Current score of both players
+
+    Args:
+        state (GameState): state of the game
+
+    Returns:
+        tuple[int, int]: score of each player
+    """
+    return (
+        sum(Player.compute_one_score(expedition) for expedition in state.boards[0]),
+        sum(Player.compute_one_score(expedition) for expedition in state.boards[1]),
+    )
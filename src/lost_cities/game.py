@@ -1,18 +1,91 @@
+import bisect
+import logging
 import random
-from typing import Any, Literal, Optional
+from typing import TYPE_CHECKING, Any, Iterator, Literal, Optional, Union
 
-from lost_cities import logger
-from lost_cities.card import Card
-from lost_cities.gui.settings import settings
+from lost_cities import enable_logging, logger
+from lost_cities.card import COLOR_IDS, COLORS, Card, deck_prototype
 from lost_cities.player import ComputerPlayer, Player
 
+if TYPE_CHECKING:  # pragma: nocover
+    import numpy as np
+
+# numpy is not imported at runtime, generators of the engine only need a shuffle method
+RandomSource = Union[None, int, str, random.Random, "np.random.Generator"]
+
+
+class DiscardPiles:
+    """One discard pile per color. The stacks are stored in a list indexed by color id so the top of every pile is
+    read in constant time."""
+
+    def __init__(self, nb_colors: int) -> None:
+        """Empty discard piles
+
+        Args:
+            nb_colors (int): number of colors in play, 5 or 6
+        """
+        self.piles: list[list[Card]] = [[] for _ in range(nb_colors)]
+        self.size: int = 0
+
+    def __len__(self) -> int:
+        """Number of discarded cards, all colors"""
+        return self.size
+
+    def __iter__(self) -> Iterator[Card]:
+        """Every discarded card, color after color from the bottom of each pile"""
+        for pile in self.piles:
+            yield from pile
+
+    def __getitem__(self, color: str) -> list[Card]:
+        """Pile of a color, from the bottom to the top"""
+        return self.piles[COLOR_IDS[color]]
+
+    def __repr__(self) -> str:
+        """Representation of the piles"""
+        return repr({COLORS[color_id]: pile for color_id, pile in enumerate(self.piles)})
+
+    def push(self, card: Card) -> None:
+        """Put a card on the pile of its color"""
+        self.piles[card.color_id].append(card)
+        self.size += 1
+
+    def pop(self, color: str) -> Card:
+        """Take the top card of a pile
+
+        Args:
+            color (str): color of the pile
+
+        Raises:
+            IndexError: if the pile is empty
+
+        Returns:
+            Card: top card
+        """
+        card: Card = self.piles[COLOR_IDS[color]].pop()
+        self.size -= 1
+        return card
+
+    def top(self, color: str) -> Optional[Card]:
+        """Top card of a pile, None if it is empty"""
+        pile: list[Card] = self.piles[COLOR_IDS[color]]
+        return pile[-1] if pile else None
+
+    def tops(self) -> list[Optional[Card]]:
+        """Top card of every pile indexed by color id, None for empty piles"""
+        return [pile[-1] if pile else None for pile in self.piles]
+
 
 class LostCitiesGame:
     VERSION_5: list[str] = ["Yellow", "Blue", "White", "Green", "Red"]
     VERSION_6: list[str] = ["Yellow", "Blue", "White", "Green", "Red", "Purple"]
 
     def __init__(
-        self, player1_name: str, player2_name: str, vs_computer: bool = True, version: Literal[5, 6] = 5
+        self,
+        player1_name: str,
+        player2_name: str,
+        vs_computer: bool = True,
+        version: Literal[5, 6] = 5,
+        rng: RandomSource = None,
     ) -> None:
         """Constructor of a LostCities Game
 
@@ -21,56 +94,184 @@ class LostCitiesGame:
             player2_name (str): name of p2
             vs_computer (bool, optional): Whether to play against computer. Defaults to True.
             version (Literal[5, 6], optional): Which version to play. Defaults to 5.
+            rng (RandomSource, optional): generator shuffling the deck, or a seed of a random.Random. Defaults to None,
+                the random module.
         """
         self.deck: list[Card] = []
-        self.discard_piles: list[Card] = []
-        self.players: list[Player] = [Player(player1_name, version)]
         self.colors: list[str] = eval(f"self.VERSION_{version}")
+        self.discard_piles = DiscardPiles(len(self.colors))
+        self.players: list[Player] = [Player(player1_name, version)]
         if vs_computer:
             self.players.append(ComputerPlayer(player2_name, version))
         else:
             self.players.append(Player(player2_name, version))
         self.current_player: int = 0
+        # one entry per turn of make_move: action, card, its position in the hand, pile, position of the drawn card
+        self.undo_stack: list[tuple[str, Card, int, str, int]] = []
+        # record of the game: shuffled deck before dealing and (action, card, pile, pile color) of each turn, written by
+        # play_move and pick_card but not by make_move
+        self.initial_deck: list[Card] = []
+        self.moves: list[tuple[str, Card, str, Optional[str]]] = []
+        self._pending_move: Optional[tuple[str, Card]] = None
+        self.rng: Union[random.Random, "np.random.Generator", None] = (
+            random.Random(rng) if isinstance(rng, (int, str)) else rng
+        )
+
+    def reset(self) -> None:
+        """Empty the deck, the discard piles, the hands and the boards so the game can be set up again with the same
+        players"""
+        self.deck = []
+        self.discard_piles = DiscardPiles(len(self.colors))
+        for player in self.players:
+            player.reset()
+        self.current_player = 0
+        self.undo_stack = []
+        self.initial_deck = []
+        self.moves = []
+        self._pending_move = None
+
+    def setup(self, deck: Optional[list[Card]] = None) -> None:
+        """Resets the game, shuffles a copy of the deck prototype and gives 8 cards for each player
 
-    def setup(self) -> None:
-        """Sets all cards in the deck, shuffles and gives 8 cards for each player"""
-        values = list(range(2, 11))  # Values from 2 to 10
-        values.extend([0] * 3)  # 0 cards
-        self.deck = [Card(color, value) for color in self.colors for value in values]
-        random.shuffle(self.deck)
-
-        for _ in range(8):
-            for player in self.players:
-                player.hand.append(self.deck.pop())
-
-        self.players[0].reorder_hand()
+        Args:
+            deck (Optional[list[Card]], optional): deck in the order of a previous game, not shuffled, the last card is
+                dealt first. Defaults to None, a new deck shuffled by rng.
+        """
+        self.reset()
+        self.deck = list(deck if deck is not None else deck_prototype(len(self.colors)))
+        if deck is None:
+            (self.rng or random).shuffle(self.deck)
+        self.initial_deck = list(self.deck)
+
+        # the last card is dealt first, alternately to each player
+        dealt: list[Card] = self.deck[: -8 * len(self.players) - 1 : -1]
+        del self.deck[-8 * len(self.players) :]
+        for seat, player in enumerate(self.players):
+            player.hand[:] = dealt[seat :: len(self.players)]
+            player.reorder_hand()
 
     def switch_player(self) -> None:
         """Change player cursor"""
         self.current_player = 1 - self.current_player
 
-    def pick_card(self, chosen_pile: Optional[str] = None) -> None:
-        """Pick a card either in deck either in discard
+    def can_pick(self, color: Optional[str], discarded: Optional[Card] = None) -> bool:
+        """Whether the discard pile of a color can be picked: it is in play, not empty, and its top is not the card
+        just discarded
+
+        Args:
+            color (Optional[str]): color of the pile
+            discarded (Optional[Card], optional): card discarded this turn. Defaults to None.
+
+        Returns:
+            bool
+        """
+        if color not in self.colors or not self.discard_piles[color]:  # type: ignore[index]
+            return False
+        return discarded is None or discarded.color != color
+
+    @property
+    def just_discarded(self) -> Optional[Card]:
+        """Card discarded this turn while the player has not picked yet, its pile can not be picked"""
+        if self._pending_move is not None and self._pending_move[0] == "discard":
+            return self._pending_move[1]
+        return None
+
+    def make_move(self, kind: str, card: Card, pile: str, color: Optional[str] = None) -> None:
+        """Play a full turn in place, without input nor logging, and push it on the undo stack. The turn is not
+        recorded in moves so searches only allocate the stack entry, see play_move.
+        An engine Action can be given unpacked: game.make_move(*action)
+
+        Args:
+            kind (str): "play" or "discard"
+            card (Card): card of the current player's hand
+            pile (str): "deck" or "discard"
+            color (Optional[str], optional): color of the discard pile to pick, the card just discarded can not be
+                picked back. Defaults to None, only valid when picking in the deck.
+
+        Raises:
+            ValueError: if the move is not legal
+        """
+        if kind not in ("play", "discard"):
+            raise ValueError(f"{kind} is not a valid action")
+        if pile not in ("deck", "discard"):
+            raise ValueError(f"{pile} is not a valid pile")
+        if pile == "discard" and not self.can_pick(color, card if kind == "discard" else None):
+            raise ValueError(f"can not pick in the discard pile {color}")
+        if pile == "deck" and not self.deck:
+            raise ValueError("the deck is empty")
+        player: Player = self.players[self.current_player]
+        moved, hand_index = player._move_card(kind, card)
+        if kind == "discard":
+            self.discard_piles.push(moved)
+
+        drawn: Card = self.discard_piles.pop(color) if pile == "discard" else self.deck.pop()  # type: ignore[arg-type]
+        index: int = bisect.bisect_right(player.hand, drawn)
+        player.hand.insert(index, drawn)
+        self.undo_stack.append((kind, moved, hand_index, pile, index))
+        self.current_player = 1 - self.current_player
+
+    def unmake_move(self) -> None:
+        """Revert the last turn played with make_move, moves is left untouched"""
+        kind, card, hand_index, pile, index = self.undo_stack.pop()
+        self.current_player = 1 - self.current_player
+        player: Player = self.players[self.current_player]
+
+        drawn: Card = player.hand.pop(index)
+        if pile == "discard":
+            self.discard_piles.push(drawn)
+        else:
+            self.deck.append(drawn)
+        player._return_card(kind, card, hand_index)
+        if kind == "discard":
+            self.discard_piles.pop(card.color)
+
+    def play_move(self, kind: str, card: Card, pile: str, color: Optional[str] = None) -> None:
+        """Play a full turn like make_move and record it in moves, for games that are saved or replayed
+
+        Args:
+            kind (str): "play" or "discard"
+            card (Card): card of the current player's hand
+            pile (str): "deck" or "discard"
+            color (Optional[str], optional): color of the discard pile to pick. Defaults to None.
+
+        Raises:
+            ValueError: if the move is not legal
+        """
+        self.make_move(kind, card, pile, color)
+        self.moves.append((kind, self.undo_stack[-1][1], pile, color if pile == "discard" else None))
+
+    def pick_card(self, chosen_pile: Optional[str] = None, color: Optional[str] = None) -> None:
+        """Pick a card either in deck either in the discard pile of a color
 
         Args:
             chosen_pile (Optional[str], optional): chosen pile by compuyrt . Defaults to None.
+            color (Optional[str], optional): color of the discard pile, asked with input when picking in the discard
+                piles. Defaults to None.
         """
         current_player: Player = self.players[self.current_player]
+        discarded: Optional[Card] = self.just_discarded
         pile: str = chosen_pile or input("Choose a pile (deck/discard): ")
         while True:
             if pile not in ["deck", "discard"]:
-                logger.warning(f"{pile} is not a valid piles. Choose deck or discard.")
+                logger.warning("%s is not a valid piles. Choose deck or discard.", pile)
                 pile = input("Choose a pile (deck/discard): ")
-            elif pile == "discard" and len(self.discard_piles) == 0:
+            elif pile == "discard" and not any(self.can_pick(other, discarded) for other in self.colors):
                 logger.warning("No more card in discard, choose deck.")
                 pile = "deck"
+            elif pile == "discard" and not self.can_pick(color, discarded):
+                if color is not None:
+                    logger.warning("Can not pick in the %s discard pile.", color)
+                color = input(f"Choose a discard pile ({'/'.join(self.colors)}): ")
             else:
                 break
         if pile == "deck":
             current_player.hand.append(self.deck.pop())
         else:
-            current_player.hand.append(self.discard_piles.pop())
+            current_player.hand.append(self.discard_piles.pop(color))  # type: ignore[arg-type]
         current_player.reorder_hand()
+        if self._pending_move is not None:
+            self.moves.append((*self._pending_move, pile, color if pile == "discard" else None))
+            self._pending_move = None
 
     def action_play_card(self, index: Optional[str] = None, skip_card: bool = False) -> bool:
         """Method to play a valid card
@@ -90,15 +291,16 @@ class LostCitiesGame:
                 card: Card = current_player.hand[int(card_input)]
                 break
             except ValueError:
-                logger.warning(f"{card_input} not a int.")
+                logger.warning("%s not a int.", card_input)
                 card_input = input("Index card to play: ")
             except IndexError:
-                logger.warning(f"{card_input} is not reachable. Choose a valid index from 0 to 7.")
+                logger.warning("%s is not reachable. Choose a valid index from 0 to 7.", card_input)
                 card_input = input("Index card to play: ")
 
         can_play: bool = current_player.play_card(card)
         if not can_play:
             return can_play
+        self._pending_move = ("play", card)
 
         if skip_card is False:
             self.pick_card()
@@ -121,22 +323,56 @@ class LostCitiesGame:
                 card: Card = current_player.hand[int(card_input)]
                 break
             except ValueError:
-                logger.warning(f"{card_input} not a int.")
+                logger.warning("%s not a int.", card_input)
                 card_input = input("Index to discard: ")
             except IndexError:
-                logger.warning(f"{card_input} is not reachable. Choose a valid index from 0 to 7.")
+                logger.warning("%s is not reachable. Choose a valid index from 0 to 7.", card_input)
                 card_input = input("Index to discard: ")
 
         current_player.discard_card(card)
-        card.rotate_surface_to_discard()
-        x, y = settings.discard_position
-        card.set_coord(x, y)
-        self.discard_piles.append(card)
+        self.discard_piles.push(card)
+        self._pending_move = ("discard", card)
 
         if skip_card is False:
             self.pick_card()
             self.switch_player()
 
+    def computer_decision(self) -> tuple[str, Card]:
+        """Action chosen by the current player, a computer. The game is not modified so the decision can be computed
+        on another thread as long as the game does not change meanwhile.
+
+        Raises:
+            TypeError: if the current player is not a computer
+
+        Returns:
+            tuple[str, Card]: "play" or "discard" and the card
+        """
+        current_player: Player = self.players[self.current_player]
+        if not isinstance(current_player, ComputerPlayer):
+            raise TypeError(f"{current_player.name} is not a computer")
+        current_player.observe(self)
+        return current_player.choose_action()
+
+    def apply_computer_decision(self, action: str, card: Card) -> None:
+        """Play the action of the current player, a computer, then pick the pile it chooses and switch player
+
+        Args:
+            action (str): "play" or "discard"
+            card (Card): card to play or discard
+        """
+        current_player: ComputerPlayer = self.players[self.current_player]  # type: ignore
+        if action == "play":
+            current_player.play_card(card)
+            self._pending_move = ("play", card)
+        else:
+            self.action_discard(str(current_player.hand.index(card)), skip_card=True)
+
+        chosen_pile, color = current_player.choose_pile(
+            self.discard_piles.tops(), card if action == "discard" else None
+        )
+        self.pick_card(chosen_pile, color)
+        self.switch_player()
+
     def play_round(
         self, action: Optional[str] = None, index: Optional[str] = None, skip_card: bool = False, gui: bool = False
     ) -> None:
@@ -151,29 +387,18 @@ class LostCitiesGame:
         """
         current_player: Player = self.players[self.current_player]
 
-        logger.info(f"{current_player.name}'s turn.")
+        logger.info("%s's turn.", current_player.name)
 
         if isinstance(current_player, ComputerPlayer):
-            action, card = current_player.choose_action()
-            if action == "play":
-                current_player.play_card(card)
-            else:
-                self.action_discard(str(current_player.hand.index(card)), skip_card=True)
-
-            last_discarded: Optional[Card] = None
-            if len(self.discard_piles) > 0:
-                last_discarded = self.discard_piles[-1]
-
-            chosen_pile: str = current_player.choose_pile(last_discarded, action)
-            self.pick_card(chosen_pile)
-            self.switch_player()
+            self.apply_computer_decision(*self.computer_decision())
 
         else:
-            logger.info(f"Your hand: {[f'{i} = {card}' for i, card in enumerate(current_player.hand)]}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Your hand: %s", [f"{i} = {card}" for i, card in enumerate(current_player.hand)])
             new_action = action or input("Choose an action (play/discard): ")
             while True:
                 if new_action not in ["play", "discard"]:
-                    logger.warning(f"{new_action} is not a valid action. Choose play or discard.")
+                    logger.warning("%s is not a valid action. Choose play or discard.", new_action)
                     new_action = input("Choose an action (play/discard): ")
                 else:
                     break
@@ -194,11 +419,12 @@ class LostCitiesGame:
             self.play_round()
 
         scores: dict[str, Any] = {player.name: player.compute_score() for player in self.players}
-        logger.info(f"Scores: {scores}")
-        logger.info(f"Winner: {max(scores, key=scores.get)}")  # type: ignore
+        logger.info("Scores: %s", scores)
+        logger.info("Winner: %s", max(scores, key=scores.get))  # type: ignore
 
 
 def main() -> None:  # pragma: nocover
+    enable_logging()
     name1: str = input("Name of Player 1? ")
     vs_computer_Yn: str = input("Play against computer? (Y/n): ")
     vs_computer: bool = True
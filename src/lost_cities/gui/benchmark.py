@@ -0,0 +1,137 @@
+import argparse
+import random
+import statistics
+import time
+from typing import Callable, Optional
+
+import pygame
+
+from lost_cities.gui.gui import GUIGame
+from lost_cities.gui.settings import settings
+
+STAGES: tuple[str, ...] = ("events", "setup_structure", "played_cards", "hand", "board", "end_screen")
+
+
+def scripted_clicks(gui: GUIGame) -> list[tuple[int, int]]:
+    """Clicks of the human player for one turn: select a card, play it if possible else discard it, draw from the deck
+
+    Args:
+        gui (GUIGame): interface being benchmarked
+
+    Returns:
+        list[tuple[int, int]]: positions of the clicks, one per frame
+    """
+    player = gui.game.players[0]
+    index: int = 0
+    logo: tuple[int, int] = settings.discard_play_position
+    for position, candidate in enumerate(player.hand):
+        expedition = player.board[candidate.color]
+        if not expedition or candidate.value >= expedition[-1].value:
+            index, logo = position, settings.logo_play_position
+            break
+    x, y = gui.hand_positions[index]
+    return [(x + 1, y + 1), (logo[0] + 1, logo[1] + 1), settings.deck_position]
+
+
+def run_benchmark(
+    nb_games: int = 1, seed: int = 0, end_frames: int = 10, timeout: float = 10.0
+) -> dict[str, dict[str, float]]:
+    """Replay scripted games on a headless full redraw GUI and time every stage of each frame
+
+    Args:
+        nb_games (int, optional): number of games to replay. Defaults to 1.
+        seed (int, optional): seed of the deals. Defaults to 0.
+        end_frames (int, optional): frames drawn on the end screen of each game. Defaults to 10.
+        timeout (float, optional): seconds allowed to the computer per turn. Defaults to 10.0.
+
+    Returns:
+        dict[str, dict[str, float]]: per stage and for whole frames, number of samples and mean, median, p95 and max
+            durations in milliseconds
+    """
+    gui = GUIGame(render_mode="full", headless=True)
+    timings: dict[str, list[float]] = {stage: [] for stage in (*STAGES, "frame")}
+    stages: list[tuple[str, Callable[[], None]]] = [
+        ("events", gui.trigger_event),
+        ("setup_structure", gui.show_setup_structure),
+        ("played_cards", gui.show_played_cards),
+        ("hand", gui.show_hand),
+        ("board", gui.show_board),
+        ("end_screen", gui.stop_game),
+    ]
+
+    def frame() -> None:
+        frame_start: float = time.perf_counter()
+        for stage, function in stages:
+            start: float = time.perf_counter()
+            function()
+            timings[stage].append(time.perf_counter() - start)
+        timings["frame"].append(time.perf_counter() - frame_start)
+
+    try:
+        for game_index in range(nb_games):
+            gui.game = gui.new_game()
+            gui.game.rng = random.Random(f"{seed}:{game_index}")
+            gui.game.setup()
+            gui.end = False
+            gui.final_scores = None
+            frame()
+            while gui.game.deck:
+                if gui.game.current_player == 1:
+                    # the computer thinks on a worker thread, frames are drawn until its decision is delivered
+                    deadline: float = time.perf_counter() + timeout
+                    while gui.game.current_player == 1 and gui.game.deck:
+                        if time.perf_counter() > deadline:
+                            raise RuntimeError("the computer did not play in time")
+                        frame()
+                    continue
+                for position in scripted_clicks(gui):
+                    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=position))
+                    frame()
+                if gui.game.current_player == 0:
+                    raise RuntimeError("the scripted turn of the player did not complete")
+            for _ in range(end_frames):
+                frame()
+    finally:
+        gui.executor.shutdown(cancel_futures=True)
+        pygame.quit()
+
+    return {
+        stage: {
+            "samples": len(durations),
+            "mean_ms": statistics.mean(durations) * 1000,
+            "median_ms": statistics.median(durations) * 1000,
+            "p95_ms": sorted(durations)[int(0.95 * (len(durations) - 1))] * 1000,
+            "max_ms": max(durations) * 1000,
+        }
+        for stage, durations in timings.items()
+    }
+
+
+def format_report(report: dict[str, dict[str, float]]) -> str:
+    """Human readable report
+
+    Args:
+        report (dict[str, dict[str, float]]): output of run_benchmark
+
+    Returns:
+        str: one line per stage
+    """
+    lines: list[str] = [f"{'stage':<16}{'samples':>8}{'mean ms':>10}{'median ms':>11}{'p95 ms':>10}{'max ms':>10}"]
+    for stage, stats in report.items():
+        lines.append(
+            f"{stage:<16}{stats['samples']:>8}{stats['mean_ms']:>10.3f}{stats['median_ms']:>11.3f}"
+            + f"{stats['p95_ms']:>10.3f}{stats['max_ms']:>10.3f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Time the GUI frames offscreen on scripted games")
+    parser.add_argument("-n", "--games", type=int, default=1, help="number of games")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the deals")
+    args = parser.parse_args(argv)
+    print(format_report(run_benchmark(args.games, args.seed)))
+
+
+if __name__ == "__main__":  # pragma: nocover
+    main()
@@ -1,23 +1,65 @@
-from typing import Any, Optional
+import argparse
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Literal, Optional
 
-import numpy as np
 import pygame
 from pygame import Rect, Surface
 
+from lost_cities import enable_logging
 from lost_cities.card import Card
 from lost_cities.game import LostCitiesGame
 from lost_cities.gui.settings import settings
-from lost_cities.gui.utils import extract_card
+from lost_cities.gui.utils import ASSETS_PATH, build_sprite_cache, get_card_surface, get_deck_surface
+from lost_cities.mcts import MCTSComputerPlayer
+from lost_cities.tournament import STRATEGIES
+
+HAND_SIZE: int = 8
+MAX_EXPEDITION: int = 12
+# event posted by the worker thread when the computer has chosen its action
+COMPUTER_DECISION: int = pygame.USEREVENT + 1
 
 
 class GUIGame:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        render_mode: Literal["full", "dirty"] = "dirty",
+        fps: int = 30,
+        text_cache_size: int = 64,
+        headless: bool = False,
+        strategy: str = "computer",
+        think_time: Optional[float] = None,
+    ) -> None:
+        """Pygame interface against the computer
+
+        Args:
+            render_mode (Literal["full", "dirty"], optional): "full" redraws the whole screen every frame, "dirty"
+                redraws only the regions changed by an action and skips idle frames. Defaults to "dirty".
+            fps (int, optional): maximum number of frames per second. Defaults to 30.
+            text_cache_size (int, optional): maximum number of rendered texts kept. Defaults to 64.
+            headless (bool, optional): render to an offscreen Surface with the SDL dummy video driver, no window is
+                opened. Defaults to False.
+            strategy (str, optional): registered computer strategy, see lost_cities.tournament. Defaults to "computer".
+            think_time (Optional[float], optional): seconds a searching computer may think per turn. Defaults to None,
+                the strategy default.
+        """
+        if render_mode not in ("full", "dirty"):
+            raise ValueError(f"render_mode must be 'full' or 'dirty', not {render_mode}")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy}, choose among {sorted(STRATEGIES)}")
+        self.render_mode: Literal["full", "dirty"] = render_mode
+        self.fps: int = fps
+        self.headless: bool = headless
+        self.strategy: str = strategy
+        self.think_time: Optional[float] = think_time
         self.assets: dict[str, Surface] = {
-            "board_image": pygame.image.load("src/lost_cities/gui/assets/board.webp"),
-            "play_logo": pygame.image.load("src/lost_cities/gui/assets/play.png"),
-            "discard_logo": pygame.image.load("src/lost_cities/gui/assets/trash.png"),
+            "board_image": pygame.image.load(ASSETS_PATH / "board.webp"),
+            "play_logo": pygame.image.load(ASSETS_PATH / "play.png"),
+            "discard_logo": pygame.image.load(ASSETS_PATH / "trash.png"),
         }
-        self.assets["deck"] = pygame.pixelcopy.make_surface(np.flipud(extract_card("Back", 0)))
+        build_sprite_cache()
+        self.assets["deck"] = get_deck_surface()
 
         self.pygame_objects: dict[str, Rect] = {
             "play_logo_rect": self.assets["play_logo"].get_rect(),
@@ -29,98 +71,239 @@ class GUIGame:
         self.pygame_objects["play_logo_rect"].topleft = settings.logo_play_position  # type: ignore
         self.pygame_objects["discard_logo_rect"].topleft = settings.discard_play_position  # type: ignore
         self.pygame_objects["deck_rect"].topleft = settings.deck_position  # type: ignore
-
-        # Pygame structure
+        for color, position in settings.discard_positions.items():
+            self.pygame_objects[f"discard_rect:{color}"] = Rect(position, (settings.CARD_WIDTH, settings.CARD_HEIGHT))
+
+        # Pygame structure, the dummy video driver of headless games is only set while the display starts so the
+        # environment of the process is left as it was
+        if headless and not pygame.display.get_init():
+            video_driver: Optional[str] = os.environ.get("SDL_VIDEODRIVER")
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            try:
+                pygame.display.init()
+            finally:
+                if video_driver is None:
+                    del os.environ["SDL_VIDEODRIVER"]
+                else:
+                    os.environ["SDL_VIDEODRIVER"] = video_driver
+        elif not headless and pygame.display.get_init() and pygame.display.get_driver() == "dummy":
+            if os.environ.get("SDL_VIDEODRIVER") != "dummy":
+                # started by a headless game, a window needs the default driver
+                pygame.display.quit()
         pygame.init()
-        self.screen: Surface = pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
-        pygame.display.set_caption("Lost Cities GUI")
-        self.font = pygame.font.Font("src/lost_cities/gui/assets/atlantis_font.ttf", 40)
+        self.screen: Surface
+        if headless:
+            self.screen = Surface((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+        else:
+            self.screen = pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+            pygame.display.set_caption("Lost Cities GUI")
+        self.font = pygame.font.Font(ASSETS_PATH / "atlantis_font.ttf", 40)
         self.running: bool = True
         self.rect_selected: Optional[pygame.Rect] = None
-        self.selected_card: Optional[Card] = None
+        # position of the selected card in the hand, cards are compared by position and not by value
+        self.selected_index: Optional[int] = None
         self.last_action: Optional[str] = None
         self.end: bool = False
 
+        # Rendering
+        self.clock = pygame.time.Clock()
+        self.regions: dict[str, Rect] = self.compute_regions()
+        self.dirty_rects: list[Rect] = []
+        self.frames_drawn: int = 0
+        self.frames_skipped: int = 0
+        self.text_cache: OrderedDict[tuple[str, tuple], Surface] = OrderedDict()
+        self.text_cache_size: int = text_cache_size
+        self.hand_positions: list[tuple[int, int]] = [
+            (5, int(50 + settings.CARD_HEIGHT * 0.66 * i)) for i in range(HAND_SIZE)
+        ]
+        self.hand_rects: list[Rect] = [
+            Rect(position, (settings.CARD_WIDTH, settings.CARD_HEIGHT)) for position in self.hand_positions
+        ]
+        self.board_positions: dict[str, dict[str, list[tuple[int, int]]]] = {
+            player_side: {
+                color: [(x, y + (-20 if player_side == "computer" else 20) * i) for i in range(MAX_EXPEDITION)]
+                for color, (x, y) in positions.items()
+            }
+            for player_side, positions in settings.pile_positions.items()
+        }
+        self.final_scores: Optional[dict[str, Any]] = None
+
+        # Computer turns run on a worker thread so the interface keeps rendering
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="computer")
+        self.thinking: Optional[Future] = None
+
         # Final Game
-        self.game: LostCitiesGame = LostCitiesGame("Player1", "Computer", True)
+        self.game: LostCitiesGame = self.new_game()
         self.game.deck = self.game.deck[:20]
 
+    def new_game(self) -> LostCitiesGame:
+        """Game against a fresh computer of the configured strategy, not set up"""
+        game = LostCitiesGame("Player1", "Computer", True)
+        computer = STRATEGIES[self.strategy]("Computer")
+        if self.think_time is not None and isinstance(computer, MCTSComputerPlayer):
+            computer.time_budget = self.think_time
+        game.players[1] = computer
+        return game
+
+    @staticmethod
+    def compute_regions() -> dict[str, Rect]:
+        """Screen regions redrawn after an action: hand, deck, discard and one column per expedition"""
+        regions: dict[str, Rect] = {
+            "hand": Rect(0, 0, settings.CARD_WIDTH + 10, settings.SCREEN_HEIGHT),
+            "deck": Rect(settings.deck_position, (settings.CARD_HEIGHT, settings.CARD_WIDTH)),
+            "discard": Rect(settings.board_position, (settings.BOARD_WIDTH, settings.BOARD_HEIGHT)),
+        }
+        for color, (x, y) in settings.pile_positions["player"].items():
+            regions[f"player:{color}"] = Rect(x, y, settings.CARD_WIDTH, settings.SCREEN_HEIGHT - y)
+        for color, (x, y) in settings.pile_positions["computer"].items():
+            regions[f"computer:{color}"] = Rect(x, 0, settings.CARD_WIDTH, y + settings.CARD_HEIGHT)
+        return regions
+
+    def render_text(self, text: str, color: tuple) -> Surface:
+        """Rendered text, kept in a bounded cache evicting the least recently used texts
+
+        Args:
+            text (str): text to render
+            color (tuple): RGB color
+
+        Returns:
+            Surface: rendered text
+        """
+        key: tuple[str, tuple] = (text, color)
+        surface: Optional[Surface] = self.text_cache.get(key)
+        if surface is None:
+            surface = self.font.render(text, True, color)
+            self.text_cache[key] = surface
+            if len(self.text_cache) > self.text_cache_size:
+                self.text_cache.popitem(last=False)
+        else:
+            self.text_cache.move_to_end(key)
+        return surface
+
+    def mark_dirty(self, *names: str) -> None:
+        """Schedule regions to be redrawn on the next frame
+
+        Args:
+            names (str): region names of self.regions, "screen" for the whole screen
+        """
+        for name in names:
+            if name == "screen":
+                self.dirty_rects = [self.screen.get_rect()]
+                return
+            if self.dirty_rects != [self.screen.get_rect()]:
+                self.dirty_rects.append(self.regions[name])
+
     def show_setup_structure(self) -> None:
         """Blits important infos as:
         - Deck
-        - Discard if there is one
         - Play and discard logo
         - Hand text
         """
         self.screen.fill(settings.WHITE)
 
         self.screen.blit(self.assets["deck"], settings.deck_position)
-        self.screen.blit(self.font.render(f"{len(self.game.deck)}", True, settings.WHITE), settings.deck_text_position)
-
-        # discard
-        if self.game.discard_piles:
-            self.game.discard_piles[-1].set_coord(settings.discard_position[0], settings.discard_position[1])
-            self.screen.blit(self.game.discard_piles[-1].surface, settings.discard_position)
+        self.screen.blit(self.render_text(f"{len(self.game.deck)}", settings.WHITE), settings.deck_text_position)
 
         # logo:
         self.screen.blit(self.assets["play_logo"], settings.logo_play_position)
         self.screen.blit(self.assets["discard_logo"], settings.discard_play_position)
 
         # hand
-        self.screen.blit(self.font.render("Hand:", True, (200, 200, 200)), (5, 5))
+        self.screen.blit(self.render_text("Hand:", (200, 200, 200)), (5, 5))
 
     def show_played_cards(self) -> None:
         """Blits all cards played by both player in the board"""
         played_card = {"player": self.game.players[0].board, "computer": self.game.players[1].board}
         for player_side, colors in played_card.items():
-            step: int = -20 if player_side == "computer" else 20
             for color, cards in colors.items():
+                positions: list[tuple[int, int]] = self.board_positions[player_side][color]
                 for i, card in enumerate(cards):
-                    x, y = settings.pile_positions[player_side][color]
-                    y += step * i
-                    card.unrotate_surface_to_discard()
-                    self.screen.blit(card.surface, (x, y))
+                    self.screen.blit(get_card_surface(card.color, card.value), positions[i])
 
     def show_hand(self) -> None:
-        """Blits all player's cards and the rect for the selected one"""
-        for i, card in enumerate(self.game.players[0].hand):
-            x = 5
-            y = 50 + settings.CARD_HEIGHT * 0.66 * i
-            card.set_coord(x, y)
-            self.screen.blit(card.surface, (x, y))
+        """Blits all player's cards and the rect for the selected one, cards are shared so they are not moved"""
+        for card, position in zip(self.game.players[0].hand, self.hand_positions):
+            self.screen.blit(get_card_surface(card.color, card.value), position)
 
         if self.rect_selected is not None:
             pygame.draw.rect(self.screen, settings.RED, self.rect_selected, 2)
 
+    def show_board(self) -> None:
+        """Blits the board image between both players' expeditions and the top card of each discard pile on it"""
+        self.screen.blit(self.assets["board_image"], settings.board_position)
+        for color, position in settings.discard_positions.items():
+            top: Optional[Card] = self.game.discard_piles.top(color)
+            if top is not None:
+                self.screen.blit(get_card_surface(top.color, top.value), position)
+
     def trigger_event(self) -> None:
-        """Triggers all events based on a click"""
+        """Triggers all events based on a click, applies the computer decisions and starts the computer turns"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
 
+            elif event.type == COMPUTER_DECISION:
+                self.apply_computer_decision(event)
+
             elif len(self.game.deck) == 0 and event.type == pygame.KEYUP and event.unicode.lower() == "r":
                 self.do_i_need_to_restart(event)
 
-            elif self.game.current_player == 1 and len(self.game.deck) >= 1:
-                self.game.play_round()
-
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            elif self.game.current_player == 0 and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 self.choose_card(event)
 
                 self.gui_action(event)
 
                 self.pick_card_on_pile(event)
 
+        self.start_computer_turn()
+
+    def start_computer_turn(self) -> None:
+        """Submit the computer decision to the worker thread when it is its turn and it is not already thinking"""
+        if self.game.current_player == 1 and len(self.game.deck) >= 1 and self.thinking is None:
+            game: LostCitiesGame = self.game
+            self.thinking = self.executor.submit(game.computer_decision)
+            self.thinking.add_done_callback(lambda future: self.post_computer_decision(game, future))
+
+    @staticmethod
+    def post_computer_decision(game: LostCitiesGame, future: Future) -> None:
+        """Deliver a decision to the event loop, called on the worker thread
+
+        Args:
+            game (LostCitiesGame): game the decision was computed for
+            future (Future): finished decision
+        """
+        try:
+            pygame.event.post(pygame.event.Event(COMPUTER_DECISION, game=game, future=future))
+        except pygame.error:  # pragma: nocover
+            pass  # the interface was closed while the computer was thinking
+
+    def apply_computer_decision(self, event: pygame.event.Event) -> None:
+        """Play the decision delivered by the worker thread, decisions of a previous game are ignored: a restart reuses
+        the game but forgets the decision being computed
+
+        Args:
+            event (pygame.event.Event): COMPUTER_DECISION event
+        """
+        future: Future = event.future
+        if event.game is not self.game or future is not self.thinking:
+            return
+        self.thinking = None
+        self.game.apply_computer_decision(*future.result())
+        self.mark_dirty("deck", "discard", *(f"computer:{color}" for color in self.game.colors))
+
     def choose_card(self, event: pygame.event.Event) -> None:
         """Hightlight the selected card
 
         Args:
             event (pygame.event.Event): click event
         """
-        for card in self.game.players[0].hand:
-            if card.rect.collidepoint(event.pos):
-                self.rect_selected = pygame.Rect(card.x, card.y, settings.CARD_WIDTH, settings.CARD_HEIGHT)
-                self.selected_card = card
+        # cards overlap, the last one drawn is on top
+        for index in reversed(range(len(self.game.players[0].hand))):
+            if self.hand_rects[index].collidepoint(event.pos):
+                self.rect_selected = self.hand_rects[index]
+                self.selected_index = index
+                self.mark_dirty("hand")
+                break
 
     def gui_action(self, event: pygame.event.Event) -> None:
         """Event action for playing and discard. Need to select a card before.
@@ -128,43 +311,44 @@ class GUIGame:
         Args:
             event (pygame.event.Event): click event
         """
-        if self.selected_card is not None and len(self.game.players[0].hand) == 8:
+        if self.selected_index is not None and len(self.game.players[0].hand) == 8:
             if self.pygame_objects["play_logo_rect"].collidepoint(event.pos):
-                self.game.play_round(
-                    "play", str(self.game.players[0].hand.index(self.selected_card)), skip_card=True, gui=True
-                )
+                color: str = self.game.players[0].hand[self.selected_index].color
+                self.mark_dirty("hand", f"player:{color}")
+                self.game.play_round("play", str(self.selected_index), skip_card=True, gui=True)
                 self.last_action = "play"
-                self.selected_card = None
+                self.selected_index = None
                 self.rect_selected = None
 
             elif self.pygame_objects["discard_logo_rect"].collidepoint(event.pos):
-                self.game.play_round(
-                    "discard", str(self.game.players[0].hand.index(self.selected_card)), skip_card=True
-                )
+                self.mark_dirty("hand", "discard")
+                self.game.play_round("discard", str(self.selected_index), skip_card=True)
                 self.last_action = "discard"
-                self.selected_card = None
+                self.selected_index = None
                 self.rect_selected = None
 
     def pick_card_on_pile(self, event: pygame.event.Event) -> None:
-        """Either take a card from discard or deck. Only trigger if you have less than 8 cards and there is a click on
-        one the two piles.
+        """Either take a card from a discard pile or the deck. Only trigger if you have less than 8 cards and there is a
+        click on the deck or on a discard pile other than the one of the card just discarded.
 
         Args:
             event (pygame.event.Event): click event
         """
-        if (
-            len(self.game.players[0].hand) != 8
-            and self.game.discard_piles
-            and self.game.discard_piles[-1].rect.collidepoint(event.pos)
-            and self.last_action != "discard"
-        ):
-            self.game.discard_piles[-1].unrotate_surface_to_discard()
-            self.game.pick_card("discard")
-            self.game.switch_player()
-
-        elif len(self.game.players[0].hand) != 8 and self.pygame_objects["deck_rect"].collidepoint(event.pos):
+        if len(self.game.players[0].hand) == 8:
+            return
+        for color in settings.discard_positions:
+            if self.pygame_objects[f"discard_rect:{color}"].collidepoint(event.pos) and self.game.can_pick(
+                color, self.game.just_discarded
+            ):
+                self.game.pick_card("discard", color)
+                self.game.switch_player()
+                self.mark_dirty("hand", "discard")
+                return
+
+        if self.pygame_objects["deck_rect"].collidepoint(event.pos):
             self.game.pick_card("deck")
             self.game.switch_player()
+            self.mark_dirty("hand", "deck")
 
     def do_i_need_to_restart(self, event: pygame.event.Event) -> None:
         """Restart the game when clicking and this is the end
@@ -173,9 +357,11 @@ class GUIGame:
             event (pygame.event.Event): click event
         """
         if self.end is True:
-            self.game = LostCitiesGame("Player1", "Computer", True)
+            self.thinking = None
             self.game.setup()
             self.end = False
+            self.final_scores = None
+            self.mark_dirty("screen")
 
     def stop_game(self) -> None:
         """End layout, display who wons into an ugly rectangle"""
@@ -184,29 +370,65 @@ class GUIGame:
             pygame.draw.rect(
                 self.screen, settings.BLACK, (settings.END_X, settings.END_Y, settings.END_WIDTH, settings.END_HEIGHT)
             )
-            scores: dict[str, Any] = {player.name: player.compute_score() for player in self.game.players}
-            game_ended_text: pygame.font.Font = self.font.render(  # type: ignore
-                f"Winner: {max(scores, key=scores.get)}", True, settings.WHITE  # type: ignore
-            )
-            score_player1: pygame.font.Font = self.font.render(  # type: ignore
-                f"Player1: {scores['Player1'][0]}", True, settings.WHITE
-            )
-            score_computer: pygame.font.Font = self.font.render(  # type: ignore
-                f"Computer: {scores['Computer'][0]}", True, settings.WHITE
-            )
-            # mypy says bullshits
-            self.screen.blit(
-                game_ended_text,  # type: ignore
-                ((settings.END_WIDTH - game_ended_text.get_width()) // 2, settings.END_Y + 50),  # type: ignore
-            )
-            self.screen.blit(
-                score_player1,  # type: ignore
-                ((settings.END_WIDTH - score_player1.get_width()) // 2, settings.END_Y + 150),  # type: ignore
-            )
-            self.screen.blit(
-                score_computer,  # type: ignore
-                ((settings.END_WIDTH - score_computer.get_width()) // 2, settings.END_Y + 250),  # type: ignore
-            )
+            if self.final_scores is None:
+                self.final_scores = {player.name: player.compute_score() for player in self.game.players}
+            scores: dict[str, Any] = self.final_scores
+            texts: list[Surface] = [
+                self.render_text(f"Winner: {max(scores, key=lambda name: scores[name][0])}", settings.WHITE),
+                self.render_text(f"Player1: {scores['Player1'][0]}", settings.WHITE),
+                self.render_text(f"Computer: {scores['Computer'][0]}", settings.WHITE),
+            ]
+            for i, text in enumerate(texts):
+                self.screen.blit(text, ((settings.END_WIDTH - text.get_width()) // 2, settings.END_Y + 50 + 100 * i))
+
+    def draw_frame(self) -> None:
+        """Blits every element of the screen, restricted to the clip area of the screen if any"""
+        self.show_setup_structure()
+        self.show_played_cards()
+        self.show_hand()
+        self.show_board()
+        self.stop_game()
+
+    def present(self, rects: Optional[list[Rect]] = None) -> None:
+        """Send the screen, or only some rectangles of it, to the display. Nothing to do when headless.
+
+        Args:
+            rects (Optional[list[Rect]], optional): rectangles to update. Defaults to None, the whole screen.
+        """
+        if self.headless:
+            return
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    def render(self) -> bool:
+        """Draw a frame. In "dirty" mode only the dirty regions are redrawn and sent to the display, nothing is done
+        on idle frames.
+
+        Returns:
+            bool: whether something was drawn
+        """
+        if self.render_mode == "full":
+            self.draw_frame()
+            self.present()
+            self.frames_drawn += 1
+            return True
+
+        if len(self.game.deck) == 0 and not self.end:
+            self.mark_dirty("screen")
+        if not self.dirty_rects:
+            self.frames_skipped += 1
+            return False
+
+        rects, self.dirty_rects = self.dirty_rects, []
+        for rect in rects:
+            self.screen.set_clip(rect)
+            self.draw_frame()
+        self.screen.set_clip(None)
+        self.present(rects)
+        self.frames_drawn += 1
+        return True
 
     def can_i_play(self, nb_testing: Optional[int] = None) -> None:
         """Launch the game
@@ -216,23 +438,26 @@ class GUIGame:
         """
 
         self.game.setup()
+        self.mark_dirty("screen")
         cpt: int = 0
         while self.running:
-            self.show_setup_structure()
-            self.show_played_cards()
-            self.show_hand()
             self.trigger_event()
-            self.screen.blit(self.assets["board_image"], settings.board_position)
-            self.stop_game()
-            pygame.display.flip()
+            self.render()
+            self.clock.tick(self.fps)
             if nb_testing is not None and nb_testing >= cpt:
                 break
             cpt += 1
+        self.executor.shutdown(wait=False, cancel_futures=True)
         pygame.quit()
 
 
-def main() -> None:  # pragma: nocover
-    gameGUI = GUIGame()
+def main(argv: Optional[list[str]] = None) -> None:  # pragma: nocover
+    parser = argparse.ArgumentParser(description="Play Lost Cities against the computer")
+    parser.add_argument("--strategy", default="computer", choices=sorted(STRATEGIES), help="computer strategy")
+    parser.add_argument("--think-time", type=float, default=None, help="seconds a searching computer may think")
+    args = parser.parse_args(argv)
+    enable_logging()
+    gameGUI = GUIGame(strategy=args.strategy, think_time=args.think_time)
     gameGUI.can_i_play()
 
 
@@ -47,7 +47,15 @@ class Settings(BaseSettings):
 
     deck_position: tuple = (board_position[0] + 650, board_position[1])
     deck_text_position: tuple = (int(deck_position[0] + 50), int(deck_position[1] + 25))
-    discard_position: tuple = (board_position[0] + 650, board_position[1] + CARD_WIDTH + 10)
+    # one discard pile per color, on the board between both expeditions of the color
+    DISCARD_HEIGHT: int = board_position[1] + 25
+    discard_positions: dict[str, tuple] = {
+        "Yellow": (board_position[0] + 40, DISCARD_HEIGHT),
+        "Blue": (board_position[0] + 160, DISCARD_HEIGHT),
+        "White": (board_position[0] + 280, DISCARD_HEIGHT),
+        "Green": (board_position[0] + 405, DISCARD_HEIGHT),
+        "Red": (board_position[0] + 530, DISCARD_HEIGHT),
+    }
 
     logo_play_position: tuple = (board_position[0] - 80, board_position[1])
     discard_play_position: tuple = (board_position[0] - 80, board_position[1] + CARD_WIDTH + 10)
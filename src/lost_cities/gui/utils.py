@@ -1,8 +1,24 @@
+from functools import lru_cache
+from pathlib import Path
+
 import numpy as np
+import pygame
 from PIL import Image
 
-image: np.ndarray = np.array(Image.open("src/lost_cities/gui/assets/cards.webp"))
+ASSETS_PATH: Path = Path(__file__).parent / "assets"
 size: tuple[int, int] = (85, 133)
+ATLAS_COLORS: list[str] = ["Yellow", "Blue", "White", "Green", "Red", "Back"]
+ATLAS_VALUES: list[int] = [0, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+
+@lru_cache(maxsize=None)
+def get_atlas() -> np.ndarray:
+    """Decode the cards atlas the first time it is needed
+
+    Returns:
+        np.ndarray: rgba image with every card
+    """
+    return np.array(Image.open(ASSETS_PATH / "cards.webp"))
 
 
 def extract_card(color: str, value: int) -> np.ndarray:
@@ -15,11 +31,12 @@ def extract_card(color: str, value: int) -> np.ndarray:
     Returns:
         np.ndarray: graphical card
     """
-    index_color = ["Yellow", "Blue", "White", "Green", "Red", "Back"].index(color)
+    index_color = ATLAS_COLORS.index(color)
     if value == 0:
         value = 11
     value -= 2
 
+    image: np.ndarray = get_atlas()
     return rgba2rgb(image[size[1] * index_color : size[1] * (index_color + 1), size[0] * value : size[0] * (value + 1)])
 
 
@@ -49,3 +66,49 @@ def rgba2rgb(rgba: np.ndarray, background: tuple[int, int, int] = (255, 255, 255
     rgb[:, :, 2] = b * a + (1.0 - a) * B
 
     return np.asarray(rgb, dtype="uint8")
+
+
+@lru_cache(maxsize=None)
+def get_card_image(color: str, value: int) -> np.ndarray:
+    """Cached version of extract_card, the atlas is sliced and blended only once per card
+
+    Args:
+        color (str): card color
+        value (int): card value
+
+    Returns:
+        np.ndarray: graphical card, shared between callers so it must not be modified
+    """
+    img: np.ndarray = extract_card(color, value)
+    img.flags.writeable = False
+    return img
+
+
+@lru_cache(maxsize=None)
+def get_card_surface(color: str, value: int) -> pygame.Surface:
+    """Upright surface of a card, built once and shared by all cards with the same color and value. No rotated
+    surface is cached per card: discarded cards are drawn upright, the deck back is the only sideways view, see
+    get_deck_surface.
+
+    Args:
+        color (str): card color
+        value (int): card value
+
+    Returns:
+        pygame.Surface: upright surface
+    """
+    return pygame.pixelcopy.make_surface(np.flipud(np.rot90(get_card_image(color, value))))
+
+
+@lru_cache(maxsize=None)
+def get_deck_surface() -> pygame.Surface:
+    """Back of a card lying sideways, the only rotated view of the interface"""
+    return pygame.pixelcopy.make_surface(np.flipud(get_card_image("Back", 0)))
+
+
+def build_sprite_cache() -> None:
+    """Precompute surfaces of every card of the atlas, to avoid any conversion while rendering"""
+    for color in ATLAS_COLORS[:-1]:
+        for value in ATLAS_VALUES:
+            get_card_surface(color, value)
+    get_deck_surface()
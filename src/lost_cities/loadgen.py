@@ -0,0 +1,228 @@
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import time
+from collections import defaultdict
+from typing import Any, Optional
+
+from lost_cities.server import GameServer
+
+
+def percentile(values: list[float], rank: float) -> float:
+    """Nearest rank percentile
+
+    Args:
+        values (list[float]): samples
+        rank (float): percentile between 0 and 100
+
+    Returns:
+        float: value below which rank percent of the samples are, 0.0 without samples
+    """
+    if not values:
+        return 0.0
+    ordered: list[float] = sorted(values)
+    return ordered[max(0, math.ceil(rank / 100 * len(ordered)) - 1)]
+
+
+def choose_move(state: dict[str, Any]) -> dict[str, Any]:
+    """Move of a load client: the first playable card of the hand, otherwise discard the first card, draw in the deck
+
+    Args:
+        state (dict[str, Any]): "state" message of the server
+
+    Returns:
+        dict[str, Any]: "move" request without id
+    """
+    board: dict[str, list[int]] = state["boards"][state["seat"]]
+    for color, value in state["hand"]:
+        expedition: list[int] = board.get(color, [])
+        if not expedition or value >= expedition[-1]:
+            return {"op": "move", "table": state["table"], "kind": "play", "card": [color, value], "pile": "deck"}
+    return {"op": "move", "table": state["table"], "kind": "discard", "card": state["hand"][0], "pile": "deck"}
+
+
+class LoadClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """One connection playing several tables, replies are routed by request id and table
+
+        Args:
+            reader (asyncio.StreamReader): socket reader
+            writer (asyncio.StreamWriter): socket writer
+        """
+        self.reader: asyncio.StreamReader = reader
+        self.writer: asyncio.StreamWriter = writer
+        self.pending: dict[int, asyncio.Future] = {}
+        self.tables: defaultdict[int, asyncio.Queue] = defaultdict(asyncio.Queue)
+        self.latencies: defaultdict[str, list[float]] = defaultdict(list)
+        self.errors: int = 0
+        self._ids = itertools.count()
+
+    async def listen(self) -> None:
+        """Route the messages of the server until the connection closes"""
+        while True:
+            line: bytes = await self.reader.readline()
+            if not line:
+                break
+            message: dict[str, Any] = json.loads(line)
+            if message["event"] == "ack":
+                self.pending.pop(message["id"]).set_result(message)
+            elif message["event"] == "error":
+                self.errors += 1
+                if message.get("id") in self.pending:
+                    self.pending.pop(message["id"]).set_exception(ValueError(message["message"]))
+            elif "table" in message:
+                self.tables[message["table"]].put_nowait(message)
+
+    async def request(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Send a request and wait for its acknowledgement, the round trip is recorded by op
+
+        Args:
+            message (dict[str, Any]): request without id
+
+        Raises:
+            ValueError: if the server rejects the request
+
+        Returns:
+            dict[str, Any]: "ack" message
+        """
+        request_id: int = next(self._ids)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        start: float = time.perf_counter()
+        self.writer.write(json.dumps({**message, "id": request_id}).encode() + b"\n")
+        await self.writer.drain()
+        reply: dict[str, Any] = await future
+        self.latencies[message["op"]].append(time.perf_counter() - start)
+        return reply
+
+    async def play_table(self) -> int:
+        """Open a table against the computer and play it to the end, rejected requests are counted in errors
+
+        Returns:
+            int: number of moves played, 0 when the server refuses to open the table
+        """
+        try:
+            reply: dict[str, Any] = await self.request({"op": "new", "name": "load", "opponent": "computer"})
+        except ValueError:
+            return 0
+        queue: asyncio.Queue = self.tables[reply["table"]]
+        moves: int = 0
+        while True:
+            state: dict[str, Any] = await queue.get()
+            if state["event"] in ("over", "closed"):
+                break
+            if state["event"] == "state" and state["turn"] == state["seat"]:
+                try:
+                    await self.request(choose_move(state))
+                except ValueError:
+                    # the table would wait for a legal move forever
+                    await self.request({"op": "leave", "table": reply["table"]})
+                    break
+                moves += 1
+        del self.tables[reply["table"]]
+        return moves
+
+
+async def run_load(host: str, port: int, nb_tables: int = 100, connections: int = 10) -> dict[str, Any]:
+    """Play nb_tables full games against the computer of a server, spread over several connections
+
+    Args:
+        host (str): server address
+        port (int): server port
+        nb_tables (int, optional): number of tables played concurrently. Defaults to 100.
+        connections (int, optional): number of client connections. Defaults to 10.
+
+    Returns:
+        dict[str, Any]: tables, moves, throughput, errors and latency percentiles in milliseconds by request type
+    """
+    clients: list[LoadClient] = []
+    for _ in range(connections):
+        reader, writer = await asyncio.open_connection(host, port, limit=2**20)
+        clients.append(LoadClient(reader, writer))
+    listeners: list[asyncio.Task] = [asyncio.create_task(client.listen()) for client in clients]
+
+    start: float = time.perf_counter()
+    moves: list[int] = await asyncio.gather(*(clients[i % connections].play_table() for i in range(nb_tables)))
+    elapsed: float = time.perf_counter() - start
+
+    for client in clients:
+        client.writer.close()
+    await asyncio.gather(*listeners, return_exceptions=True)
+
+    latencies: defaultdict[str, list[float]] = defaultdict(list)
+    for client in clients:
+        for op, values in client.latencies.items():
+            latencies[op].extend(values)
+    return {
+        "tables": nb_tables,
+        "moves": sum(moves),
+        "seconds": elapsed,
+        "moves_per_second": sum(moves) / elapsed if elapsed > 0 else float("inf"),
+        "errors": sum(client.errors for client in clients),
+        "latency_ms": {
+            op: {f"p{rank}": percentile(values, rank) * 1000 for rank in (50, 90, 99)}
+            | {"max": max(values) * 1000, "count": len(values)}
+            for op, values in latencies.items()
+        },
+    }
+
+
+async def run_local(nb_tables: int = 100, connections: int = 10, computer_workers: int = 4) -> dict[str, Any]:
+    """Start a server in the current process on a free port and load it
+
+    Args:
+        nb_tables (int, optional): number of tables. Defaults to 100.
+        connections (int, optional): number of client connections. Defaults to 10.
+        computer_workers (int, optional): threads deciding computer moves. Defaults to 4.
+
+    Returns:
+        dict[str, Any]: see run_load
+    """
+    server = GameServer(port=0, turn_timeout=None, computer_workers=computer_workers, max_tables=nb_tables)
+    await server.start()
+    try:
+        return await run_load(server.host, server.port, nb_tables, connections)
+    finally:
+        await server.close()
+
+
+def format_results(results: dict[str, Any]) -> str:
+    """Human readable report
+
+    Args:
+        results (dict[str, Any]): output of run_load
+
+    Returns:
+        str: report
+    """
+    lines: list[str] = [
+        f"{results['tables']} tables, {results['moves']} moves in {results['seconds']:.2f}s "
+        + f"({results['moves_per_second']:.0f} moves/s), {results['errors']} errors"
+    ]
+    for op, stats in results["latency_ms"].items():
+        lines.append(
+            f"{op}: p50 {stats['p50']:.2f}ms, p90 {stats['p90']:.2f}ms, p99 {stats['p99']:.2f}ms, "
+            + f"max {stats['max']:.2f}ms over {stats['count']} requests"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load a Lost Cities server and report latency percentiles")
+    parser.add_argument("--host", default="127.0.0.1", help="server address")
+    parser.add_argument("-p", "--port", type=int, default=8765, help="server port")
+    parser.add_argument("-n", "--tables", type=int, default=100, help="number of concurrent tables")
+    parser.add_argument("-c", "--connections", type=int, default=10, help="number of client connections")
+    parser.add_argument("--local", action="store_true", help="start a server in this process on a free port")
+    args = parser.parse_args(argv)
+    if args.local:
+        results = asyncio.run(run_local(args.tables, args.connections))
+    else:  # pragma: nocover
+        results = asyncio.run(run_load(args.host, args.port, args.tables, args.connections))
+    print(format_results(results))
+
+
+if __name__ == "__main__":  # pragma: nocover
+    main()
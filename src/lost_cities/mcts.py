@@ -0,0 +1,347 @@
+import math
+import random
+import time
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Literal, NamedTuple, Optional, Sequence
+
+from lost_cities import logger
+from lost_cities.bitboard import (
+    CLOSE,
+    EMPTY_TOP,
+    PLAYABLE,
+    POPCOUNT,
+    SUM,
+    VALUES_OF,
+    hand_masks,
+    mask_card,
+    remove_from_mask,
+)
+from lost_cities.card import Card, deck_prototype
+from lost_cities.endgame import EndgameSolver
+from lost_cities.engine import DECK, DISCARD, PLAY, Action, GameState, apply, is_over, legal_actions, scores
+from lost_cities.player import ComputerPlayer
+
+if TYPE_CHECKING:  # pragma: nocover
+    from lost_cities.game import LostCitiesGame
+
+
+class InformationSet(NamedTuple):
+    """What a player knows about a game: everything but the opponent's hand and the deck order"""
+
+    hand: tuple[Card, ...]
+    boards: tuple[tuple[tuple[Card, ...], ...], ...]
+    discard_piles: tuple[tuple[Card, ...], ...]
+    deck_size: int
+    opponent_hand_size: int
+    player: int
+
+    @classmethod
+    def from_game(cls, game: "LostCitiesGame", player: int) -> "InformationSet":
+        """Public information of a game seen by a player
+
+        Args:
+            game (LostCitiesGame): game being played
+            player (int): index of the player
+
+        Returns:
+            InformationSet
+        """
+        return cls(
+            tuple(sorted(game.players[player].hand)),
+            tuple(tuple(tuple(p.board[color]) for color in game.colors) for p in game.players),
+            tuple(tuple(pile) for pile in game.discard_piles.piles),
+            len(game.deck),
+            len(game.players[1 - player].hand),
+            player,
+        )
+
+    def unseen_cards(self) -> list[Card]:
+        """Cards either in the opponent's hand or in the deck"""
+        seen: Counter = Counter(self.hand)
+        seen.update(card for pile in self.discard_piles for card in pile)
+        seen.update(card for board in self.boards for expedition in board for card in expedition)
+        unseen: list[Card] = []
+        for card in deck_prototype(len(self.boards[0])):
+            if seen[card]:
+                seen[card] -= 1
+            else:
+                unseen.append(card)
+        return unseen
+
+    def determinize(self, rng: random.Random, unseen: Optional[list[Card]] = None) -> GameState:
+        """Sample a full game state consistent with the information set
+
+        Args:
+            rng (random.Random): random generator
+            unseen (Optional[list[Card]], optional): precomputed unseen cards. Defaults to None.
+
+        Returns:
+            GameState: one possible state of the game
+        """
+        cards: list[Card] = list(unseen if unseen is not None else self.unseen_cards())
+        rng.shuffle(cards)
+        opponent_hand: tuple[Card, ...] = tuple(sorted(cards[: self.opponent_hand_size]))
+        hands = (self.hand, opponent_hand) if self.player == 0 else (opponent_hand, self.hand)
+        return GameState(tuple(cards[self.opponent_hand_size :]), hands, self.boards, self.discard_piles, self.player)
+
+
+def playout_action(state: GameState, rng: random.Random, epsilon: float = 0.1) -> Action:
+    """Playout policy following the rules of ComputerPlayer on an engine state: start an expedition with a wager,
+    extend an expedition with a close card, discard when a color has 3 dead cards, otherwise play the closest card.
+    A random legal action is played with probability epsilon.
+
+    Args:
+        state (GameState): state of the game
+        rng (random.Random): random generator
+        epsilon (float, optional): probability of a random action. Defaults to 0.1.
+
+    Returns:
+        Action: turn to play
+    """
+    if rng.random() < epsilon:
+        return rng.choice(legal_actions(state))
+    # the hand is read as one mask per color, see lost_cities.bitboard
+    player: int = state.current_player
+    masks: list[int] = hand_masks(state.hands[player], len(state.boards[player]))
+    tops: list[int] = [expedition[-1].value if expedition else EMPTY_TOP for expedition in state.boards[player]]
+
+    kind: Literal["play", "discard"] = PLAY
+    chosen: Optional[Card] = None
+    for color_id, top in enumerate(tops):
+        mask: int = masks[color_id]
+        if top < 0:
+            if mask & 1 and (POPCOUNT[mask] >= 4 or SUM[mask >> 3] >= 10):
+                chosen = mask_card(color_id, 0)
+                break
+        elif mask & CLOSE[top]:
+            chosen = mask_card(color_id, VALUES_OF[mask & CLOSE[top]][0])
+            break
+
+    if chosen is None:
+        for color_id, top in enumerate(tops):
+            dead: int = masks[color_id] & ~PLAYABLE[top + 1]
+            if POPCOUNT[dead] >= 3:
+                kind, chosen = DISCARD, mask_card(color_id, VALUES_OF[dead][0])
+                break
+
+    if chosen is None:
+        # the closest card, the first one in board order on a tie
+        best_diff: int = 100
+        for color_id, top in enumerate(tops):
+            playable: int = masks[color_id] & PLAYABLE[top + 1]
+            if playable:
+                value: int = VALUES_OF[playable][0]
+                diff: int = value - max(top, 0)
+                if diff < best_diff:
+                    chosen, best_diff = mask_card(color_id, value), diff
+        if chosen is None:
+            kind, chosen = DISCARD, state.hands[player][0]
+
+    # like ComputerPlayer.choose_pile the pile is chosen after the move: the card left the hand and tops its expedition
+    masks[chosen.color_id] = remove_from_mask(masks[chosen.color_id], chosen.value)
+    if kind == PLAY:
+        tops[chosen.color_id] = chosen.value
+    for color_id, pile in enumerate(state.discard_piles):
+        if not pile or (kind == DISCARD and color_id == chosen.color_id):
+            continue
+        top_discard: Card = pile[-1]
+        top = tops[color_id]
+        if top_discard.value > top >= 0 or (
+            top < 0 and (top_discard.value >= 4 or top_discard.value == 0 and POPCOUNT[masks[color_id]] >= 2)
+        ):
+            return Action(kind, chosen, DISCARD, top_discard.color)
+    return Action(kind, chosen, DECK)
+
+
+def playout(state: GameState, rng: random.Random) -> GameState:
+    """Play turns with playout_action until the end of the game
+
+    Args:
+        state (GameState): starting state
+        rng (random.Random): random generator
+
+    Returns:
+        GameState: final state
+    """
+    while not is_over(state):
+        state = apply(state, playout_action(state, rng))
+    return state
+
+
+def search(info: InformationSet, iterations: int, time_budget: Optional[float], seed: int) -> dict[Action, list[float]]:
+    """Flat Monte Carlo search over sampled hidden information. Each round samples a deal consistent with the
+    information set and evaluates every root action on it with the same playout seed, so actions are compared on
+    identical deals which cuts the variance of the comparison.
+
+    Args:
+        info (InformationSet): what the searching player knows
+        iterations (int): maximum number of playouts, at least one round is played
+        time_budget (Optional[float]): maximum number of seconds, None for no limit
+        seed (int): seed of the random generator
+
+    Returns:
+        dict[Action, list[float]]: playouts and total reward of each root action, rewards are score differences
+    """
+    rng = random.Random(seed)
+    unseen: list[Card] = info.unseen_cards()
+    actions: list[Action] = legal_actions(info.determinize(rng, unseen))
+    stats: dict[Action, list[float]] = {action: [0, 0.0] for action in actions}
+    deadline: float = time.perf_counter() + time_budget if time_budget is not None else math.inf
+    rounds: int = max(1, iterations // max(1, len(actions)))
+
+    for _ in range(rounds):
+        state: GameState = info.determinize(rng, unseen)
+        playout_seed: int = rng.getrandbits(32)
+        for action in actions:
+            final_scores: tuple[int, int] = scores(playout(apply(state, action), random.Random(playout_seed)))
+            stats[action][0] += 1
+            stats[action][1] += final_scores[info.player] - final_scores[1 - info.player]
+        if time.perf_counter() >= deadline:
+            break
+    return stats
+
+
+class MCTSComputerPlayer(ComputerPlayer):
+    def __init__(
+        self,
+        name: str,
+        version: int = 5,
+        iterations: int = 1000,
+        time_budget: Optional[float] = None,
+        workers: int = 1,
+        use_processes: bool = False,
+        seed: Optional[int] = None,
+        endgame_threshold: int = 2,
+        endgame_budget: float = 0.2,
+        endgame_samples: int = 4,
+    ) -> None:
+        """Computer player searching with Monte Carlo playouts over sampled hidden information (opponent's hand and
+        deck order), see search
+
+        Args:
+            name (str): Name of the player
+            version (int): Number of colors possible, 5 or 6. Defaults to 5.
+            iterations (int, optional): playouts per decision, split between workers. Defaults to 1000.
+            time_budget (Optional[float], optional): seconds per decision. Defaults to None, no limit.
+            workers (int, optional): number of parallel searches merged at the root. Defaults to 1.
+            use_processes (bool, optional): run workers in processes instead of threads. Defaults to False.
+            seed (Optional[int], optional): seed of the searches. Defaults to None.
+            endgame_threshold (int, optional): deck size from which the endgame solver replaces the playouts.
+                Defaults to 2.
+            endgame_budget (float, optional): seconds per decision of the endgame solver. Defaults to 0.2.
+            endgame_samples (int, optional): sampled opponent hands solved per decision. Defaults to 4.
+        """
+        super().__init__(name, version)
+        self.iterations: int = iterations
+        self.time_budget: Optional[float] = time_budget
+        self.workers: int = workers
+        self.use_processes: bool = use_processes
+        self.rng = random.Random(seed)
+        self.info: Optional[InformationSet] = None
+        self.chosen_pile: Optional[tuple[str, Optional[str]]] = None
+        self.last_playouts: int = 0
+        self.playouts_per_second: float = 0.0
+        self._executor: Optional[Executor] = None
+        self.endgame_threshold: int = endgame_threshold
+        self.endgame_samples: int = endgame_samples
+        self.solver = EndgameSolver(time_budget=endgame_budget / max(1, endgame_samples))
+
+    def __repr__(self) -> str:
+        """Representation of the object"""
+        return f"MCTS computer named {self.name} playing with {len(self.board)} colors\nActual setup: {self.board}"
+
+    def observe(self, game: "LostCitiesGame") -> None:
+        """Keep the public information of the game for the next decision"""
+        self.info = InformationSet.from_game(game, game.players.index(self))
+
+    def close(self) -> None:
+        """Shutdown the workers"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def search(self, info: InformationSet) -> Action:
+        """Run the search, in parallel when several workers are configured
+
+        Args:
+            info (InformationSet): what the player knows
+
+        Returns:
+            Action: root action with the best mean score difference
+        """
+        if info.deck_size <= self.endgame_threshold:
+            return self.solve_endgame(info)
+        start: float = time.perf_counter()
+        seeds: list[int] = [self.rng.getrandbits(32) for _ in range(self.workers)]
+        iterations: int = max(1, self.iterations // self.workers)
+        if self.workers <= 1:
+            results = [search(info, iterations, self.time_budget, seeds[0])]
+        else:
+            if self._executor is None:
+                pool = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+                self._executor = pool(max_workers=self.workers)
+            futures = [self._executor.submit(search, info, iterations, self.time_budget, seed) for seed in seeds]
+            results = [future.result() for future in futures]
+
+        merged: dict[Action, list[float]] = {}
+        for stats in results:
+            for action, (visits, total) in stats.items():
+                merged.setdefault(action, [0, 0.0])
+                merged[action][0] += visits
+                merged[action][1] += total
+
+        elapsed: float = time.perf_counter() - start
+        self.last_playouts = int(sum(visits for visits, _ in merged.values()))
+        self.playouts_per_second = self.last_playouts / elapsed if elapsed > 0 else 0.0
+        logger.debug("%s ran %d playouts (%.0f playouts/s)", self.name, self.last_playouts, self.playouts_per_second)
+        return max(merged, key=lambda action: merged[action][1] / max(1, merged[action][0]))
+
+    def solve_endgame(self, info: InformationSet) -> Action:
+        """Solve the end of the game on a few sampled opponent hands, the transposition table is kept between moves
+
+        Args:
+            info (InformationSet): what the player knows
+
+        Returns:
+            Action: root action with the best expected score difference over the samples
+        """
+        rng = random.Random(self.rng.getrandbits(32))
+        unseen: list[Card] = info.unseen_cards()
+        totals: dict[Action, float] = {}
+        for _ in range(max(1, self.endgame_samples)):
+            values, _ = self.solver.evaluate_actions(info.determinize(rng, unseen))
+            for action, value in values.items():
+                totals[action] = totals.get(action, 0.0) + value
+        logger.debug("%s solved the endgame, %d positions in table", self.name, len(self.solver.table))
+        return max(totals, key=lambda action: totals[action])
+
+    def choose_action(self) -> tuple[str, Card]:
+        """Best action found by the search, falls back to the heuristic when the game has not been observed
+
+        Returns:
+            tuple[str, Card]: "play" or "discard" and the card
+        """
+        if self.info is None:
+            return super().choose_action()
+        action: Action = self.search(self.info)
+        self.info = None
+        self.chosen_pile = (action.pile, action.color)
+        return action.kind, action.card
+
+    def choose_pile(
+        self, tops: Sequence[Optional[Card]], discarded: Optional[Card] = None
+    ) -> tuple[str, Optional[str]]:
+        """Pile chosen with the last action
+
+        Args:
+            tops (Sequence[Optional[Card]]): top card of each discard pile indexed by color id, None when empty
+            discarded (Optional[Card], optional): card discarded this turn. Defaults to None.
+
+        Returns:
+            tuple[str, Optional[str]]: "deck" or "discard" choice, and the color of the discard pile
+        """
+        if self.chosen_pile is None:
+            return super().choose_pile(tops, discarded)
+        pile, self.chosen_pile = self.chosen_pile, None
+        return pile
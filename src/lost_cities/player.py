@@ -1,7 +1,312 @@
-from typing import Any, Optional
+import bisect
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional, Sequence, SupportsIndex, Union
 
 from lost_cities import logger
-from lost_cities.card import Card
+from lost_cities.card import COLORS, NB_CARD_IDS, Card
+
+if TYPE_CHECKING:  # pragma: nocover
+    from lost_cities.game import LostCitiesGame
+
+_card_value = attrgetter("value")
+
+
+def score_expedition(total: int, wagers: int, count: int) -> int:
+    """Score of an expedition from its running counters
+
+    Args:
+        total (int): sum of the card values
+        wagers (int): number of wager cards
+        count (int): number of cards
+
+    Returns:
+        int: score of the expedition
+    """
+    if count == 0:
+        return 0
+    return (total - 20) * (wagers + 1) + (20 if count >= 8 else 0)
+
+
+class Expedition(list):
+    """Cards played on one color, keeping running sum and wager count up to date"""
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        """Expedition holding cards, counters start from them"""
+        super().__init__()
+        self.total: int = 0
+        self.wagers: int = 0
+        self.extend(cards)
+
+    def __reduce__(self) -> tuple:
+        """Pickle as the list of cards, the counters are rebuilt"""
+        return (self.__class__, (list(self),))
+
+    def append(self, card: Card) -> None:
+        """Add a card on top, counters are updated in constant time"""
+        super().append(card)
+        self.total += card.value
+        self.wagers += card.value == 0
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        """Add cards on top, one after the other"""
+        for card in cards:
+            self.append(card)
+
+    def __iadd__(self, cards: Iterable[Card]) -> "Expedition":  # type: ignore[override, misc]
+        """In place concatenation, see extend"""
+        self.extend(cards)
+        return self
+
+    def pop(self, index: SupportsIndex = -1) -> Card:
+        """Remove and return a card, the top one by default"""
+        card: Card = super().pop(index)
+        self.total -= card.value
+        self.wagers -= card.value == 0
+        return card
+
+    def _recount(self) -> None:
+        """Recompute the counters from the cards"""
+        self.total = sum(card.value for card in self)
+        self.wagers = sum(card.value == 0 for card in self)
+
+    def insert(self, index: SupportsIndex, card: Card) -> None:
+        """Insert a card at a position"""
+        super().insert(index, card)
+        self._recount()
+
+    def remove(self, card: Card) -> None:
+        """Remove the first equal card"""
+        super().remove(card)
+        self._recount()
+
+    def clear(self) -> None:
+        """Remove every card"""
+        super().clear()
+        self.total = self.wagers = 0
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        """Replace cards, counters are recomputed"""
+        super().__setitem__(index, value)
+        self._recount()
+
+    def __delitem__(self, index: Any) -> None:
+        """Delete cards, counters are recomputed"""
+        super().__delitem__(index)
+        self._recount()
+
+    @property
+    def score(self) -> int:
+        """Score of the expedition, same as Player.compute_one_score"""
+        return score_expedition(self.total, self.wagers, len(self))
+
+    def score_with(self, card: Card) -> int:
+        """Score the expedition would have with one more card
+
+        Args:
+            card (Card): card to add
+
+        Returns:
+            int: new score
+        """
+        return score_expedition(self.total + card.value, self.wagers + (card.value == 0), len(self) + 1)
+
+
+class Board(dict):
+    """Expeditions of a player by color, every value is stored as an Expedition"""
+
+    def __init__(
+        self, expeditions: Union[Mapping[str, Iterable[Card]], Iterable[tuple[str, Iterable[Card]]]] = ()
+    ) -> None:
+        """Board holding expeditions by color"""
+        super().__init__()
+        self.update(expeditions)
+
+    def __reduce__(self) -> tuple:
+        """Pickle as a dict of expeditions"""
+        return (self.__class__, (dict(self),))
+
+    def __setitem__(self, color: str, cards: Iterable[Card]) -> None:
+        """Store the cards of a color as an Expedition"""
+        super().__setitem__(color, cards if isinstance(cards, Expedition) else Expedition(cards))
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        """Store each color given as an Expedition"""
+        for color, cards in dict(*args, **kwargs).items():
+            self[color] = cards
+
+
+class Hand(list):
+    """Cards in hand, also grouped by color and sorted by value so the computer reads its hand with lookups, and
+    counted by card id for constant time membership. Both are updated on every change of the list.
+    The list keeps the sorted order shown to the player and used by index based moves, so removals still shift the
+    cards after the removed one: the position comes from a scan of the integer ids, linear in the 8 or 9 cards."""
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        """Hand holding cards, the indexes start from them"""
+        super().__init__()
+        self.ids: list[int] = []
+        self.counts: list[int] = [0] * NB_CARD_IDS
+        self.groups: dict[str, list[Card]] = {}
+        self.values: dict[str, list[int]] = {}
+        self.totals: dict[str, int] = {}
+        self.extend(cards)
+
+    def __reduce__(self) -> tuple:
+        """Pickle as the list of cards, the indexes are rebuilt"""
+        return (self.__class__, (list(self),))
+
+    def _add(self, card: Card) -> None:
+        """Index a card added to the list"""
+        self.counts[card.card_id] += 1
+        values: list[int] = self.values.setdefault(card.color, [])
+        index: int = bisect.bisect_right(values, card.value)
+        values.insert(index, card.value)
+        self.groups.setdefault(card.color, []).insert(index, card)
+        self.totals[card.color] = self.totals.get(card.color, 0) + card.value
+
+    def _discard(self, card: Card) -> None:
+        """Forget a card removed from the list"""
+        self.counts[card.card_id] -= 1
+        values: list[int] = self.values[card.color]
+        group: list[Card] = self.groups[card.color]
+        index: int = bisect.bisect_left(values, card.value)
+        # equal cards are interchangeable, prefer the same object when it is in the group
+        for position in range(index, bisect.bisect_right(values, card.value)):
+            if group[position] is card:
+                index = position
+                break
+        del values[index]
+        del group[index]
+        self.totals[card.color] -= card.value
+
+    def _regroup(self) -> None:
+        """Rebuild every index from the list, after a bulk change"""
+        groups: dict[str, list[Card]] = {}
+        values: dict[str, list[int]] = {}
+        totals: dict[str, int] = {}
+        counts: list[int] = [0] * NB_CARD_IDS
+        # stable sort by value, so each card is appended at the place _add would insert it
+        for card in sorted(self, key=_card_value):
+            color: str = COLORS[card.color_id]
+            counts[card.card_id] += 1
+            groups.setdefault(color, []).append(card)
+            values.setdefault(color, []).append(card.value)
+            totals[color] = totals.get(color, 0) + card.value
+        self.groups, self.values, self.totals = groups, values, totals
+        self.ids, self.counts = [card.card_id for card in self], counts
+
+    def append(self, card: Card) -> None:
+        """Add a card at the end"""
+        super().append(card)
+        self.ids.append(card.card_id)
+        self._add(card)
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        """Add cards at the end, one after the other"""
+        for card in cards:
+            self.append(card)
+
+    def __iadd__(self, cards: Iterable[Card]) -> "Hand":  # type: ignore[override, misc]
+        """In place concatenation, see extend"""
+        self.extend(cards)
+        return self
+
+    def insert(self, index: SupportsIndex, card: Card) -> None:
+        """Insert a card at a position"""
+        super().insert(index, card)
+        self.ids.insert(index, card.card_id)
+        self._add(card)
+
+    def pop(self, index: SupportsIndex = -1) -> Card:
+        """Remove and return the card at a position, the last one by default"""
+        card: Card = super().pop(index)
+        self.ids.pop(index)
+        self._discard(card)
+        return card
+
+    def remove(self, card: Card) -> None:
+        """Remove the first card equal to card, see index"""
+        self.pop(self.index(card))
+
+    def remove_id(self, card_id: int) -> Card:
+        """Remove the first card of an id, a missing id is detected from the counts without scanning the hand
+
+        Args:
+            card_id (int): id of the card, see Card.card_id
+
+        Raises:
+            ValueError: if no card of this id is in hand
+
+        Returns:
+            Card: removed card
+        """
+        if not 0 <= card_id < NB_CARD_IDS or not self.counts[card_id]:
+            raise ValueError(f"no card of id {card_id} in hand")
+        return self.pop(self.ids.index(card_id))
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        """Sort the cards in place, the same arguments as list.sort"""
+        super().sort(*args, **kwargs)
+        self.ids = [card.card_id for card in self]
+
+    def reverse(self) -> None:
+        """Reverse the cards in place"""
+        super().reverse()
+        self.ids.reverse()
+
+    def __contains__(self, card: object) -> bool:
+        """Whether an equal card is in hand, read from the counts in constant time"""
+        return isinstance(card, Card) and self.counts[card.card_id] > 0
+
+    def count(self, card: Card) -> int:
+        """Number of equal cards, read from the counts in constant time"""
+        return self.counts[card.card_id] if isinstance(card, Card) else 0
+
+    def index(self, card: Card, *args: SupportsIndex) -> int:  # type: ignore[override]
+        """Position of the first equal card, the ids are compared instead of the cards
+
+        Raises:
+            ValueError: if the card is not in hand
+        """
+        try:
+            return self.ids.index(card.card_id, *args)
+        except (ValueError, AttributeError):
+            raise ValueError(f"{card} is not in hand") from None
+
+    def clear(self) -> None:
+        """Remove every card"""
+        super().clear()
+        self._regroup()
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        """Replace cards, the indexes are rebuilt"""
+        super().__setitem__(index, value)
+        self._regroup()
+
+    def __delitem__(self, index: Any) -> None:
+        """Delete cards, the indexes are rebuilt"""
+        super().__delitem__(index)
+        self._regroup()
+
+    def count_color(self, color: str) -> int:
+        """Number of cards of a color"""
+        return len(self.values.get(color, ()))
+
+    def first_at_least(self, color: str, value: int) -> Optional[Card]:
+        """Lowest card of a color whose value is at least value, None if there is none"""
+        values: list[int] = self.values.get(color, [])
+        index: int = bisect.bisect_left(values, value)
+        return self.groups[color][index] if index < len(values) else None
+
+    def count_below(self, color: str, value: int) -> int:
+        """Number of cards of a color lower than value"""
+        return bisect.bisect_left(self.values.get(color, []), value)
+
+    def has(self, color: str, value: int) -> bool:
+        """Whether a card of this color and value is in hand"""
+        values: list[int] = self.values.get(color, [])
+        index: int = bisect.bisect_left(values, value)
+        return index < len(values) and values[index] == value
 
 
 class Player:
@@ -17,15 +322,41 @@ class Player:
         """
         try:
             self.name: str = name
-            self.hand: list = []
-            self.board: dict = {color: [] for color in eval(f"self.VERSION_{version}")}
+            self.hand = Hand()
+            self.undo_stack: list[tuple[str, Card, int]] = []
+            self.board = Board({color: [] for color in eval(f"self.VERSION_{version}")})
         except AttributeError:
             raise AttributeError("version should be 5 or 6 not {version}")
 
+    @property
+    def hand(self) -> Hand:
+        """Cards in hand"""
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards: Iterable[Card]) -> None:
+        self._hand: Hand = cards if isinstance(cards, Hand) else Hand(cards)
+
+    @property
+    def board(self) -> Board:
+        """Expeditions by color"""
+        return self._board
+
+    @board.setter
+    def board(self, board: Mapping[str, Iterable[Card]]) -> None:
+        self._board: Board = board if isinstance(board, Board) else Board(board)
+
     def __repr__(self) -> str:
         """Representation of the object"""
         return f"{self.name} playing with {len(self.board)} colors\nActual setup: {self.board}"
 
+    def reset(self) -> None:
+        """Empty the hand, the expeditions and the undo stack for a new game"""
+        self.hand.clear()
+        for expedition in self.board.values():
+            expedition.clear()
+        self.undo_stack = []
+
     def play_card(self, card: Card) -> bool:
         """Play a card if possible and remove it from hand
 
@@ -42,11 +373,10 @@ class Player:
             self.hand.remove(card)
             self.board[card.color].append(card)
             played = True
-            logger.info(f"{self.name} plays {str(card)}")
+            logger.info("%s plays %s", self.name, card)
         else:
             logger.warning(
-                f"{self.name} can not play this card {card.value}:{card.color}"
-                + f" because the last card is {self.board[card.color][-1]}"
+                "%s can not play this card %s because the last card is %s", self.name, card, self.board[card.color][-1]
             )
 
         return played
@@ -61,48 +391,106 @@ class Player:
             Card: Card removed
         """
         self.hand.remove(card)
-        logger.info(f"{self.name} discard {card}")
+        logger.info("%s discard %s", self.name, card)
         return card
 
+    def observe(self, game: "LostCitiesGame") -> None:
+        """Called by the game before the player chooses an action, does nothing by default.
+        Players must only look at public information: their hand, boards, discard pile and deck size.
+
+        Args:
+            game (LostCitiesGame): game being played
+        """
+
+    def make_move(self, kind: str, card: Card) -> Card:
+        """Play or discard a card without logging, the move is pushed on the undo stack
+
+        Args:
+            kind (str): "play" or "discard"
+            card (Card): card to move, the first equal card of the hand is used
+
+        Raises:
+            ValueError: if the card is not in hand or can not be played
+
+        Returns:
+            Card: card object removed from the hand
+        """
+        card, index = self._move_card(kind, card)
+        self.undo_stack.append((kind, card, index))
+        return card
+
+    def unmake_move(self) -> tuple[str, Card]:
+        """Revert the last move of the undo stack, the card goes back to its place in the hand
+
+        Returns:
+            tuple[str, Card]: kind of the reverted move and its card
+        """
+        kind, card, index = self.undo_stack.pop()
+        self._return_card(kind, card, index)
+        return kind, card
+
+    def _move_card(self, kind: str, card: Card) -> tuple[Card, int]:
+        """Move of make_move without the undo stack, returns the card object removed and its position in the hand"""
+        index: int = self.hand.index(card)
+        if kind == "play":
+            expedition: Expedition = self.board[card.color]
+            if expedition and card.value < expedition[-1].value:
+                raise ValueError(f"{card} can not be played on {expedition[-1]}")
+            card = self.hand.pop(index)
+            expedition.append(card)
+        elif kind == "discard":
+            card = self.hand.pop(index)
+        else:
+            raise ValueError(f"{kind} is not a valid action")
+        return card, index
+
+    def _return_card(self, kind: str, card: Card, index: int) -> None:
+        """Revert a move of _move_card"""
+        if kind == "play":
+            self.board[card.color].pop()
+        self.hand.insert(index, card)
+
     def reorder_hand(self) -> None:
         """Reorder the hand"""
         self.hand.sort()
 
-    def compute_one_score(self, expedition: list) -> int:
+    @staticmethod
+    def compute_one_score(expedition: Sequence[Card]) -> int:
         """Compute score for one expedition
 
         Args:
-            expedition (list): value in the expedition
+            expedition (Sequence[Card]): value in the expedition
 
         Returns:
             int: score of the expedition
         """
-        expedition_value: int = 0
-
-        if len(expedition) > 0:
-            paris_count = sum(card.value == 0 for card in expedition) + 1
-            expedition_value = sum(card.value for card in expedition) - 20
+        if isinstance(expedition, Expedition):
+            return expedition.score
 
-            expedition_value *= paris_count
-            if len(expedition) >= 8:
-                expedition_value += 20
-
-        return expedition_value
+        return score_expedition(
+            sum(card.value for card in expedition), sum(card.value == 0 for card in expedition), len(expedition)
+        )
 
     def compute_score(self) -> tuple[int, dict]:
-        """Compute final score
+        """Compute final score from the running counters of each expedition
 
         Returns:
             tuple[int, dict]: final score from your board and detail by color
         """
-        total_score: int = 0
-        detail: dict = {}
-        for color, expedition in self.board.items():
-            expedition_value = self.compute_one_score(expedition)
-            total_score += expedition_value
+        detail: dict = {color: expedition.score for color, expedition in self.board.items()}
+        return sum(detail.values()), detail
 
-            detail[color] = expedition_value
-        return total_score, detail
+    def score_delta(self, card: Card) -> int:
+        """How much the score would change by playing a card, legality is not checked
+
+        Args:
+            card (Card): card to evaluate
+
+        Returns:
+            int: score difference
+        """
+        expedition: Expedition = self.board[card.color]
+        return expedition.score_with(card) - expedition.score
 
 
 class ComputerPlayer(Player):
@@ -114,73 +502,69 @@ class ComputerPlayer(Player):
         return f"Computer named {self.name} playing with {len(self.board)} colors\nActual setup: {self.board}"
 
     def choose_action(self) -> tuple[str, Card]:
+        """Rule based action read from the hand grouped by color, every rule is a lookup per color
+
+        Returns:
+            tuple[str, Card]: "play" or "discard" and the card
+        """
+        hand: Hand = self.hand
         # High importance rules
-        for color in self.board:
+        for color, expedition in self.board.items():
             # Check if the player should start an expedition with a 0
-            colored_hand: list[Card] = [card for card in self.hand if card.color == color]
-            if (
-                not self.board[color]
-                and any(card.value == 0 for card in colored_hand)
-                and (len(colored_hand) >= 4 or sum(card.value for card in colored_hand) >= 10)
-            ):
-                return ("play", Card(color, 0))
+            if not expedition:
+                if hand.has(color, 0) and (hand.count_color(color) >= 4 or hand.totals[color] >= 10):
+                    return ("play", hand.groups[color][0])
 
             # Play close card
-            if self.board[color]:
-                last_card_value: int = self.board[color][-1].value if len(self.board[color]) > 0 else 0
-                closest_card: list[bool] = [card.value == last_card_value + 1 for card in colored_hand]
-                close_card: list[bool] = [card.value == last_card_value + 2 for card in colored_hand]
-                if any(closest_card):
-                    return ("play", Card(color, last_card_value + 1))
-                elif any(close_card):
-                    return ("play", Card(color, last_card_value + 2))
+            else:
+                last_card_value: int = expedition[-1].value
+                for step in (1, 2):
+                    if hand.has(color, last_card_value + step):
+                        return ("play", hand.first_at_least(color, last_card_value + step))  # type: ignore
 
         # Medium importance rules
-        for color in self.board:
+        for color, expedition in self.board.items():
             # Discard if many card not playable
-            colored_hand = [card for card in self.hand if card.color == color]
-            last_value: int = self.board[color][-1].value if len(self.board[color]) > 0 else 0
-            not_playable: list[Card] = [card for card in colored_hand if card.value < last_value]
-            if len(not_playable) >= 3:
-                return ("discard", not_playable[0])
-
-        # Low importance
-        best_move: dict[str, Any] = dict()
-        for color in self.board:
-            # play the closest
-            colored_hand = [card for card in self.hand if card.color == color]
-            last_value = self.board[color][-1].value if len(self.board[color]) > 0 else 0
-            playable: list[Card] = [card for card in colored_hand if card.value >= last_value]
-            potential_diff: int = playable[0].value - last_value if len(playable) > 0 else 99
-            if playable and (best_move.get("card") is None or best_move.get("diff", 100) > potential_diff):
-                best_move = dict(card=playable[0], diff=potential_diff)
-        if best_move:
-            return ("play", best_move["card"])
-        else:
-            return ("discard", self.hand[0])
+            if expedition and hand.count_below(color, expedition[-1].value) >= 3:
+                return ("discard", hand.groups[color][0])
 
-    def choose_pile(self, discard_card: Optional[Card], last_action: str) -> str:
+        # Low importance: play the closest
+        best_card: Optional[Card] = None
+        best_diff: int = 100
+        for color, expedition in self.board.items():
+            last_value: int = expedition[-1].value if expedition else 0
+            playable: Optional[Card] = hand.first_at_least(color, last_value)
+            if playable is not None and playable.value - last_value < best_diff:
+                best_card, best_diff = playable, playable.value - last_value
+        if best_card is not None:
+            return ("play", best_card)
+        return ("discard", hand[0])
+
+    def choose_pile(
+        self, tops: Sequence[Optional[Card]], discarded: Optional[Card] = None
+    ) -> tuple[str, Optional[str]]:
         """choose the best pile to take a card of
 
         Args:
-            discard_card (Optional[Card]): last discarded card
+            tops (Sequence[Optional[Card]]): top card of each discard pile indexed by color id, None when empty
+            discarded (Optional[Card], optional): card discarded this turn, it can not be picked back. Defaults to
+                None.
 
         Returns:
-            str: "deck" or "discard" choice
+            tuple[str, Optional[str]]: "deck" or "discard" choice, and the color of the discard pile
         """
-        if discard_card is None or last_action == "discard":
-            return "deck"
-
-        board_color: list[Card] = self.board[discard_card.color]
-        hand_color_cards: list[Card] = [card for card in self.hand if card.color == discard_card.color]
+        for top in tops:
+            if top is None or (discarded is not None and top.color == discarded.color):
+                continue
+            board_color: list[Card] = self.board[top.color]
 
-        if discard_card.value == 0 and not board_color and len(hand_color_cards) >= 2:
-            return "discard"
+            if top.value == 0 and not board_color and self.hand.count_color(top.color) >= 2:
+                return "discard", top.color
 
-        if not board_color and discard_card.value >= 4:
-            return "discard"
+            if not board_color and top.value >= 4:
+                return "discard", top.color
 
-        if board_color and discard_card.value > board_color[-1].value:
-            return "discard"
+            if board_color and top.value > board_color[-1].value:
+                return "discard", top.color
 
-        return "deck"
+        return "deck", None
@@ -0,0 +1,206 @@
+import marshal
+import threading
+import time
+from contextlib import nullcontext
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Iterable, Mapping, Union
+
+from lost_cities.game import LostCitiesGame
+from lost_cities.player import ComputerPlayer, Player
+
+# location of a timed function, the key of pstats files: file name, first line and function name
+ProbeKey = tuple[str, int, str]
+PROBE_FILE: str = "<probe>"
+DEFAULT_TARGETS: tuple[tuple[type, str], ...] = (
+    (LostCitiesGame, "setup"),
+    (LostCitiesGame, "pick_card"),
+    (Player, "play_card"),
+    (Player, "compute_score"),
+    (ComputerPlayer, "choose_action"),
+    (ComputerPlayer, "choose_pile"),
+)
+_NULL_PROBE: ContextManager[None] = nullcontext()
+
+
+def _subclasses(owner: type) -> list[type]:
+    """Every subclass of a class, recursively"""
+    found: list[type] = []
+    subclass: type
+    for subclass in owner.__subclasses__():
+        found.append(subclass)
+        found.extend(_subclasses(subclass))
+    return found
+
+
+class _Probe:
+    """Context manager timing a block of code, see Profiler.probe"""
+
+    __slots__ = ("profiler", "key")
+
+    def __init__(self, profiler: "Profiler", key: ProbeKey) -> None:
+        self.profiler: Profiler = profiler
+        self.key: ProbeKey = key
+
+    def __enter__(self) -> None:
+        self.profiler._enter(self.key)
+
+    def __exit__(self, *args: object) -> None:
+        self.profiler._exit()
+
+
+class Profiler:
+    def __init__(self, targets: Iterable[tuple[type, str]] = DEFAULT_TARGETS) -> None:
+        """Opt-in call counters and timers of engine and player methods. Methods are wrapped when the profiler is
+        enabled and restored when it is disabled, so a disabled profiler costs nothing. Overrides in subclasses, such as
+        the searching computers, are timed under their own name.
+
+        Args:
+            targets (Iterable[tuple[type, str]], optional): classes and method names to time. Defaults to
+                DEFAULT_TARGETS: setup, pick_card, play_card, compute_score, choose_action and choose_pile.
+        """
+        self.targets: list[tuple[type, str]] = list(targets)
+        # calls, calls outside a recursion, own seconds, cumulative seconds
+        self.entries: dict[ProbeKey, list[float]] = {}
+        self.enabled: bool = False
+        self._patched: list[tuple[type, str, Any]] = []
+        self._local = threading.local()
+
+    def __enter__(self) -> "Profiler":
+        self.enable()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.disable()
+
+    def enable(self) -> None:
+        """Wrap the target methods, calls are recorded until disable"""
+        if self.enabled:
+            return
+        self.enabled = True
+        for owner, name in self.targets:
+            self._patch(owner, name)
+
+    def disable(self) -> None:
+        """Restore the original methods, recorded entries are kept"""
+        for owner, name, original in reversed(self._patched):
+            setattr(owner, name, original)
+        self._patched = []
+        self.enabled = False
+
+    def register(self, owner: type, name: str) -> None:
+        """Time another method, wrapped right away when the profiler is enabled
+
+        Args:
+            owner (type): class defining the method
+            name (str): method name
+        """
+        self.targets.append((owner, name))
+        if self.enabled:
+            self._patch(owner, name)
+
+    def probe(self, name: str) -> ContextManager[None]:
+        """Context manager timing a block of code under a name, nothing is recorded while the profiler is disabled
+
+        Args:
+            name (str): name of the probe in the stats
+
+        Returns:
+            ContextManager[None]: timer of the block
+        """
+        if not self.enabled:
+            return _NULL_PROBE
+        return _Probe(self, (PROBE_FILE, 0, name))
+
+    def reset(self) -> None:
+        """Forget every recorded call"""
+        self.entries = {}
+
+    def merge(self, entries: Mapping[ProbeKey, list[float]]) -> None:
+        """Add the entries of another profiler, for instance of a worker process
+
+        Args:
+            entries (Mapping[ProbeKey, list[float]]): entries of the other profiler
+        """
+        for key, values in entries.items():
+            entry: list[float] = self.entries.setdefault(key, [0, 0, 0.0, 0.0])
+            for index, value in enumerate(values):
+                entry[index] += value
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Recorded calls by probe, methods are named by their qualified name
+
+        Returns:
+            dict[str, dict[str, float]]: calls, cumulative seconds, own seconds (without nested probes) and mean
+                cumulative seconds per call, sorted by decreasing cumulative time
+        """
+        stats: dict[str, dict[str, float]] = {}
+        for (_, _, name), (calls, primitive_calls, own, cumulative) in sorted(
+            self.entries.items(), key=lambda item: -item[1][3]
+        ):
+            stats[name] = {
+                "calls": int(calls),
+                "seconds": cumulative,
+                "own_seconds": own,
+                "mean": cumulative / primitive_calls if primitive_calls else 0.0,
+            }
+        return stats
+
+    def dump_stats(self, path: Union[str, Path]) -> None:
+        """Write the recorded calls in the format of cProfile.Profile.dump_stats, to be read with pstats.Stats
+
+        Args:
+            path (Union[str, Path]): output file
+        """
+        pstats: dict[ProbeKey, tuple[int, int, float, float, dict]] = {
+            key: (int(primitive_calls), int(calls), own, cumulative, {})
+            for key, (calls, primitive_calls, own, cumulative) in self.entries.items()
+        }
+        with open(path, "wb") as file:
+            marshal.dump(pstats, file)
+
+    def _patch(self, owner: type, name: str) -> None:
+        """Wrap a method and every override of it in the subclasses"""
+        for cls in [owner, *_subclasses(owner)]:
+            original: Any = cls.__dict__.get(name)
+            if original is None or any(patched is cls and method == name for patched, method, _ in self._patched):
+                continue
+            function: Callable = original.__func__ if isinstance(original, (staticmethod, classmethod)) else original
+            key: ProbeKey = (function.__code__.co_filename, function.__code__.co_firstlineno, function.__qualname__)
+            wrapper: Any = self._wrap(function, key)
+            setattr(cls, name, type(original)(wrapper) if function is not original else wrapper)
+            self._patched.append((cls, name, original))
+
+    def _wrap(self, function: Callable, key: ProbeKey) -> Callable:
+        """Function recording its calls under key"""
+        start, stop = self._enter, self._exit
+
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start(key)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stop()
+
+        return wrapper
+
+    def _enter(self, key: ProbeKey) -> None:
+        """Start timing a call, probes nest in a per thread stack"""
+        stack: list[list[Any]] = self._local.__dict__.setdefault("stack", [])
+        stack.append([key, time.perf_counter(), 0.0])
+
+    def _exit(self) -> None:
+        """Stop timing the innermost call and record it"""
+        stack: list[list[Any]] = self._local.stack
+        key, start, nested = stack.pop()
+        elapsed: float = time.perf_counter() - start
+        entry: list[float] = self.entries.setdefault(key, [0, 0, 0.0, 0.0])
+        entry[0] += 1
+        entry[2] += elapsed - nested
+        # like cProfile, the cumulative time of a recursive call is only counted by its outermost call
+        if all(frame[0] != key for frame in stack):
+            entry[1] += 1
+            entry[3] += elapsed
+        if stack:
+            stack[-1][2] += elapsed
@@ -0,0 +1,239 @@
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple, Union
+
+from lost_cities.card import COLORS, Card
+from lost_cities.engine import DECK, DISCARD, PLAY, Action
+from lost_cities.game import LostCitiesGame
+
+# File: header (magic, format version) then games back to back.
+# Game: header (number of colors, number of moves), initial deck with 6 bits per card packed little endian, then the
+# moves with 10 bits each packed the same way: bits 0 to 5 the card, bit 6 set for a discard, bits 7 to 9 the pile
+# drawn from, 0 for the deck and 1 + color index for a discard pile.
+MAGIC: bytes = b"LCGR"
+FORMAT_VERSION: int = 2
+FILE_HEADER = struct.Struct("<4sB")
+GAME_HEADER = struct.Struct("<BH")
+MOVE_BITS: int = 10
+DISCARD_BIT: int = 1 << 6
+PILE_SHIFT: int = 7
+
+
+def card_code(card: Card) -> int:
+    """6 bits code of a card: its id, color index * 10 + value index
+
+    Args:
+        card (Card): card to encode
+
+    Returns:
+        int: code between 0 and 59
+    """
+    return card.card_id
+
+
+def code_card(code: int) -> Card:
+    """Interned card of a 6 bits code, see card_code"""
+    return Card.from_id(code)
+
+
+def move_code(move: Action) -> int:
+    """10 bits code of a move: card code, discard bit and pile
+
+    Args:
+        move (Action): action, card, pile and pile color of a turn
+
+    Returns:
+        int: code between 0 and 1023
+    """
+    pile: int = 1 + COLORS.index(move.color) if move.pile == DISCARD else 0  # type: ignore[arg-type]
+    return card_code(move.card) | (DISCARD_BIT if move.kind == DISCARD else 0) | pile << PILE_SHIFT
+
+
+def code_move(code: int) -> Action:
+    """Move of a 10 bits code, see move_code"""
+    pile: int = code >> PILE_SHIFT
+    return Action(
+        DISCARD if code & DISCARD_BIT else PLAY,
+        code_card(code & 0x3F),
+        DISCARD if pile else DECK,
+        COLORS[pile - 1] if pile else None,
+    )
+
+
+def deck_size(nb_colors: int) -> int:
+    """Number of bytes of a packed deck"""
+    return (nb_colors * 12 * 6 + 7) // 8
+
+
+def moves_size(nb_moves: int) -> int:
+    """Number of bytes of packed moves"""
+    return (nb_moves * MOVE_BITS + 7) // 8
+
+
+def _game_header(buffer: Union[bytes, mmap.mmap], offset: int) -> tuple[int, int, int]:
+    """Number of colors, number of moves and end position of the game record at offset, ValueError if truncated"""
+    if offset + GAME_HEADER.size > len(buffer):
+        raise ValueError(f"truncated game record at offset {offset}")
+    nb_colors, nb_moves = GAME_HEADER.unpack_from(buffer, offset)
+    end: int = offset + GAME_HEADER.size + deck_size(nb_colors) + moves_size(nb_moves)
+    if end > len(buffer):
+        raise ValueError(f"truncated game record at offset {offset}")
+    return nb_colors, nb_moves, end
+
+
+class GameRecord(NamedTuple):
+    """Everything needed to replay a game: the shuffled deck before dealing and every turn"""
+
+    nb_colors: int
+    deck: tuple[Card, ...]
+    moves: tuple[Action, ...]
+
+    @classmethod
+    def from_game(cls, game: LostCitiesGame) -> "GameRecord":
+        """Record of a game set up with LostCitiesGame.setup"""
+        moves: tuple[Action, ...] = tuple(Action(*move) for move in game.moves)  # type: ignore
+        return cls(len(game.colors), tuple(game.initial_deck), moves)
+
+    def encode(self) -> bytes:
+        """Packed bytes of the record, about 100 bytes for a full game"""
+        packed: int = 0
+        for position, card in enumerate(self.deck):
+            packed |= card_code(card) << (6 * position)
+        packed_moves: int = 0
+        for position, move in enumerate(self.moves):
+            packed_moves |= move_code(move) << (MOVE_BITS * position)
+        return (
+            GAME_HEADER.pack(self.nb_colors, len(self.moves))
+            + packed.to_bytes(deck_size(self.nb_colors), "little")
+            + packed_moves.to_bytes(moves_size(len(self.moves)), "little")
+        )
+
+    @classmethod
+    def decode(cls, buffer: Union[bytes, mmap.mmap], offset: int = 0) -> tuple["GameRecord", int]:
+        """Decode a record
+
+        Args:
+            buffer (Union[bytes, mmap.mmap]): bytes holding the record
+            offset (int, optional): position of the record. Defaults to 0.
+
+        Raises:
+            ValueError: if the record is truncated
+
+        Returns:
+            tuple[GameRecord, int]: record and position of the next one
+        """
+        nb_colors, nb_moves, end = _game_header(buffer, offset)
+        start: int = offset + GAME_HEADER.size
+
+        packed: int = int.from_bytes(buffer[start : start + deck_size(nb_colors)], "little")
+        deck: tuple[Card, ...] = tuple(code_card(packed >> (6 * i) & 0x3F) for i in range(nb_colors * 12))
+        packed = int.from_bytes(buffer[start + deck_size(nb_colors) : end], "little")
+        moves: tuple[Action, ...] = tuple(code_move(packed >> (MOVE_BITS * i) & 0x3FF) for i in range(nb_moves))
+        return cls(nb_colors, deck, moves), end
+
+
+class RecordWriter:
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Append games to a record file, the file header is written when the file is new
+
+        Args:
+            path (Union[str, Path]): record file
+        """
+        self.path = Path(path)
+        self.file: BinaryIO = open(self.path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(FILE_HEADER.pack(MAGIC, FORMAT_VERSION))
+        self.games_written: int = 0
+
+    def write(self, game: Union[LostCitiesGame, GameRecord, bytes]) -> None:
+        """Append a game
+
+        Args:
+            game (Union[LostCitiesGame, GameRecord, bytes]): game, its record or an encoded record
+        """
+        if isinstance(game, LostCitiesGame):
+            game = GameRecord.from_game(game)
+        self.file.write(game.encode() if isinstance(game, GameRecord) else game)
+        self.games_written += 1
+
+    def close(self) -> None:
+        """Flush and close the file"""
+        self.file.close()
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+class RecordReader:
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Memory mapped record file, games are decoded one at a time while iterating
+
+        Args:
+            path (Union[str, Path]): record file
+
+        Raises:
+            ValueError: if the file is not a record file of a known format version
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < FILE_HEADER.size:
+                raise ValueError(f"{self.path} is not a game record file")
+            self.buffer: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = FILE_HEADER.unpack_from(self.buffer)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.buffer.close()
+            raise ValueError(f"{self.path} is not a game record file of version {FORMAT_VERSION}")
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        offset: int = FILE_HEADER.size
+        while offset < len(self.buffer):
+            record, offset = GameRecord.decode(self.buffer, offset)
+            yield record
+
+    def __len__(self) -> int:
+        """Number of games, only game headers are read
+
+        Raises:
+            ValueError: if the last game is truncated
+        """
+        count: int = 0
+        offset: int = FILE_HEADER.size
+        while offset < len(self.buffer):
+            _, _, offset = _game_header(self.buffer, offset)
+            count += 1
+        return count
+
+    def close(self) -> None:
+        """Unmap the file"""
+        self.buffer.close()
+
+    def __enter__(self) -> "RecordReader":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+def replay(record: GameRecord, player_names: tuple[str, str] = ("Player1", "Player2")) -> LostCitiesGame:
+    """Play a recorded game again: same deal, same moves, so boards, discard pile, hands and scores end up identical
+
+    Args:
+        record (GameRecord): recorded game
+        player_names (tuple[str, str], optional): names of the players. Defaults to ("Player1", "Player2").
+
+    Raises:
+        ValueError: if a recorded move is not legal
+
+    Returns:
+        LostCitiesGame: game after the last recorded move
+    """
+    game = LostCitiesGame(*player_names, vs_computer=False, version=record.nb_colors)  # type: ignore[arg-type]
+    game.setup(list(record.deck))
+    for move in record.moves:
+        game.play_move(*move)
+    return game
@@ -0,0 +1,61 @@
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from lost_cities.card import VALUES, Card
+
+EMPTY: int = -1
+MAX_EXPEDITION: int = len(VALUES) + 2  # 3 wagers and 9 numbered cards
+EXPEDITION_COST: int = 20
+BONUS_CARDS: int = 8
+BONUS: int = 20
+
+
+def score_counters(sums: np.ndarray, wagers: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Score expeditions from their counters with the rules of Player.compute_one_score, for any batch shape
+
+    Args:
+        sums (np.ndarray): sum of the card values of each expedition (... x colors)
+        wagers (np.ndarray): number of wager cards of each expedition (... x colors)
+        counts (np.ndarray): number of cards of each expedition (... x colors)
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: total scores (...) and detail by color (... x colors)
+    """
+    sums, wagers, counts = (np.asarray(array, dtype=np.int32) for array in (sums, wagers, counts))
+    detail: np.ndarray = (sums - EXPEDITION_COST) * (wagers + 1) + BONUS * (counts >= BONUS_CARDS)
+    detail = np.where(counts > 0, detail, 0).astype(np.int32)
+    return detail.sum(axis=-1, dtype=np.int32), detail
+
+
+def score_boards(boards: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Score boards of card values, wagers are 0 and empty slots EMPTY, see score_counters
+
+    Args:
+        boards (np.ndarray): card values (... x colors x cards)
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: total scores (...) and detail by color (... x colors)
+    """
+    counts: np.ndarray = (boards >= 0).sum(axis=-1, dtype=np.int32)
+    # empty slots hold EMPTY, their contribution is removed from the raw sum instead of masking every slot
+    sums: np.ndarray = boards.sum(axis=-1, dtype=np.int32) - EMPTY * (boards.shape[-1] - counts)
+    return score_counters(sums, (boards == 0).sum(axis=-1, dtype=np.int32), counts)
+
+
+def board_array(boards: Sequence[Mapping[str, Sequence[Card]]], colors: Sequence[str]) -> np.ndarray:
+    """Card values of boards of Player objects, to be scored with score_boards
+
+    Args:
+        boards (Sequence[Mapping[str, Sequence[Card]]]): boards, for instance Player.board of many players
+        colors (Sequence[str]): colors in play, in the order of the returned array
+
+    Returns:
+        np.ndarray: card values (boards x colors x MAX_EXPEDITION), EMPTY where there is no card
+    """
+    array: np.ndarray = np.full((len(boards), len(colors), MAX_EXPEDITION), EMPTY, dtype=np.int16)
+    for index, board in enumerate(boards):
+        for color_index, color in enumerate(colors):
+            expedition: Sequence[Card] = board[color]
+            array[index, color_index, : len(expedition)] = [card.value for card in expedition]
+    return array
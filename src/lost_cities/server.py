@@ -0,0 +1,361 @@
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Literal, Optional
+
+from lost_cities import enable_logging, logger
+from lost_cities.card import Card
+from lost_cities.engine import from_game
+from lost_cities.game import LostCitiesGame
+from lost_cities.mcts import playout_action
+from lost_cities.player import ComputerPlayer
+from lost_cities.tournament import STRATEGIES
+
+# Wire protocol: one JSON object per line in both directions. Cards are [color, value] pairs.
+#   {"op": "new", "name": str, "opponent": "computer" | "human", "id": any}  -> "joined" then "state"
+#   {"op": "join", "table": int, "name": str, "id": any}                     -> "joined" then "state"
+#   {"op": "move", "table": int, "kind": "play" | "discard", "card": [str, int], "pile": "deck" | "discard",
+#    "color": str}                                                          the color of the discard pile picked
+#   {"op": "state", "table": int}
+#   {"op": "leave", "table": int}
+# A request with an "id" is acknowledged with {"event": "ack", "id": id, "table": int} once handled.
+# Errors are {"event": "error", "message": str}, with the "id" of the request when it had one.
+
+
+class Connection:
+    """A client socket, messages are written as JSON lines"""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer: asyncio.StreamWriter = writer
+        self.tables: set[int] = set()
+
+    def send(self, message: dict[str, Any]) -> None:
+        """Queue a message, the stream is flushed by the connection handler"""
+        if not self.writer.is_closing():
+            self.writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+
+class Table:
+    def __init__(self, table_id: int, game: LostCitiesGame, seats: list[Optional[Connection]]) -> None:
+        """One game hosted by the server
+
+        Args:
+            table_id (int): identifier sent to clients
+            game (LostCitiesGame): game played at the table
+            seats (list[Optional[Connection]]): connection of each seat, None for a computer or a free seat
+        """
+        self.id: int = table_id
+        self.game: LostCitiesGame = game
+        self.seats: list[Optional[Connection]] = seats
+        self.started: bool = False
+        self.turn: int = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def over(self) -> bool:
+        """Whether the game is finished"""
+        return self.started and not self.game.deck
+
+    def is_computer(self, seat: int) -> bool:
+        """Whether a seat is played by the server"""
+        return isinstance(self.game.players[seat], ComputerPlayer)
+
+    def view(self, seat: int) -> dict[str, Any]:
+        """What a seat is allowed to see of the game
+
+        Args:
+            seat (int): seat index
+
+        Returns:
+            dict[str, Any]: "state" message, or "over" with final scores when the game is finished
+        """
+        game: LostCitiesGame = self.game
+        message: dict[str, Any] = {
+            "event": "over" if self.over else "state",
+            "table": self.id,
+            "seat": seat,
+            "turn": game.current_player,
+            "deck": len(game.deck),
+            "discard": {color: top.value for color in game.colors if (top := game.discard_piles.top(color))},
+            "hand": [[card.color, card.value] for card in game.players[seat].hand],
+            "boards": [
+                {color: [card.value for card in expedition] for color, expedition in player.board.items() if expedition}
+                for player in game.players
+            ],
+            "scores": [player.compute_score()[0] for player in game.players],
+        }
+        return message
+
+
+class GameServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        turn_timeout: Optional[float] = 30.0,
+        computer_workers: int = 4,
+        strategy: str = "computer",
+        max_tables: int = 10_000,
+        version: Literal[5, 6] = 5,
+    ) -> None:
+        """Asyncio server hosting many tables at once with a JSON lines protocol, see the top of the module
+
+        Args:
+            host (str, optional): interface to listen on. Defaults to "127.0.0.1".
+            port (int, optional): port to listen on, 0 picks a free one. Defaults to 8765.
+            turn_timeout (Optional[float], optional): seconds a client has to play, a default move is played for it
+                afterwards. Defaults to 30.0, None for no timeout.
+            computer_workers (int, optional): threads deciding computer moves. Defaults to 4.
+            strategy (str, optional): registered computer strategy, see lost_cities.tournament. Defaults to "computer".
+            max_tables (int, optional): maximum number of open tables. Defaults to 10_000.
+            version (Literal[5, 6], optional): Which version to play. Defaults to 5.
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy}, choose among {sorted(STRATEGIES)}")
+        self.host: str = host
+        self.port: int = port
+        self.turn_timeout: Optional[float] = turn_timeout
+        self.strategy: str = strategy
+        self.max_tables: int = max_tables
+        self.version: Literal[5, 6] = version
+        self.executor = ThreadPoolExecutor(max_workers=computer_workers, thread_name_prefix="computer")
+        self.tables: dict[int, Table] = {}
+        self.rng = random.Random()
+        self.timeouts: int = 0
+        self._ids = itertools.count(1)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Listen for clients, self.port is updated when it was 0"""
+        self._server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Server listening on %s:%d", self.host, self.port)
+
+    async def close(self) -> None:
+        """Stop listening, cancel computer turns and timers"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self._tasks):
+            task.cancel()
+        for table in self.tables.values():
+            if table.timer is not None:
+                table.timer.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read requests line by line until the client disconnects"""
+        connection = Connection(writer)
+        try:
+            while True:
+                line: bytes = await reader.readline()
+                if not line:
+                    break
+                request_id: Any = None
+                try:
+                    message: Any = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError("a message must be a JSON object")
+                    request_id = message.get("id")
+                    self.handle_message(connection, message)
+                except (ValueError, KeyError, TypeError, IndexError) as error:
+                    reply: dict[str, Any] = {"event": "error", "message": str(error)}
+                    if request_id is not None:
+                        reply["id"] = request_id
+                    connection.send(reply)
+                await writer.drain()
+        except ConnectionError:  # pragma: nocover
+            pass
+        finally:
+            for table_id in list(connection.tables):
+                self.close_table(table_id)
+            writer.close()
+
+    def handle_message(self, connection: Connection, message: dict[str, Any]) -> None:
+        """Dispatch a request
+
+        Args:
+            connection (Connection): client sending the request
+            message (dict[str, Any]): decoded request
+
+        Raises:
+            ValueError: if the request is invalid, sent back as an error event
+        """
+        op: Any = message.get("op")
+        request_id: Any = message.get("id")
+        table: Table
+        if op == "new":
+            table = self.new_table(connection, str(message.get("name", "Player1")), message.get("opponent", "computer"))
+        elif op == "join":
+            table = self.get_table(message)
+            self.join_table(connection, table, str(message.get("name", "Player2")))
+        elif op == "move":
+            table = self.get_table(message)
+            self.play_move(table, table.seats.index(connection), message)
+        elif op == "state":
+            table = self.get_table(message)
+            connection.send(table.view(table.seats.index(connection)))
+        elif op == "leave":
+            table = self.get_table(message)
+            self.close_table(table.id)
+        else:
+            raise ValueError(f"unknown op {op}")
+        if request_id is not None:
+            connection.send({"event": "ack", "id": request_id, "table": message.get("table", table.id)})
+
+    def get_table(self, message: dict[str, Any]) -> Table:
+        """Table of a request"""
+        table: Optional[Table] = self.tables.get(message.get("table"))  # type: ignore
+        if table is None:
+            raise ValueError(f"unknown table {message.get('table')}")
+        return table
+
+    def new_table(self, connection: Connection, name: str, opponent: str) -> Table:
+        """Open a table, the game starts at once against a computer
+
+        Args:
+            connection (Connection): client taking the first seat
+            name (str): name of the client
+            opponent (str): "computer" or "human"
+
+        Returns:
+            Table: new table
+        """
+        if opponent not in ("computer", "human"):
+            raise ValueError(f"unknown opponent {opponent}")
+        if len(self.tables) >= self.max_tables:
+            raise ValueError("the server is full")
+        game = LostCitiesGame(name, "Computer" if opponent == "computer" else "Player2", False, self.version)
+        if opponent == "computer":
+            game.players[1] = STRATEGIES[self.strategy]("Computer", self.version)
+        table = Table(next(self._ids), game, [connection, None])
+        self.tables[table.id] = table
+        connection.tables.add(table.id)
+        connection.send({"event": "joined", "table": table.id, "seat": 0})
+        if opponent == "computer":
+            self.start_game(table)
+        return table
+
+    def join_table(self, connection: Connection, table: Table, name: str) -> None:
+        """Take the free seat of a table waiting for a human opponent"""
+        if table.started or table.is_computer(1):
+            raise ValueError(f"table {table.id} is full")
+        table.game.players[1].name = name
+        table.seats[1] = connection
+        connection.tables.add(table.id)
+        connection.send({"event": "joined", "table": table.id, "seat": 1})
+        self.start_game(table)
+
+    def start_game(self, table: Table) -> None:
+        """Deal the cards and send the first state"""
+        table.game.setup()
+        table.started = True
+        self.next_turn(table)
+
+    def play_move(self, table: Table, seat: int, message: dict[str, Any]) -> None:
+        """Play the move of a client
+
+        Args:
+            table (Table): table of the move
+            seat (int): seat of the client
+            message (dict[str, Any]): move request
+
+        Raises:
+            ValueError: if it is not the turn of the client or the move is illegal
+        """
+        if not table.started or table.over or table.game.current_player != seat:
+            raise ValueError("not your turn")
+        color, value = message["card"]
+        try:
+            card: Card = Card.intern(color, int(value))
+        except AttributeError:
+            raise ValueError(f"unknown card {message['card']}") from None
+        table.game.play_move(message["kind"], card, message.get("pile", "deck"), message.get("color"))
+        self.next_turn(table)
+
+    def next_turn(self, table: Table) -> None:
+        """Broadcast the new state, then either schedule the computer or arm the turn timeout"""
+        table.turn += 1
+        if table.timer is not None:
+            table.timer.cancel()
+            table.timer = None
+        for seat, connection in enumerate(table.seats):
+            if connection is not None:
+                connection.send(table.view(seat))
+        if table.over:
+            return
+
+        if table.is_computer(table.game.current_player):
+            task: asyncio.Task = asyncio.get_running_loop().create_task(self.computer_turn(table, table.turn))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        elif self.turn_timeout is not None:
+            table.timer = asyncio.get_running_loop().call_later(
+                self.turn_timeout, self.timeout_turn, table.id, table.turn
+            )
+
+    async def computer_turn(self, table: Table, turn: int) -> None:
+        """Decide the computer move on the executor then play it on the event loop"""
+        action, card = await asyncio.get_running_loop().run_in_executor(self.executor, table.game.computer_decision)
+        if self.tables.get(table.id) is not table or table.turn != turn:  # pragma: nocover
+            return
+        table.game.apply_computer_decision(action, card)
+        self.next_turn(table)
+
+    def timeout_turn(self, table_id: int, turn: int) -> None:
+        """Play the default move of a client too slow to play"""
+        table: Optional[Table] = self.tables.get(table_id)
+        if table is None or table.turn != turn or table.over:  # pragma: nocover
+            return
+        self.timeouts += 1
+        logger.info("Turn timeout on table %d", table_id)
+        table.game.play_move(*playout_action(from_game(table.game), self.rng, epsilon=0.0))
+        self.next_turn(table)
+
+    def close_table(self, table_id: int) -> None:
+        """Remove a table and tell the other client"""
+        table: Optional[Table] = self.tables.pop(table_id, None)
+        if table is None:
+            return
+        if table.timer is not None:
+            table.timer.cancel()
+        for connection in table.seats:
+            if connection is not None:
+                connection.tables.discard(table_id)
+                connection.send({"event": "closed", "table": table_id})
+
+
+async def serve(server: GameServer) -> None:  # pragma: nocover
+    """Run a server until cancelled"""
+    await server.start()
+    print(f"Listening on {server.host}:{server.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[list[str]] = None) -> None:  # pragma: nocover
+    parser = argparse.ArgumentParser(description="Host Lost Cities tables over TCP with a JSON lines protocol")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    parser.add_argument("-p", "--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("-t", "--turn-timeout", type=float, default=30.0, help="seconds per turn, 0 for no timeout")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="threads deciding computer moves")
+    parser.add_argument("--strategy", default="computer", choices=sorted(STRATEGIES), help="computer strategy")
+    parser.add_argument("--max-tables", type=int, default=10_000, help="maximum number of open tables")
+    args = parser.parse_args(argv)
+    enable_logging(logging.WARNING)
+    server = GameServer(args.host, args.port, args.turn_timeout or None, args.workers, args.strategy, args.max_tables)
+    try:
+        asyncio.run(serve(server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":  # pragma: nocover
+    main()
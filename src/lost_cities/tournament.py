@@ -0,0 +1,328 @@
+import argparse
+import logging
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Literal, Optional
+
+import numpy as np
+
+from lost_cities import logger
+from lost_cities.game import LostCitiesGame
+from lost_cities.mcts import MCTSComputerPlayer
+from lost_cities.player import ComputerPlayer
+from lost_cities.profiling import ProbeKey, Profiler
+from lost_cities.record import GameRecord, RecordWriter
+
+STRATEGIES: dict[str, type[ComputerPlayer]] = {"computer": ComputerPlayer, "mcts": MCTSComputerPlayer}
+
+
+def register_strategy(name: str) -> Callable[[type[ComputerPlayer]], type[ComputerPlayer]]:
+    """Decorator registering a computer player so it can be used in tournaments
+
+    Args:
+        name (str): name used on the command line
+
+    Returns:
+        Callable[[type[ComputerPlayer]], type[ComputerPlayer]]: decorator returning the class unchanged
+    """
+
+    def decorator(strategy: type[ComputerPlayer]) -> type[ComputerPlayer]:
+        if not issubclass(strategy, ComputerPlayer):
+            raise TypeError(f"{strategy.__name__} must inherit from ComputerPlayer")
+        STRATEGIES[name] = strategy
+        return strategy
+
+    return decorator
+
+
+def game_seed(seed: int, game_index: int) -> np.random.SeedSequence:
+    """Seed of one game, only depends on the tournament seed and the game index so results do not depend on sharding
+    and every game draws from its own independent stream, whichever worker plays it
+
+    Args:
+        seed (int): tournament seed
+        game_index (int): index of the game, or of the deal, in the tournament
+
+    Returns:
+        np.random.SeedSequence: seed of the game, see play_game
+    """
+    return np.random.SeedSequence(seed, spawn_key=(game_index,))
+
+
+def substream(seed: np.random.SeedSequence, key: int) -> np.random.SeedSequence:
+    """Child of a seed sequence, unlike SeedSequence.spawn it does not depend on how many children were spawned before
+
+    Args:
+        seed (np.random.SeedSequence): parent seed
+        key (int): index of the child
+
+    Returns:
+        np.random.SeedSequence: independent seed
+    """
+    return np.random.SeedSequence(seed.entropy, spawn_key=(*seed.spawn_key, key))
+
+
+def play_game(strategies: tuple[str, str], version: Literal[5, 6], seed: np.random.SeedSequence) -> LostCitiesGame:
+    """Play a full game between two registered strategies. The deal and each seat draw from separate streams of the
+    seed, so the same seed deals the same cards whatever the strategies.
+
+    Args:
+        strategies (tuple[str, str]): strategy names, the first one starts
+        version (Literal[5, 6]): Which version to play
+        seed (np.random.SeedSequence): seed of the game, see game_seed
+
+    Returns:
+        LostCitiesGame: finished game
+    """
+    game = LostCitiesGame(
+        strategies[0], strategies[1], vs_computer=True, version=version, rng=np.random.default_rng(substream(seed, 0))
+    )
+    game.players = [STRATEGIES[name](name, version) for name in strategies]
+    for seat, player in enumerate(game.players):
+        # strategies drawing random numbers keep their generator in rng
+        if isinstance(getattr(player, "rng", None), random.Random):
+            player.rng = random.Random(int(substream(seed, seat + 1).generate_state(1)[0]))  # type: ignore
+    game.setup()
+    while len(game.deck) != 0:
+        game.play_round()
+    return game
+
+
+def run_shard(
+    strategies: tuple[str, str],
+    version: Literal[5, 6],
+    seed: int,
+    game_indexes: range,
+    record: bool = False,
+    profile: bool = False,
+) -> tuple[list[tuple[int, int]], list[bytes], dict[ProbeKey, list[float]]]:
+    """Play a shard of the tournament, games 2k and 2k + 1 share their deal with swapped seats
+
+    Args:
+        strategies (tuple[str, str]): strategy names
+        version (Literal[5, 6]): Which version to play
+        seed (int): tournament seed
+        game_indexes (range): indexes of the games to play
+        record (bool, optional): whether to encode the games, see lost_cities.record. Defaults to False.
+        profile (bool, optional): whether to time the engine and the players, see lost_cities.profiling. Defaults to
+            False.
+
+    Returns:
+        tuple[list[tuple[int, int]], list[bytes], dict[ProbeKey, list[float]]]: scores of each game in the order of
+            strategies, the encoded games when recording and the profiler entries when profiling
+    """
+    scores: list[tuple[int, int]] = []
+    records: list[bytes] = []
+    profiler = Profiler()
+    if profile:
+        profiler.enable()
+    try:
+        for index in game_indexes:
+            seats: tuple[str, str] = strategies if index % 2 == 0 else (strategies[1], strategies[0])
+            # both seatings of a deal are played, pairing games cuts the variance of the comparison
+            game: LostCitiesGame = play_game(seats, version, game_seed(seed, index // 2))
+            game_scores: tuple[int, int] = (game.players[0].compute_score()[0], game.players[1].compute_score()[0])
+            scores.append(game_scores if index % 2 == 0 else (game_scores[1], game_scores[0]))
+            if record:
+                records.append(GameRecord.from_game(game).encode())
+    finally:
+        profiler.disable()
+    return scores, records, profiler.entries
+
+
+def _init_worker() -> None:  # pragma: nocover
+    """Silence game logs in workers"""
+    logger.setLevel(logging.WARNING)
+
+
+def aggregate(strategies: tuple[str, str], scores: list[tuple[int, int]], elapsed: float) -> dict[str, Any]:
+    """Aggregate tournament results
+
+    Args:
+        strategies (tuple[str, str]): strategy names
+        scores (list[tuple[int, int]]): scores of each game
+        elapsed (float): wall time in seconds
+
+    Returns:
+        dict[str, Any]: win rates, score distributions and throughput
+    """
+    nb_games: int = len(scores)
+    results: dict[str, Any] = {
+        "games": nb_games,
+        "draws": sum(a == b for a, b in scores),
+        "seconds": elapsed,
+        "games_per_second": nb_games / elapsed if elapsed > 0 else float("inf"),
+        "players": {},
+    }
+    for seat, name in enumerate(strategies):
+        own: list[int] = [score[seat] for score in scores]
+        wins: int = sum(score[seat] > score[1 - seat] for score in scores)
+        results["players"][f"{seat}:{name}"] = {
+            "wins": wins,
+            "win_rate": wins / nb_games if nb_games else 0.0,
+            "mean": statistics.mean(own) if own else 0.0,
+            "stdev": statistics.stdev(own) if len(own) > 1 else 0.0,
+            "min": min(own, default=0),
+            "median": statistics.median(own) if own else 0.0,
+            "max": max(own, default=0),
+        }
+    return results
+
+
+def collect_shards(
+    shard_results: Iterable[tuple[list[tuple[int, int]], list[bytes], dict[ProbeKey, list[float]]]],
+    writer: Optional[RecordWriter],
+    profiler: Optional[Profiler] = None,
+) -> list[tuple[int, int]]:
+    """Concatenate the scores of shards in order, append their games to the record file and merge their profiles
+
+    Args:
+        shard_results (Iterable[tuple[list[tuple[int, int]], list[bytes], dict[ProbeKey, list[float]]]]): outputs
+            of run_shard
+        writer (Optional[RecordWriter]): record file, None when not recording
+        profiler (Optional[Profiler], optional): profiler merging the shard profiles. Defaults to None.
+
+    Returns:
+        list[tuple[int, int]]: scores of every game
+    """
+    scores: list[tuple[int, int]] = []
+    for shard_scores, shard_records, shard_profile in shard_results:
+        scores.extend(shard_scores)
+        if writer is not None:
+            for game_record in shard_records:
+                writer.write(game_record)
+        if profiler is not None:
+            profiler.merge(shard_profile)
+    return scores
+
+
+def run_tournament(
+    strategies: tuple[str, str],
+    nb_games: int,
+    workers: int = 1,
+    seed: int = 0,
+    version: Literal[5, 6] = 5,
+    chunk_size: Optional[int] = None,
+    record: Optional[str] = None,
+    profile: Optional[str] = None,
+) -> dict[str, Any]:
+    """Play nb_games between two strategies, sharded over a process pool
+
+    Args:
+        strategies (tuple[str, str]): registered strategy names
+        nb_games (int): number of games
+        workers (int, optional): number of processes, 1 plays in the current process. Defaults to 1.
+        seed (int, optional): tournament seed. Defaults to 0.
+        version (Literal[5, 6], optional): Which version to play. Defaults to 5.
+        chunk_size (Optional[int], optional): games per shard. Defaults to None, 4 shards per worker.
+        record (Optional[str], optional): record file the games are appended to, in order. Defaults to None.
+        profile (Optional[str], optional): file where the time spent in the engine and the players of every worker
+            is dumped, readable with pstats. Defaults to None, no profiling.
+
+    Returns:
+        dict[str, Any]: aggregated results, see aggregate, with the profiler stats under "profile" when profiling
+    """
+    for name in strategies:
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {name}, choose among {sorted(STRATEGIES)}")
+
+    start: float = time.perf_counter()
+    writer: Optional[RecordWriter] = RecordWriter(record) if record is not None else None
+    profiler: Optional[Profiler] = Profiler() if profile is not None else None
+    try:
+        if workers <= 1:
+            level: int = logger.level
+            logger.setLevel(logging.WARNING)
+            try:
+                scores: list[tuple[int, int]] = collect_shards(
+                    [run_shard(strategies, version, seed, range(nb_games), writer is not None, profiler is not None)],
+                    writer,
+                    profiler,
+                )
+            finally:
+                logger.setLevel(level)
+        else:
+            chunk_size = chunk_size or max(1, -(-nb_games // (workers * 4)))
+            shards: list[range] = [range(i, min(i + chunk_size, nb_games)) for i in range(0, nb_games, chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+                scores = collect_shards(
+                    executor.map(
+                        run_shard,
+                        *zip(
+                            *[
+                                (strategies, version, seed, shard, writer is not None, profiler is not None)
+                                for shard in shards
+                            ]
+                        ),
+                    ),
+                    writer,
+                    profiler,
+                )
+    finally:
+        if writer is not None:
+            writer.close()
+
+    results: dict[str, Any] = aggregate(strategies, scores, time.perf_counter() - start)
+    if profiler is not None:
+        profiler.dump_stats(profile)  # type: ignore[arg-type]
+        results["profile"] = profiler.stats()
+    return results
+
+
+def format_results(results: dict[str, Any]) -> str:
+    """Human readable report
+
+    Args:
+        results (dict[str, Any]): output of run_tournament
+
+    Returns:
+        str: report
+    """
+    lines: list[str] = [
+        f"{results['games']} games in {results['seconds']:.2f}s ({results['games_per_second']:.1f} games/s), "
+        + f"{results['draws']} draws"
+    ]
+    for name, stats in results["players"].items():
+        lines.append(
+            f"{name}: win rate {stats['win_rate']:.1%}, score mean {stats['mean']:.1f} +- {stats['stdev']:.1f} "
+            + f"[min {stats['min']}, median {stats['median']}, max {stats['max']}]"
+        )
+    for name, probe in results.get("profile", {}).items():
+        lines.append(
+            f"{name}: {probe['calls']} calls, {probe['seconds']:.3f}s ({probe['own_seconds']:.3f}s own), "
+            + f"{probe['mean'] * 1e6:.1f}us per call"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pit computer strategies against each other")
+    parser.add_argument("strategies", nargs="*", default=["computer", "computer"], help="two registered strategies")
+    parser.add_argument("-n", "--games", type=int, default=1000, help="number of games")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="number of processes")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="tournament seed")
+    parser.add_argument("-v", "--version", type=int, choices=[5, 6], default=5, help="number of colors")
+    parser.add_argument("-r", "--record", default=None, help="record file the games are appended to")
+    parser.add_argument("-p", "--profile", default=None, help="pstats file timing the engine and the players")
+    args = parser.parse_args(argv)
+    if len(args.strategies) == 1:
+        args.strategies = args.strategies * 2
+    if len(args.strategies) != 2:
+        parser.error("give one or two strategies")
+
+    results = run_tournament(
+        tuple(args.strategies),
+        args.games,
+        args.workers,
+        args.seed,
+        args.version,
+        record=args.record,
+        profile=args.profile,
+    )
+    print(format_results(results))
+
+
+if __name__ == "__main__":  # pragma: nocover
+    main()
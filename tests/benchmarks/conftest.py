@@ -0,0 +1,17 @@
+import logging
+
+import pytest
+
+# calls of a round for the paths taking a few microseconds, timer and scheduler noise would dominate single calls
+BATCH: int = 1000
+
+
+@pytest.fixture(autouse=True)
+def game_logs(caplog):
+    """Tournaments play without logs, so are the benchmarks"""
+    caplog.set_level(logging.WARNING, logger="lost_cities")
+
+
+@pytest.fixture
+def batch():
+    return BATCH
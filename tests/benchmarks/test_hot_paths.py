@@ -0,0 +1,82 @@
+import pytest
+
+from lost_cities.card import COLORS, Card
+from lost_cities.game import LostCitiesGame
+from lost_cities.player import ComputerPlayer, Player
+from lost_cities.tournament import game_seed, play_game
+
+pytest.importorskip("pytest_benchmark")
+
+# measured with make bench, which compares them to the stored baseline, make bench-save stores a new baseline
+
+
+@pytest.fixture
+def full_boards_player():
+    player = Player("Player", version=6)
+    for color in COLORS:
+        player.board[color] = [Card(color, 0)] * 3 + [Card(color, value) for value in range(2, 11)]
+    return player
+
+
+@pytest.fixture
+def fixed_computer(computer_player):
+    computer_player.board["Green"] = [Card("Green", 2)]
+    computer_player.board["Blue"] = [Card("Blue", 0), Card("Blue", 6)]
+    return computer_player
+
+
+@pytest.mark.parametrize("version", [5, 6])
+def test_setup(benchmark, version):
+    def new_game():
+        return (LostCitiesGame("Computer1", "Computer2", version=version, rng=0),), {}
+
+    benchmark.pedantic(LostCitiesGame.setup, setup=new_game, rounds=2000)
+
+
+def test_play_game(benchmark):
+    game = benchmark(play_game, ("computer", "computer"), 5, game_seed(0, 0))
+    assert not game.deck
+
+
+def test_choose_action(benchmark, batch, fixed_computer):
+    assert benchmark.pedantic(fixed_computer.choose_action, iterations=batch, rounds=100) == ("play", Card("Yellow", 0))
+
+
+def test_choose_pile(benchmark, batch, fixed_computer):
+    tops = [Card("Yellow", 3), Card("Blue", 4), Card("White", 2), Card("Green", 3), Card("Red", 2)]
+    pile = benchmark.pedantic(fixed_computer.choose_pile, (tops, Card("Red", 8)), iterations=batch, rounds=100)
+    assert pile == ("discard", "Green")
+
+
+def test_compute_score(benchmark, batch, full_boards_player):
+    total, detail = benchmark.pedantic(full_boards_player.compute_score, iterations=batch, rounds=100)
+    assert total == 6 * 156
+
+
+def test_compute_one_score(benchmark, batch, full_boards_player):
+    expedition = full_boards_player.board["Red"]
+    assert benchmark.pedantic(ComputerPlayer.compute_one_score, (expedition,), iterations=batch, rounds=100) == 156
+
+
+def test_extract_card(benchmark):
+    utils = pytest.importorskip("lost_cities.gui.utils")
+    utils.get_atlas()
+    assert benchmark(utils.extract_card, "Red", 7).shape == (133, 85, 3)
+
+
+def test_rgba2rgb(benchmark):
+    utils = pytest.importorskip("lost_cities.gui.utils")
+    rgba = utils.get_atlas()[:133, :85]
+    assert benchmark(utils.rgba2rgb, rgba).shape == (133, 85, 3)
+
+
+@pytest.mark.parametrize("render_mode", ["full", "dirty"])
+def test_gui_frame(benchmark, gui_game, render_mode):
+    gui_game.render_mode = render_mode
+    gui_game.game.setup()
+
+    def frame():
+        gui_game.mark_dirty("hand", "deck", "discard")
+        return gui_game.render()
+
+    assert benchmark(frame) is True
@@ -0,0 +1,52 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import lost_cities
+
+SRC_PATH: str = str(Path(lost_cities.__file__).parents[1])
+HEAVY_MODULES: list[str] = ["pygame", "numpy", "PIL", "pydantic_settings"]
+MAX_IMPORT_SECONDS: float = 0.15
+
+SCRIPT: str = """
+import sys
+import time
+
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(",".join(name for name in {heavy} if name in sys.modules))
+"""
+
+
+@pytest.mark.parametrize("module", ["lost_cities.game", "lost_cities.player", "lost_cities.card"])
+def test_engine_import_time(module, tmp_path):
+    # run from another directory, assets must not be resolved from the cwd
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(module=module, heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=tmp_path,
+        env={"PYTHONPATH": SRC_PATH},
+    )
+    elapsed, heavy_loaded = result.stdout.splitlines()
+
+    assert heavy_loaded == ""
+    assert float(elapsed) < MAX_IMPORT_SECONDS
+
+
+def test_card_assets_from_any_cwd(tmp_path):
+    script = "from lost_cities.card import Card; print(Card('Red', 4).surface.get_size())"
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=tmp_path,
+        env={"PYTHONPATH": SRC_PATH, "PYGAME_HIDE_SUPPORT_PROMPT": "1"},
+    )
+
+    assert result.stdout.strip() == "(85, 133)"
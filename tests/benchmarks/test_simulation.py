@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from lost_cities.batch import BatchLostCitiesGame
+from lost_cities.card import Card
+from lost_cities.engine import DISCARD, apply, is_over, legal_actions, new_state
+from lost_cities.mcts import playout
+from lost_cities.player import ComputerPlayer
+from lost_cities.tournament import game_seed, play_game
+
+pytest.importorskip("pytest_benchmark")
+
+# throughputs measured with make bench like the hot paths, each round plays a batch of games
+
+
+def test_random_engine_games(benchmark):
+    def random_games():
+        rng = random.Random(0)
+        piles_drawn = set()
+        for _ in range(20):
+            state = new_state(rng=rng)
+            while not is_over(state):
+                action = rng.choice(legal_actions(state))
+                if action.pile == DISCARD:
+                    piles_drawn.add(action.color)
+                state = apply(state, action)
+        return piles_drawn
+
+    assert len(benchmark.pedantic(random_games, rounds=3)) == 5
+
+
+def test_playouts(benchmark):
+    def playouts():
+        rng = random.Random(0)
+        return [playout(new_state(rng=rng), rng) for _ in range(100)]
+
+    assert all(is_over(state) for state in benchmark.pedantic(playouts, rounds=3))
+
+
+def test_batch_games(benchmark):
+    def batch_games():
+        game = BatchLostCitiesGame(1000, seed=0)
+        game.play_random_games()
+        return game
+
+    game = benchmark.pedantic(batch_games, rounds=3)
+    assert (game.discard_size > 0).any(axis=0).all()
+
+
+def test_computer_games(benchmark):
+    def computer_games():
+        return [play_game(("computer", "computer"), 5, game_seed(0, index)) for index in range(50)]
+
+    games = benchmark.pedantic(computer_games, rounds=3)
+    assert any(pile == DISCARD for game in games for _, _, pile, _ in game.moves)
+
+
+def test_choose_pile_every_top(benchmark, batch):
+    player = ComputerPlayer("Computer")
+    player.hand = [Card("Yellow", 0), Card("Yellow", 2), Card("Red", 8), Card("Green", 5)]
+    player.board["Blue"] = [Card("Blue", 6)]
+    tops = [Card("Yellow", 3), Card("Blue", 4), Card("White", 2), Card("Green", 3), Card("Red", 2)]
+
+    pile = benchmark.pedantic(player.choose_pile, (tops, Card("Red", 5)), iterations=batch, rounds=100)
+    assert pile == ("deck", None)
@@ -1,3 +1,5 @@
+import logging
+
 import pygame
 import pytest
 
@@ -7,6 +9,19 @@ from lost_cities.gui.gui import GUIGame
 from lost_cities.player import ComputerPlayer, Player
 
 
+def pytest_configure(config):
+    # benchmarks are measured by make bench, other runs call each benchmarked function once as a test
+    if config.pluginmanager.hasplugin("benchmark") and not (
+        config.getoption("benchmark_enable") or config.getoption("benchmark_only")
+    ):
+        config.option.benchmark_disable = True
+
+
+@pytest.fixture(autouse=True)
+def game_logs(caplog):
+    caplog.set_level(logging.DEBUG, logger="lost_cities")
+
+
 @pytest.fixture
 def test_player():
     return Player("Player1", version=5)
@@ -40,6 +55,7 @@ def game_setup():
 @pytest.fixture
 def gui_game():
     pygame.init()
-    game = GUIGame()
+    game = GUIGame(headless=True)
     yield game
+    game.executor.shutdown()
     pygame.quit()
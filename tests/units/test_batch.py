@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from lost_cities.batch import EMPTY, BatchLostCitiesGame, encode
+from lost_cities.card import COLORS, Card
+from lost_cities.player import Player
+
+
+@pytest.fixture
+def batch_game():
+    game = BatchLostCitiesGame(50, seed=42)
+    game.setup()
+    return game
+
+
+def cards_of(game, index):
+    """every card of a game, wherever it is"""
+    hands = game.hands[index][game.hands[index] >= 0].tolist()
+    deck = game.deck[index, : game.deck_size[index]].tolist()
+    discard = [
+        card
+        for color in range(game.nb_colors)
+        for card in game.discard_piles[index, color, : game.discard_size[index, color]].tolist()
+    ]
+    board = [
+        encode(color, value)
+        for player in range(2)
+        for color in range(game.nb_colors)
+        for value in game.boards[index, player, color, : game.board_count[index, player, color]].tolist()
+    ]
+    return sorted(hands + deck + discard + board)
+
+
+def test_batch_instanciate_error():
+    with pytest.raises(AttributeError):
+        BatchLostCitiesGame(10, version=4)
+
+
+@pytest.mark.parametrize("version", [5, 6])
+def test_batch_setup(version):
+    game = BatchLostCitiesGame(20, version=version, seed=0)
+    game.setup()
+
+    assert (game.hands >= 0).all()
+    assert (game.deck_size == 12 * version - 16).all()
+    assert (game.discard_size == 0).all()
+    assert len({tuple(deck) for deck in game.deck.tolist()}) == 20
+    assert cards_of(game, 0) == sorted(np.sort(game.deck[1]).tolist())
+
+
+def test_batch_play_card(batch_game):
+    batch_game.hands[:, 0, 0] = encode(2, 5)
+    batch_game.board_top[:2, 0, 2] = [4, 6]
+
+    played = batch_game.play_card(np.zeros(50, dtype=int))
+
+    assert played.tolist() == [True, False] + [True] * 48
+    assert batch_game.hands[0, 0, 0] == EMPTY
+    assert batch_game.hands[1, 0, 0] == encode(2, 5)
+    assert batch_game.board_top[0, 0, 2] == 5
+    assert batch_game.boards[2, 0, 2, 0] == 5
+
+
+def test_batch_discard_and_pick(batch_game):
+    discarded = batch_game.hands[:, 0, 3].copy()
+    colors = discarded >> 4
+    batch_game.discard_card(np.full(50, 3))
+
+    assert (batch_game.discard_size.sum(axis=1) == 1).all()
+    assert (batch_game.discard_size[np.arange(50), colors] == 1).all()
+    assert (batch_game.hands[:, 0, 3] == EMPTY).all()
+
+    # the card discarded this turn cannot be picked back, the deck is used instead
+    batch_game.pick_card(colors)
+
+    assert (batch_game.deck_size == 43).all()
+    assert (batch_game.discard_size[np.arange(50), colors] == 1).all()
+
+    batch_game.switch_player()
+    batch_game.hands[:, 1, 0] = encode(colors, 10)
+    batch_game.play_card(np.zeros(50, dtype=int))
+    batch_game.pick_card(np.where(np.arange(50) % 2 == 0, colors, EMPTY))
+
+    assert (batch_game.hands[::2, 1, 0] == discarded[::2]).all()
+    assert (batch_game.discard_size[::2].sum(axis=1) == 0).all()
+    assert (batch_game.deck_size[::2] == 43).all()
+    assert (batch_game.deck_size[1::2] == 42).all()
+    assert (batch_game.hands >= 0).all()
+
+
+def test_batch_random_games():
+    game = BatchLostCitiesGame(30, seed=1)
+    scores = game.play_random_games()
+
+    assert scores.shape == (30, 2)
+    assert not game.active.any()
+    assert all(cards_of(game, i) == cards_of(game, 0) for i in range(30))
+
+    for i in range(30):
+        for player_index in range(2):
+            player = Player("Dummy")
+            player.board = {
+                color: [Card(color, value) for value in game.boards[i, player_index, color_id] if value != EMPTY]
+                for color_id, color in enumerate(COLORS[:5])
+            }
+            assert scores[i, player_index] == player.compute_score()[0]
+
+
+def test_batch_compute_score():
+    game = BatchLostCitiesGame(1)
+    game.boards[0, 0, 0, :8] = [0, 0, 0, 2, 4, 5, 8, 9]
+    game.board_count[0, 0, 0] = 8
+    game.boards[0, 0, 1, :2] = [6, 7]
+    game.board_count[0, 0, 1] = 2
+
+    total, detail = game.compute_score()
+
+    assert detail[0, 0].tolist() == [52, -7, 0, 0, 0]
+    assert total[0].tolist() == [45, 0]
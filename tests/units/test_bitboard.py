@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from lost_cities.bitboard import (
+    CLOSE,
+    VALUES_OF,
+    Bitboard,
+    add_to_mask,
+    hand_masks,
+    mask_card,
+    remove_from_mask,
+    score_mask,
+)
+from lost_cities.card import Card
+from lost_cities.engine import apply, is_over, legal_actions, new_state, scores
+from lost_cities.player import Player
+
+
+def test_wager_masks():
+    mask = 0
+    for expected in [0b1, 0b11, 0b111]:
+        mask = add_to_mask(mask, 0)
+        assert mask == expected
+    mask = add_to_mask(mask, 10)
+    assert mask == 0b1000_0000_0111
+    assert remove_from_mask(mask, 0) == 0b1000_0000_0011
+    assert remove_from_mask(mask, 10) == 0b111
+
+
+@pytest.mark.parametrize(
+    "values", [[0, 3, 4, 6, 10], [6, 7], [], [3, 5, 7, 8, 9], [0, 0, 0, 2, 4, 5, 8, 9], [0], [0, 0, 2, 3, 4, 5, 6, 7]]
+)
+def test_score_mask(values):
+    mask = 0
+    for value in values:
+        mask = add_to_mask(mask, value)
+    assert score_mask(mask) == Player.compute_one_score([Card("Red", value) for value in values])
+
+
+def test_from_game(game_setup):
+    bitboard = Bitboard.from_game(game_setup)
+    for player_index, player in enumerate(game_setup.players):
+        for card in player.hand:
+            assert bitboard.has_card(player_index, card.color_id, card.value)
+            assert bitboard.can_play(player_index, card.color_id, card.value)
+        assert sorted(bitboard.playable_cards(player_index)) == sorted(set(player.hand))
+    assert not bitboard.has_card(0, 0, 1)
+
+
+def test_play():
+    bitboard = Bitboard.from_cards([[Card("Blue", 0), Card("Blue", 5), Card("Blue", 3)], []], [[[]] * 5, [[]] * 5])
+    bitboard.play(0, 1, 5)
+
+    assert bitboard.tops[0][1] == 5
+    assert not bitboard.can_play(0, 1, 3)
+    assert not bitboard.can_play(0, 1, 0)
+    assert list(bitboard.legal_plays(0)) == []
+    assert bitboard.score_detail(0) == [0, -15, 0, 0, 0]
+
+
+def test_random_games_match_engine():
+    rng = random.Random(3)
+    for _ in range(5):
+        state = new_state(6, rng=rng)
+        while not is_over(state):
+            bitboard = Bitboard.from_state(state)
+            player = state.current_player
+            expected = {(a.card.color_id, a.card.value) for a in legal_actions(state) if a.kind == "play"}
+            assert set(bitboard.legal_plays(player)) == expected
+            assert (bitboard.score(0), bitboard.score(1)) == scores(state)
+            state = apply(state, rng.choice(legal_actions(state)))
+
+
+def test_hand_masks():
+    hand = [Card("Blue", 0), Card("Blue", 0), Card("Blue", 3), Card("Red", 10)]
+    masks = hand_masks(hand, 5)
+
+    assert masks == [0, 0b1_0011, 0, 0, 1 << 11]
+    assert [mask_card(color_id, value) for color_id, mask in enumerate(masks) for value in VALUES_OF[mask]] == hand
+    assert mask_card(4, 10) is Card.from_id(Card("Red", 10).card_id)
+    assert VALUES_OF[masks[1] & CLOSE[2]] == (3,)
+    assert VALUES_OF[CLOSE[0]] == (2,) and VALUES_OF[CLOSE[10]] == ()
@@ -2,7 +2,7 @@ import numpy as np
 import pygame
 import pytest
 
-from lost_cities.card import Card
+from lost_cities.card import COLORS, NB_CARD_IDS, VALUES, Card
 
 
 @pytest.mark.parametrize("color,value", [("Blue", 9), ("Yellow", 2), ("Red", 0)])
@@ -15,31 +15,6 @@ def test_card(color, value):
     assert card.img.shape[0:2] == (133, 85)
     assert isinstance(card.surface, pygame.Surface)
     assert card.surface.get_size() == (85, 133)
-    assert isinstance(card.rect, pygame.Rect)
-    assert card.rect.size == (85, 133)
-    assert card.x == 0
-    assert card.y == 0
-
-
-def test_card_rotate():
-    card = Card("Blue", 0)
-    card.rotate_surface_to_discard()
-    assert isinstance(card.surface, pygame.Surface)
-    assert card.surface.get_size() == (133, 85)
-
-    card.unrotate_surface_to_discard()
-    assert isinstance(card.surface, pygame.Surface)
-    assert card.surface.get_size() == (85, 133)
-
-
-def test_card_set_coord():
-    card = Card("Blue", 0)
-    assert card.x == 0
-    assert card.y == 0
-
-    card.set_coord(100, 100)
-    assert card.x == 100
-    assert card.y == 100
 
 
 def test_card_error():
@@ -50,3 +25,39 @@ def test_card_error():
     with pytest.raises(AttributeError) as e:
         Card("Blue", "dummy")
         assert "value must be between 2 and 10 or a 0" in e
+
+
+def test_card_headless():
+    card = Card("Green", 7)
+    assert card.color_id == 3
+    assert not hasattr(card, "__dict__")
+    with pytest.raises(AttributeError):
+        card.x = 100
+
+
+def test_card_hash():
+    assert hash(Card("Red", 0)) == hash(Card("Red", 0))
+    assert len({Card("Red", 0), Card("Red", 0), Card("Red", 2), Card("Blue", 0)}) == 3
+    assert Card("Red", 0) != "0:Red"
+
+
+def test_card_ids():
+    cards = [Card(color, value) for color in COLORS for value in VALUES]
+    assert [card.card_id for card in cards] == list(range(NB_CARD_IDS))
+    assert all(Card.from_id(card.card_id) == card for card in cards)
+    assert Card.intern("Red", 0) is Card.from_id(Card("Red", 0).card_id) is Card.intern("Red", 0)
+    assert Card.intern("Red", 0) is not Card("Red", 0)
+
+
+@pytest.mark.parametrize("color,value", [("Black", 2), ("Red", 1), ("Red", [2]), (None, 2)])
+def test_card_intern_error(color, value):
+    with pytest.raises(AttributeError):
+        Card.intern(color, value)
+    with pytest.raises(AttributeError):
+        Card(color, value)
+
+
+def test_card_shared_surfaces():
+    card, other = Card("Blue", 4), Card("Blue", 4)
+    assert card.surface is other.surface
+    assert card.img is other.img
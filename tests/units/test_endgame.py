@@ -0,0 +1,137 @@
+import random
+import time
+
+import pytest
+
+from lost_cities.card import Card
+from lost_cities.endgame import EndgameSolver, TranspositionTable, expedition_score, score_difference, zobrist_hash
+from lost_cities.engine import apply, is_over, legal_actions, new_state, scores
+from lost_cities.mcts import playout_action
+
+
+def play_until(deck_size, seed=0):
+    rng = random.Random(seed)
+    state = new_state(rng=rng)
+    while len(state.deck) > deck_size:
+        state = apply(state, playout_action(state, rng))
+    return state
+
+
+def expectimax(state, depth):
+    """Reference solver without table, searched to depth turns"""
+    if is_over(state) or depth == 0:
+        return score_difference(state)
+    values = []
+    for action in legal_actions(state):
+        if action.pile == "discard":
+            values.append(expectimax(apply(state, action), depth - 1))
+        else:
+            deck = list(state.deck)
+            total = 0.0
+            for index in range(len(deck)):
+                arranged = deck[:index] + deck[index + 1 :] + [deck[index]]
+                total += expectimax(apply(state._replace(deck=tuple(arranged)), action), depth - 1)
+            values.append(total / len(deck))
+    return max(values) if state.current_player == 0 else min(values)
+
+
+def test_zobrist_hash():
+    state = play_until(10)
+
+    assert zobrist_hash(state) == zobrist_hash(state._replace(deck=tuple(reversed(state.deck))))
+    assert zobrist_hash(state) != zobrist_hash(state._replace(current_player=1 - state.current_player))
+    assert zobrist_hash(state) != zobrist_hash(apply(state, legal_actions(state)[0]))
+
+    # duplicated wagers must not cancel each other
+    wagers = (Card("Red", 0), Card("Red", 0))
+    assert zobrist_hash(state._replace(hands=(wagers, ()))) != zobrist_hash(state._replace(hands=((), ())))
+
+    # the position of a card in its discard pile matters
+    piles = tuple(() for _ in state.discard_piles)
+    stacked = piles[:3] + ((Card("Green", 5), Card("Green", 7)),) + piles[4:]
+    swapped = piles[:3] + ((Card("Green", 7), Card("Green", 5)),) + piles[4:]
+    assert zobrist_hash(state._replace(discard_piles=stacked)) != zobrist_hash(state._replace(discard_piles=swapped))
+
+
+def test_expedition_score():
+    expedition = (Card("Red", 0), Card("Red", 5), Card("Red", 9))
+    assert expedition_score(expedition) == -12
+    assert score_difference(play_until(0)) == scores(play_until(0))[0] - scores(play_until(0))[1]
+
+
+def test_transposition_table():
+    table = TranspositionTable(max_entries=2)
+    table.put(1, 3, 10.0, False)
+    table.put(2, 1, 5.0, True)
+
+    assert table.get(1, 4) is None
+    assert table.get(1, 3) == (10.0, False)
+    assert table.get(2, 8) == (5.0, True)
+
+    table.get(1, 1)
+    table.put(3, 1, 0.0, False)
+    assert len(table) == 2
+    assert table.get(2, 1) is None
+    assert table.get(1, 1) == (10.0, False)
+    assert table.hits == 4
+    assert table.misses == 2
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_solver_matches_expectimax(seed):
+    state = play_until(2, seed)
+    # drawing from the discard piles does not shrink the deck, so the search is bounded by its depth
+    solver = EndgameSolver(max_entries=0, time_budget=10, max_depth=2)
+    action, value, exact = solver.solve(state)
+    sign = 1 if state.current_player == 0 else -1
+
+    assert solver.depth == 2
+    assert action in legal_actions(state)
+    assert value == pytest.approx(sign * expectimax(state, 2))
+
+    # second solve only reads the table
+    solver = EndgameSolver(time_budget=10, max_depth=2)
+    assert solver.solve(state)[0] in legal_actions(state)
+    nodes = solver.nodes
+    solver.solve(state)
+    assert solver.nodes <= nodes
+
+
+def test_solver_is_exact_on_last_draw():
+    state = play_until(1)
+    state = state._replace(discard_piles=tuple(() for _ in state.discard_piles))
+    solver = EndgameSolver(time_budget=10)
+    action, value, exact = solver.solve(state)
+    sign = 1 if state.current_player == 0 else -1
+
+    assert exact
+    assert value == pytest.approx(sign * expectimax(state, 1))
+
+
+def test_horizon_exact_only_when_over():
+    hand = (Card("Yellow", 2), Card("White", 3), Card("Green", 4), Card("Red", 5))
+    tens = tuple((Card(color, 10),) for color in ("Yellow", "Blue", "White", "Green", "Red"))
+    state = new_state(rng=random.Random(0))._replace(
+        deck=(Card("Red", 9),),
+        hands=(hand, hand),
+        boards=(tens, tens),
+        discard_piles=((), (Card("Blue", 4),), (), (), ()),
+    )
+    actions = legal_actions(state)
+    values = EndgameSolver._horizon_values(state)
+
+    assert all(action.kind == "discard" for action in actions)
+    assert any(action.pile == "discard" for action in actions)
+    assert [exact for _, exact in values] == [is_over(apply(state, action)) for action in actions]
+
+
+def test_solver_time_budget():
+    state = play_until(20)
+    solver = EndgameSolver(time_budget=0.05)
+
+    start = time.perf_counter()
+    values, exact = solver.evaluate_actions(state)
+    assert time.perf_counter() - start < 1
+    assert not exact
+    assert set(values) == set(legal_actions(state))
+    assert solver.depth >= 1
@@ -0,0 +1,120 @@
+import random
+
+import pytest
+
+from lost_cities.card import Card
+from lost_cities.engine import Action, apply, from_game, is_over, legal_actions, new_state, scores
+
+
+@pytest.fixture
+def state():
+    return new_state(rng=random.Random(0))
+
+
+def test_new_state(state):
+    assert len(state.deck) == 44
+    assert [len(hand) for hand in state.hands] == [8, 8]
+    assert all(list(hand) == sorted(hand) for hand in state.hands)
+    assert state.discard_piles == ((),) * 5
+    assert state.current_player == 0
+    assert state.colors == ("Yellow", "Blue", "White", "Green", "Red")
+    assert new_state(rng=random.Random(0)) == state
+    assert len(new_state(6).boards[0]) == 6
+
+
+def test_from_game(game_setup):
+    state = from_game(game_setup)
+
+    assert list(state.deck) == game_setup.deck
+    assert sorted(state.hands[1]) == sorted(game_setup.players[1].hand)
+    assert state.boards[0] == ((),) * 5
+
+
+def test_legal_actions():
+    state = new_state()._replace(
+        hands=((Card("Blue", 0), Card("Blue", 0), Card("Red", 3)), ()),
+        boards=(((), (), (), (), (Card("Red", 5),)), ((),) * 5),
+    )
+    assert legal_actions(state) == [
+        Action("play", Card("Blue", 0), "deck"),
+        Action("discard", Card("Blue", 0), "deck"),
+        Action("discard", Card("Red", 3), "deck"),
+    ]
+
+    state = state._replace(discard_piles=((), (Card("Blue", 6),), (), (Card("Green", 4),), ()))
+    assert Action("play", Card("Blue", 0), "discard", "Green") in legal_actions(state)
+    assert Action("play", Card("Blue", 0), "discard", "Blue") in legal_actions(state)
+    assert Action("discard", Card("Red", 3), "discard", "Green") in legal_actions(state)
+    assert Action("discard", Card("Blue", 0), "discard", "Green") in legal_actions(state)
+    assert Action("discard", Card("Blue", 0), "discard", "Blue") not in legal_actions(state)
+    assert Action("play", Card("Blue", 0), "discard", "White") not in legal_actions(state)
+    assert len(legal_actions(state)) == 8
+    assert legal_actions(state._replace(deck=())) == []
+
+
+def test_apply_play(state):
+    card = state.hands[0][0]
+    next_state = apply(state, Action("play", card, "deck"))
+
+    assert next_state.current_player == 1
+    assert next_state.boards[0][card.color_id] == (card,)
+    assert len(next_state.deck) == 43
+    assert state.deck[-1] in next_state.hands[0]
+    assert next_state.hands[1] == state.hands[1]
+    assert len(state.deck) == 44
+
+
+def test_apply_discard_then_pick(state):
+    card = state.hands[0][0]
+    state = apply(state, Action("discard", card, "deck"))
+    other = state.hands[1][0]
+    state = apply(state, Action("play", other, "discard", card.color))
+
+    assert state.discard_piles == ((),) * 5
+    assert card in state.hands[1]
+    assert state.boards[1][other.color_id] == (other,)
+    assert len(state.deck) == 43
+
+
+@pytest.mark.parametrize(
+    "action",
+    [
+        Action("play", Card("Red", 2), "deck"),
+        Action("discard", Card("Blue", 4), "discard", "Blue"),
+        Action("play", Card("Blue", 4), "discard", "Red"),
+        Action("play", Card("Blue", 4), "discard"),
+        Action("play", Card("Blue", 4), "discard", "Purple"),
+        Action("dummy", Card("Blue", 4), "deck"),  # type: ignore[arg-type]  # invalid kind on purpose
+        Action("play", Card("Blue", 3), "deck"),
+        Action("play", Card("Blue", 4), "hand"),  # type: ignore[arg-type]  # invalid pile on purpose
+    ],
+)
+def test_apply_error(state, action):
+    state = state._replace(
+        hands=((Card("Blue", 3), Card("Blue", 4)), ()),
+        boards=(((), (Card("Blue", 4),), (), (), ()), ((),) * 5),
+        discard_piles=((), (Card("Blue", 2),), (), (Card("Green", 5),), ()),
+    )
+    with pytest.raises(ValueError):
+        apply(state, action)
+
+
+def test_apply_finished_game(state):
+    state = state._replace(deck=())
+    with pytest.raises(ValueError, match="the deck is empty"):
+        apply(state, Action("discard", state.hands[0][0], "deck"))
+
+
+def test_full_game_random(caplog):
+    rng = random.Random(1)
+    state = new_state(rng=rng)
+    while not is_over(state):
+        state = apply(state, rng.choice(legal_actions(state)))
+
+    cards = (
+        list(state.deck) + [c for pile in state.discard_piles for c in pile] + [c for hand in state.hands for c in hand]
+    )
+    cards += [c for board in state.boards for expedition in board for c in expedition]
+    assert len(cards) == 60
+    assert len(scores(state)) == 2
+    assert caplog.text == ""
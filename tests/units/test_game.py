@@ -1,7 +1,16 @@
+import logging
+import random
+import tracemalloc
+from collections import Counter
 from unittest.mock import patch
 
-from lost_cities.card import Card
-from lost_cities.game import LostCitiesGame
+import numpy as np
+import pytest
+
+from lost_cities import enable_logging, logger
+from lost_cities.card import Card, deck_prototype
+from lost_cities.engine import from_game, legal_actions
+from lost_cities.game import DiscardPiles, LostCitiesGame
 from lost_cities.player import ComputerPlayer
 
 initial_hand_size: int = 8
@@ -25,6 +34,63 @@ def test_setup():
     assert not cards_in_order
 
 
+@pytest.mark.parametrize(
+    "make_rng", [lambda: 7, lambda: "seed", lambda: random.Random(7), lambda: np.random.default_rng(7)]
+)
+def test_setup_seeded(make_rng):
+    decks = []
+    for _ in range(2):
+        random.seed()
+        game = LostCitiesGame("Player1", "Player2", rng=make_rng())
+        game.setup()
+        decks.append(game.initial_deck)
+    assert decks[0] == decks[1]
+
+    game = LostCitiesGame("Player1", "Player2", version=6, rng=make_rng())
+    game.setup()
+    game.setup()
+    assert game.initial_deck != decks[0]
+    assert sorted(game.initial_deck) == sorted(decks[0] + [Card("Purple", value) for value in [*range(2, 11), 0, 0, 0]])
+
+
+def test_setup_deck():
+    game = LostCitiesGame("Player1", "Player2", rng=3)
+    game.setup()
+    replayed = LostCitiesGame("Player1", "Player2")
+    replayed.setup(game.initial_deck)
+
+    assert replayed.deck == game.deck and replayed.deck is not game.initial_deck
+    assert replayed.players[0].hand == game.players[0].hand
+    assert replayed.players[1].hand == game.players[1].hand
+
+
+def test_setup_from_prototype():
+    game = LostCitiesGame("Player1", "Player2", version=6, rng=5)
+    game.setup()
+    # same deck and same deal as a deck of new cards shuffled by the same generator
+    deck = [Card(color, value) for color in game.colors for value in [*range(2, 11), 0, 0, 0]]
+    random.Random(5).shuffle(deck)
+    assert game.initial_deck == deck
+    assert game.players[0].hand == sorted(deck[-1:-17:-2]) and game.players[1].hand == sorted(deck[-2:-17:-2])
+    assert all(card is Card.from_id(card.card_id) for card in game.initial_deck)
+    assert deck_prototype(6) is deck_prototype(6)
+
+
+def test_reset():
+    game = LostCitiesGame("Player1", "Player2", vs_computer=False, rng=1)
+    game.setup()
+    player, hand = game.players[0], game.players[0].hand
+    game.make_move("play", player.hand[0], "deck")
+    game.action_discard(index="0", skip_card=True)
+
+    game.setup()
+    assert player.hand is hand and len(hand) == initial_hand_size
+    assert not any(player.board.values()) and not player.undo_stack
+    assert len(game.deck) == initial_deck_size and len(game.discard_piles) == 0
+    assert game.moves == [] and game.undo_stack == [] and game.just_discarded is None
+    assert game.current_player == 0
+
+
 def test_setup_vs_computer():
     game = LostCitiesGame("Player1", "Player2")
     game.setup()
@@ -64,16 +130,56 @@ def test_pick_discard_empty(mock_input, game_setup, caplog):
     assert len(game_setup.players[0].hand) == initial_hand_size + 1
 
 
-@patch("builtins.input", side_effect=["discard"])
-def test_pick_card_discard(mock_input, game_setup):
-    game_setup.discard_piles = [Card("Yellow", 10)]
-    initial_discard_piles_size = 1
+@patch("builtins.input", side_effect=["discard", "Blue", "Yellow"])
+def test_pick_card_discard(mock_input, game_setup, caplog):
+    game_setup.discard_piles.push(Card("Yellow", 10))
+    game_setup.discard_piles.push(Card("Green", 4))
     game_setup.pick_card()
 
-    assert len(game_setup.discard_piles) == initial_discard_piles_size - 1
+    assert mock_input.call_count == 3
+    assert "Can not pick in the Blue discard pile." in caplog.text
+    assert Card("Yellow", 10) in game_setup.players[0].hand
+    assert len(game_setup.discard_piles) == 1
+    assert game_setup.discard_piles.tops() == [None, None, None, Card("Green", 4), None]
     assert len(game_setup.players[0].hand) == initial_hand_size + 1
 
 
+@patch("builtins.input", side_effect=["Yellow"])
+def test_pick_card_just_discarded(mock_input, game_setup, caplog):
+    game_setup.discard_piles.push(Card("Green", 4))
+    game_setup.discard_piles.push(Card("Yellow", 3))
+    game_setup.players[0].hand = [Card("Green", 6)] + game_setup.players[0].hand[1:]
+    game_setup.action_discard("0", skip_card=True)
+    assert game_setup.just_discarded == Card("Green", 6)
+    game_setup.pick_card("discard", "Green")
+
+    assert "Can not pick in the Green discard pile." in caplog.text
+    assert Card("Yellow", 3) in game_setup.players[0].hand
+    assert game_setup.discard_piles.top("Green") == Card("Green", 6)
+    assert game_setup.just_discarded is None
+    assert game_setup.moves == [("discard", Card("Green", 6), "discard", "Yellow")]
+
+
+def test_discard_piles():
+    piles = DiscardPiles(5)
+    piles.push(Card("Red", 4))
+    piles.push(Card("Blue", 0))
+    piles.push(Card("Red", 7))
+
+    assert len(piles) == 3
+    assert list(piles) == [Card("Blue", 0), Card("Red", 4), Card("Red", 7)]
+    assert piles["Red"] == [Card("Red", 4), Card("Red", 7)]
+    assert piles.top("Red") == Card("Red", 7)
+    assert piles.top("Green") is None
+    assert piles.tops() == [None, Card("Blue", 0), None, None, Card("Red", 7)]
+    assert repr(piles).startswith("{'Yellow': [], 'Blue': [0:Blue]")
+
+    assert piles.pop("Red") == Card("Red", 7)
+    assert len(piles) == 2
+    with pytest.raises(IndexError):
+        piles.pop("White")
+
+
 @patch("builtins.input", side_effect=["0"])
 def test_action_play_card_not_playable(mock_input, game_setup, caplog):
     game_setup.players[0].hand[0] = Card("Red", 3)
@@ -125,7 +231,7 @@ def test_play_round(mock_input, game_setup, caplog):
 
 @patch("builtins.input", side_effect=["discard", "10", "dummy", "0", "deck"])
 def test_play_round_discard(mock_input, game_setup, caplog):
-    game_setup.discard_piles.append(Card("Yellow", 10))
+    game_setup.discard_piles.push(Card("Yellow", 10))
     first_card = game_setup.players[0].hand[0]
     game_setup.play_round()
 
@@ -135,6 +241,109 @@ def test_play_round_discard(mock_input, game_setup, caplog):
 
     assert len(game_setup.players[0].hand) == initial_hand_size
     assert len(game_setup.discard_piles) == 2
-    assert game_setup.discard_piles[-1] == first_card
+    assert game_setup.discard_piles.top(first_card.color) == first_card
 
     assert game_setup.current_player == 1
+
+
+def test_enable_logging():
+    enable_logging(logging.INFO)
+    enable_logging(logging.INFO)
+
+    handlers = [handler for handler in logger.handlers if isinstance(handler, logging.StreamHandler)]
+    assert logger.level == logging.INFO
+    assert len(handlers) == 1
+    logger.removeHandler(handlers[0])
+
+
+def snapshot(game):
+    return (
+        [id(card) for card in game.deck],
+        [id(card) for card in game.discard_piles],
+        [[id(card) for card in player.hand] for player in game.players],
+        [{color: [id(card) for card in cards] for color, cards in player.board.items()} for player in game.players],
+        [player.compute_score() for player in game.players],
+        game.current_player,
+    )
+
+
+def test_make_unmake_full_game():
+    rng = random.Random(2)
+    game = LostCitiesGame("Player1", "Player2", vs_computer=False)
+    game.setup()
+    for player in game.players:
+        player.reorder_hand()
+    snapshots, moves = [], []
+
+    while game.deck:
+        snapshots.append(snapshot(game))
+        action = rng.choice(legal_actions(from_game(game)))
+        moves.append(action)
+        game.make_move(*action)
+    final = snapshot(game)
+
+    for expected in reversed(snapshots):
+        game.unmake_move()
+        assert snapshot(game) == expected
+    assert game.undo_stack == [] and game.players[0].undo_stack == []
+
+    # forward again without allocating more than the stack entries
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for action in moves:
+        game.make_move(*action)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    assert snapshot(game) == final
+    assert game.moves == []
+    allocated = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    assert allocated <= len(moves) + 10
+
+
+@pytest.mark.parametrize(
+    "kind, card, pile, color",
+    [
+        ("play", Card("Red", 2), "deck", None),
+        ("discard", Card("Red", 3), "discard", "Red"),
+        ("discard", Card("Red", 3), "discard", None),
+        ("play", Card("Red", 3), "discard", "Blue"),
+        ("play", Card("Red", 3), "discard", "Purple"),
+        ("dummy", Card("Red", 3), "deck", None),
+        ("discard", Card("Red", 3), "desk", None),
+        ("discard", Card("Red", 3), None, None),
+    ],
+)
+def test_make_move_error(game_setup, kind, card, pile, color):
+    game_setup.players[0].hand = [Card("Red", 3)]
+    game_setup.players[0].board["Red"] = [Card("Red", 4)]
+    game_setup.discard_piles.push(Card("Red", 8))
+    with pytest.raises(ValueError):
+        game_setup.make_move(kind, card, pile, color)
+
+    game_setup.deck = []
+    with pytest.raises(ValueError):
+        game_setup.make_move("discard", Card("Red", 3), "deck")
+
+
+def test_computer_decision(game_setup):
+    with pytest.raises(TypeError):
+        game_setup.computer_decision()
+
+    game = LostCitiesGame("Player1", "Computer", vs_computer=True, rng=0)
+    game.setup()
+    game.current_player = 1
+    computer = game.players[1]
+    hand = list(computer.hand)
+    deck_top = game.deck[-1]
+    discard_tops = {color: game.discard_piles.top(color) for color in game.colors}
+
+    action, card = game.computer_decision()
+    assert computer.hand == hand
+    assert (action, card) == computer.choose_action()
+
+    game.apply_computer_decision(action, card)
+    assert game.current_player == 0
+    assert len(computer.hand) == 8
+    _, _, pile, color = game.moves[-1]
+    drawn = deck_top if pile == "deck" else discard_tops[color]
+    assert Counter(computer.hand) == Counter(hand) - Counter([card]) + Counter([drawn])
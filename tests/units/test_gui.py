@@ -1,4 +1,13 @@
+import os
+import time
+
+import pygame
+import pytest
+
+from lost_cities.card import Card
 from lost_cities.gui.gui import GUIGame
+from lost_cities.gui.settings import settings
+from lost_cities.mcts import MCTSComputerPlayer
 
 # TODO: real tests not only launch test
 
@@ -14,9 +23,239 @@ def test_init(gui_game):
     assert gui_game.last_action is None
     assert gui_game.running
     assert gui_game.rect_selected is None
-    assert gui_game.selected_card is None
+    assert gui_game.selected_index is None
     assert gui_game.game
 
 
 def test_process_without_event(gui_game):
     gui_game.can_i_play(nb_testing=5)
+
+
+def test_invalid_render_mode():
+    with pytest.raises(ValueError):
+        GUIGame(render_mode="partial")
+
+
+def test_dirty_rendering(gui_game):
+    gui_game.game.setup()
+    assert gui_game.render() is False
+    assert gui_game.frames_skipped == 1
+
+    gui_game.mark_dirty("screen")
+    gui_game.mark_dirty("hand")
+    assert gui_game.dirty_rects == [gui_game.screen.get_rect()]
+    assert gui_game.render() is True
+    assert gui_game.dirty_rects == []
+
+    x, y = gui_game.hand_positions[1]
+    click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(x + 1, y + 1))
+    gui_game.choose_card(click)
+    assert gui_game.selected_index == 1
+    assert gui_game.dirty_rects == [gui_game.regions["hand"]]
+
+    gui_game.gui_action(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=settings.discard_play_position))
+    assert gui_game.dirty_rects == [gui_game.regions["hand"], gui_game.regions["hand"], gui_game.regions["discard"]]
+    assert gui_game.render() is True
+    assert gui_game.screen.get_clip() == gui_game.screen.get_rect()
+
+    gui_game.pick_card_on_pile(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=settings.deck_position))
+    assert gui_game.dirty_rects == [gui_game.regions["hand"], gui_game.regions["deck"]]
+    assert len(gui_game.game.players[0].hand) == 8
+
+
+def test_pick_discard_pile(gui_game):
+    game = gui_game.game
+    game.setup()
+    game.players[0].hand = [Card("Blue", 4)] + list(game.players[0].hand[1:])
+    game.discard_piles.push(Card("Red", 7))
+    game.discard_piles.push(Card("Blue", 9))
+
+    x, y = gui_game.hand_positions[0]
+    gui_game.choose_card(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(x + 1, y + 1)))
+    gui_game.gui_action(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=settings.discard_play_position))
+    assert game.discard_piles.top("Blue") == Card("Blue", 4)
+
+    # the card just discarded can not be picked back
+    gui_game.pick_card_on_pile(
+        pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=settings.discard_positions["Blue"])
+    )
+    assert len(game.players[0].hand) == 7
+
+    gui_game.dirty_rects = []
+    gui_game.pick_card_on_pile(
+        pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=settings.discard_positions["Red"])
+    )
+    assert Card("Red", 7) in game.players[0].hand
+    assert game.discard_piles.top("Red") is None
+    assert game.current_player == 1
+    assert gui_game.dirty_rects == [gui_game.regions["hand"], gui_game.regions["discard"]]
+    assert gui_game.render() is True
+
+
+def test_dirty_rendering_end_of_game(gui_game):
+    gui_game.game.setup()
+    gui_game.game.deck = []
+    assert gui_game.render() is True
+    assert gui_game.end is True
+    assert gui_game.render() is False
+
+
+def test_full_rendering(gui_game):
+    gui_game.render_mode = "full"
+    gui_game.game.setup()
+    assert gui_game.render() is True
+    assert gui_game.render() is True
+    assert gui_game.frames_drawn == 2
+
+
+def test_text_cache(gui_game):
+    gui_game.text_cache_size = 2
+    hand = gui_game.render_text("Hand:", settings.WHITE)
+    assert gui_game.render_text("Hand:", settings.WHITE) is hand
+    assert gui_game.render_text("Hand:", settings.RED) is not hand
+
+    gui_game.render_text("Hand:", settings.WHITE)
+    gui_game.render_text("20", settings.WHITE)
+    assert list(gui_game.text_cache) == [("Hand:", settings.WHITE), ("20", settings.WHITE)]
+
+
+def test_layout(gui_game):
+    gui_game.game.setup()
+    gui_game.show_hand()
+    assert [rect.topleft for rect in gui_game.hand_rects] == gui_game.hand_positions
+    assert gui_game.board_positions["computer"]["Red"][1][1] == settings.pile_positions["computer"]["Red"][1] - 20
+
+
+def test_final_scores_computed_once(gui_game, monkeypatch):
+    gui_game.game.setup()
+    gui_game.game.deck = []
+    calls = []
+    player = gui_game.game.players[0]
+    monkeypatch.setattr(player, "compute_score", lambda: calls.append(1) or (0, {}))
+
+    gui_game.stop_game()
+    gui_game.stop_game()
+    assert len(calls) == 1
+    assert gui_game.final_scores["Player1"] == (0, {})
+
+    gui_game.do_i_need_to_restart(None)
+    assert gui_game.final_scores is None
+    assert gui_game.end is False
+
+
+def test_headless(gui_game):
+    assert gui_game.headless
+    assert gui_game.screen is not pygame.display.get_surface()
+    gui_game.can_i_play(nb_testing=0)
+    assert gui_game.frames_drawn == 1
+
+
+def test_windowed():
+    game = GUIGame(render_mode="full")
+    try:
+        assert game.screen is pygame.display.get_surface()
+        game.game.setup()
+        game.render()
+        game.present([game.regions["hand"]])
+    finally:
+        pygame.quit()
+
+
+@pytest.mark.parametrize("video_driver", [None, "x11"])
+def test_headless_video_driver(monkeypatch, video_driver):
+    pygame.quit()
+    if video_driver is None:
+        monkeypatch.delenv("SDL_VIDEODRIVER", raising=False)
+    else:
+        monkeypatch.setenv("SDL_VIDEODRIVER", video_driver)
+    game = GUIGame(headless=True)
+    try:
+        assert pygame.display.get_driver() == "dummy"
+        assert os.environ.get("SDL_VIDEODRIVER") == video_driver
+
+        # a window opened later does not keep the dummy driver of the headless game
+        monkeypatch.setattr(pygame.display, "set_mode", lambda size: pygame.Surface(size))
+        GUIGame(render_mode="full").executor.shutdown()
+        assert not pygame.display.get_init() or pygame.display.get_driver() != "dummy"
+    finally:
+        game.executor.shutdown()
+        pygame.quit()
+
+
+def wait_for_computer(gui_game, timeout=5):
+    deadline = time.perf_counter() + timeout
+    while gui_game.game.current_player == 1 and time.perf_counter() < deadline:
+        gui_game.trigger_event()
+        time.sleep(0.001)
+
+
+def test_computer_turn_on_worker(gui_game):
+    gui_game.game.setup()
+    gui_game.game.current_player = 1
+    gui_game.trigger_event()
+    assert gui_game.thinking is not None
+
+    wait_for_computer(gui_game)
+    assert gui_game.game.current_player == 0
+    assert gui_game.thinking is None
+    assert len(gui_game.game.players[1].hand) == 8
+    assert gui_game.dirty_rects
+
+
+def test_slow_computer_does_not_block_frames(gui_game, monkeypatch):
+    gui_game.game.setup()
+    decision = gui_game.game.computer_decision
+
+    def slow_decision():
+        time.sleep(0.2)
+        return decision()
+
+    monkeypatch.setattr(gui_game.game, "computer_decision", slow_decision)
+    gui_game.game.current_player = 1
+    gui_game.mark_dirty("screen")
+
+    start = time.perf_counter()
+    gui_game.trigger_event()
+    gui_game.render()
+    assert time.perf_counter() - start < 0.1
+    assert gui_game.game.current_player == 1
+
+    # clicks are ignored while the computer thinks
+    gui_game.choose_card(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(10, 60)))
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=settings.discard_play_position))
+    gui_game.trigger_event()
+    assert len(gui_game.game.players[0].hand) == 8
+
+    wait_for_computer(gui_game)
+    assert gui_game.game.current_player == 0
+
+
+def test_stale_computer_decision(gui_game):
+    gui_game.game.setup()
+    gui_game.game.current_player = 1
+    gui_game.start_computer_turn()
+    game = gui_game.game
+    gui_game.thinking.result()
+
+    gui_game.end = True
+    gui_game.do_i_need_to_restart(None)
+    gui_game.trigger_event()
+    assert gui_game.game is game
+    assert game.current_player == 0
+    assert len(game.deck) == 44
+    assert [len(player.hand) for player in game.players] == [8, 8]
+
+
+def test_strategy_and_think_time():
+    with pytest.raises(ValueError):
+        GUIGame(headless=True, strategy="unknown")
+
+    gui = GUIGame(headless=True, strategy="mcts", think_time=0.05)
+    try:
+        computer = gui.game.players[1]
+        assert isinstance(computer, MCTSComputerPlayer)
+        assert computer.time_budget == 0.05
+        assert gui.new_game().players[1] is not computer
+    finally:
+        gui.executor.shutdown()
+        pygame.quit()
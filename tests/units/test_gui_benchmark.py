@@ -0,0 +1,21 @@
+from lost_cities.gui import benchmark
+
+
+def test_run_benchmark():
+    report = benchmark.run_benchmark(nb_games=1, seed=3, end_frames=2)
+
+    assert set(report) == {*benchmark.STAGES, "frame"}
+    frames = report["frame"]["samples"]
+    assert frames > 20
+    assert all(stats["samples"] == frames for stats in report.values())
+    assert all(0 <= stats["median_ms"] <= stats["p95_ms"] <= stats["max_ms"] for stats in report.values())
+
+
+def test_main(capsys, monkeypatch):
+    monkeypatch.setattr(
+        benchmark,
+        "run_benchmark",
+        lambda games, seed: {"frame": {"samples": 1, "mean_ms": 1.0, "median_ms": 1.0, "p95_ms": 1.0, "max_ms": 1.0}},
+    )
+    benchmark.main(["-n", "1"])
+    assert "frame" in capsys.readouterr().out
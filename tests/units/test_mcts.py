@@ -0,0 +1,138 @@
+import random
+import time
+
+import pytest
+
+from lost_cities.card import Card
+from lost_cities.engine import apply, is_over, legal_actions, new_state
+from lost_cities.game import LostCitiesGame
+from lost_cities.mcts import InformationSet, MCTSComputerPlayer, playout, playout_action, search
+from lost_cities.player import ComputerPlayer
+
+
+@pytest.fixture
+def mcts_game():
+    random.seed(4)
+    game = LostCitiesGame("MCTS", "Computer")
+    game.players[0] = MCTSComputerPlayer("MCTS", iterations=40, seed=0)
+    game.setup()
+    return game
+
+
+def test_information_set(mcts_game):
+    mcts_game.play_round()
+    mcts_game.play_round()
+    info = InformationSet.from_game(mcts_game, 0)
+    unseen = info.unseen_cards()
+
+    assert info.deck_size == len(mcts_game.deck)
+    assert sorted(unseen) == sorted(mcts_game.deck + mcts_game.players[1].hand)
+
+    state = info.determinize(random.Random(0), unseen)
+    assert state.hands[0] == info.hand
+    assert len(state.hands[1]) == 8
+    assert len(state.deck) == len(mcts_game.deck)
+
+
+def test_playout_action_is_legal():
+    rng = random.Random(0)
+    for _ in range(5):
+        state = new_state(rng=rng)
+        while not is_over(state):
+            action = playout_action(state, rng, epsilon=0.0)
+            state = apply(state, action)
+    assert is_over(playout(new_state(rng=rng), rng))
+
+
+@pytest.mark.parametrize(
+    "hand, board, expected",
+    [
+        ([Card("Red", 0), Card("Red", 4), Card("Red", 5), Card("Red", 6)], [], ("play", Card("Red", 0))),
+        ([Card("Red", 3), Card("Blue", 7)], [("Blue", 6)], ("play", Card("Blue", 7))),
+        ([Card("Blue", 2), Card("Blue", 3), Card("Blue", 4)], [("Blue", 6)], ("discard", Card("Blue", 2))),
+        ([Card("Blue", 4), Card("Red", 9), Card("Red", 6)], [("Blue", 2)], ("play", Card("Blue", 4))),
+        ([Card("Blue", 2)], [("Blue", 6)], ("discard", Card("Blue", 2))),
+    ],
+)
+def test_playout_action_rules(hand, board, expected):
+    state = new_state()
+    expeditions = [()] * 5
+    for color, value in board:
+        expeditions[Card(color, value).color_id] = (Card(color, value),)
+    state = state._replace(hands=(tuple(sorted(hand)), state.hands[1]), boards=(tuple(expeditions), state.boards[1]))
+
+    action = playout_action(state, random.Random(0), epsilon=0.0)
+    assert (action.kind, action.card) == expected
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_playout_action_follows_computer_player(seed):
+    rng = random.Random(seed)
+    state = new_state(rng=rng)
+    while not is_over(state):
+        player = ComputerPlayer("Computer")
+        player.hand = list(state.hands[state.current_player])
+        for color, expedition in zip(state.colors, state.boards[state.current_player]):
+            player.board[color] = list(expedition)
+        tops = [pile[-1] if pile else None for pile in state.discard_piles]
+
+        # the pile is chosen once the card left the hand, as in LostCitiesGame.apply_computer_decision
+        kind, card = player.choose_action()
+        if kind == "play":
+            player.play_card(card)
+        else:
+            player.hand.remove(card)
+            tops[card.color_id] = card
+        pile, color = player.choose_pile(tops, card if kind == "discard" else None)
+
+        action = playout_action(state, rng, epsilon=0.0)
+        assert action == (kind, card, pile, color)
+        state = apply(state, action)
+
+
+def test_search(mcts_game):
+    info = InformationSet.from_game(mcts_game, 0)
+    stats = search(info, 100, None, seed=1)
+
+    assert set(stats) == set(legal_actions(info.determinize(random.Random(0))))
+    assert len({visits for visits, _ in stats.values()}) == 1
+    assert stats == search(info, 100, None, seed=1)
+
+    start = time.perf_counter()
+    search(info, 10**6, 0.05, seed=1)
+    assert time.perf_counter() - start < 1
+
+
+def test_mcts_full_game(mcts_game):
+    while mcts_game.deck:
+        mcts_game.play_round()
+
+    player = mcts_game.players[0]
+    assert player.playouts_per_second > 0
+    assert player.last_playouts > 0
+    assert len(player.solver.table) > 0
+    assert len(player.hand) == 8
+    assert "MCTS computer named MCTS" in str(player)
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_mcts_workers(mcts_game, use_processes):
+    player = MCTSComputerPlayer("MCTS", iterations=60, workers=2, use_processes=use_processes, seed=0)
+    player.hand = mcts_game.players[0].hand
+    mcts_game.players[0] = player
+
+    mcts_game.play_round()
+    mcts_game.play_round()
+    player.close()
+    player.close()
+
+    assert len(player.hand) == 8
+    assert player.last_playouts >= 2
+
+
+def test_mcts_without_observation(computer_player):
+    player = MCTSComputerPlayer("MCTS")
+    player.hand = computer_player.hand
+
+    assert player.choose_action() == ComputerPlayer.choose_action(player)
+    assert player.choose_pile([None] * 5) == ("deck", None)
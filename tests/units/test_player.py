@@ -1,7 +1,12 @@
+import pickle
+import random
+from typing import Any, Optional
+
 import pytest
 
-from lost_cities.card import Card
-from lost_cities.player import Player
+from lost_cities.card import COLORS, Card
+from lost_cities.game import LostCitiesGame
+from lost_cities.player import Board, ComputerPlayer, Expedition, Hand, Player
 
 
 @pytest.mark.parametrize("version", ["dummy", 7, 1, 4])
@@ -79,6 +84,48 @@ def test_compute_score(test_player):
     assert detail["Red"] == 52
 
 
+def test_expedition_counters():
+    expedition = Expedition([Card("Red", 0), Card("Red", 4)])
+    assert (expedition.total, expedition.wagers, expedition.score) == (4, 1, -32)
+
+    expedition += [Card("Red", 6)]
+    assert expedition.score_with(Card("Red", 9)) == 2 * (19 - 20)
+    assert expedition.pop() == Card("Red", 6)
+
+    expedition.insert(0, Card("Red", 0))
+    assert (expedition.total, expedition.wagers) == (4, 2)
+    expedition[1] = Card("Red", 3)
+    del expedition[0]
+    assert (expedition.total, expedition.wagers) == (7, 0)
+    expedition.remove(Card("Red", 3))
+    expedition.clear()
+    assert (expedition.total, expedition.wagers, expedition.score) == (0, 0, 0)
+
+
+def test_board_conversion(test_player):
+    test_player.board["Red"] = [Card("Red", 4)]
+    test_player.board.update({"Blue": [Card("Blue", 5)]})
+    test_player.board = {"Green": [Card("Green", 6)]}
+    assert isinstance(test_player.board, Board)
+    assert isinstance(test_player.board["Green"], Expedition)
+
+    copied = pickle.loads(pickle.dumps(test_player.board))
+    assert copied == test_player.board
+    assert copied["Green"].total == 6
+
+
+def test_score_delta(test_player):
+    test_player.hand = [Card("Yellow", 0), Card("Yellow", 5)]
+    assert test_player.score_delta(Card("Yellow", 0)) == -40
+
+    test_player.play_card(Card("Yellow", 0))
+    assert test_player.compute_score()[0] == -40
+    assert test_player.score_delta(Card("Yellow", 5)) == 10
+
+    assert test_player.board["Yellow"].pop() == Card("Yellow", 0)
+    assert test_player.compute_score()[0] == 0
+
+
 def test_reorder_hand(test_player):
     test_player.hand = [Card("Yellow", 7), Card("Yellow", 0), Card("Blue", 4), Card("Blue", 2), Card("Red", 10)]
 
@@ -153,18 +200,22 @@ def test_choose_action_low_importance(computer_player, board, expected_action):
 
 
 @pytest.mark.parametrize(
-    "discard_card, last_action, expected_choice",
+    "discard_cards, discarded, expected_choice",
     [
-        (None, "discard", "deck"),
-        (Card("Green", 0), "play", "discard"),
-        (Card("Green", 0), "discard", "deck"),
-        (Card("Red", 7), "play", "discard"),
-        (Card("Red", 2), "play", "deck"),
-        (Card("Blue", 9), "play", "discard"),
-        (Card("Blue", 4), "play", "deck"),
+        ([], None, ("deck", None)),
+        ([Card("Green", 0)], None, ("discard", "Green")),
+        ([Card("Green", 0)], Card("Green", 4), ("deck", None)),
+        ([Card("Green", 0)], Card("Red", 4), ("discard", "Green")),
+        ([Card("Red", 7)], None, ("discard", "Red")),
+        ([Card("Red", 2)], None, ("deck", None)),
+        ([Card("Blue", 9)], None, ("discard", "Blue")),
+        ([Card("Blue", 4)], None, ("deck", None)),
+        ([Card("Red", 2), Card("Blue", 4), Card("White", 6)], None, ("discard", "White")),
+        ([Card("Blue", 9), Card("Red", 7)], None, ("discard", "Blue")),
+        ([Card("Blue", 9), Card("Red", 7)], Card("Blue", 9), ("discard", "Red")),
     ],
 )
-def test_player_choose_pile(computer_player, discard_card, last_action, expected_choice):
+def test_player_choose_pile(computer_player, discard_cards, discarded, expected_choice):
     computer_player.hand = [
         Card("Yellow", 0),
         Card("Yellow", 2),
@@ -181,5 +232,209 @@ def test_player_choose_pile(computer_player, discard_card, last_action, expected
         "Green": [],
         "White": [],
     }
-    result = computer_player.choose_pile(discard_card, last_action)
+    tops = [None] * 5
+    for card in discard_cards:
+        tops[card.color_id] = card
+    result = computer_player.choose_pile(tops, discarded)
     assert result == expected_choice
+
+
+def check_groups(hand):
+    for color in COLORS:
+        cards = sorted(card for card in hand if card.color == color)
+        assert hand.groups.get(color, []) == cards
+        assert hand.values.get(color, []) == [card.value for card in cards]
+        assert hand.totals.get(color, 0) == sum(card.value for card in cards)
+
+
+def test_hand_groups():
+    hand = Hand([Card("Red", 5), Card("Blue", 0), Card("Red", 0), Card("Red", 9)])
+    check_groups(hand)
+    assert hand.first_at_least("Red", 1) == Card("Red", 5)
+    assert hand.first_at_least("Red", 10) is None and hand.first_at_least("Green", 0) is None
+    assert hand.count_below("Red", 9) == 2 and hand.count_below("Green", 9) == 0
+    assert hand.has("Red", 9) and not hand.has("Red", 8) and not hand.has("Green", 2)
+    assert hand.count_color("Red") == 3
+
+    hand.append(Card("Red", 5))
+    hand.insert(0, Card("Green", 4))
+    hand += [Card("Blue", 3)]
+    hand.remove(Card("Red", 5))
+    hand.pop(0)
+    check_groups(hand)
+    hand.sort()
+    check_groups(hand)
+    hand[0] = Card("White", 7)
+    check_groups(hand)
+    del hand[1:3]
+    check_groups(hand)
+    assert pickle.loads(pickle.dumps(hand)) == hand
+    hand.clear()
+    check_groups(hand)
+
+
+def test_hand_membership():
+    hand = Hand([Card("Red", 5), Card("Blue", 0), Card("Blue", 0)])
+    assert Card("Red", 5) in hand and Card("Red", 6) not in hand and "5:Red" not in hand
+    assert hand.count(Card("Blue", 0)) == 2 and hand.count("0:Blue") == 0
+    assert hand.index(Card("Blue", 0)) == 1 and hand.index(Card("Blue", 0), 2) == 2
+    with pytest.raises(ValueError):
+        hand.index(Card("Red", 6))
+    with pytest.raises(ValueError):
+        hand.remove(Card("Red", 6))
+
+    hand.remove(Card("Blue", 0))
+    hand.reverse()
+    assert hand.ids == [Card("Blue", 0).card_id, Card("Red", 5).card_id]
+    hand.sort()
+    assert hand.ids == [card.card_id for card in hand] and hand.index(Card("Red", 5)) == 1
+    del hand[0]
+    assert Card("Blue", 0) not in hand and hand.ids == [Card("Red", 5).card_id]
+
+
+def test_hand_remove_id():
+    hand = Hand([Card("Blue", 0), Card("Blue", 0), Card("Red", 5)])
+    red = hand[2]
+    assert hand.remove_id(red.card_id) is red
+    assert hand.remove_id(Card("Blue", 0).card_id) == Card("Blue", 0)
+    assert hand.ids == [Card("Blue", 0).card_id] and hand.count_color("Blue") == 1
+    for card_id in (red.card_id, -1, 99):
+        with pytest.raises(ValueError):
+            hand.remove_id(card_id)
+
+
+def test_hand_keeps_object():
+    wagers = [Card("Red", 0) for _ in range(3)]
+    hand = Hand(wagers)
+    hand.pop(1)
+    assert [id(card) for card in hand.groups["Red"]] == [id(wagers[0]), id(wagers[2])]
+
+
+def test_player_hand_setter(test_player):
+    test_player.hand = [Card("Red", 4)]
+    assert isinstance(test_player.hand, Hand)
+    assert test_player.hand.groups == {"Red": [Card("Red", 4)]}
+
+
+class LegacyComputerPlayer(ComputerPlayer):
+    """Rules of the computer before the hand was grouped by color"""
+
+    def choose_action(self) -> tuple[str, Card]:
+        # High importance rules
+        for color in self.board:
+            # Check if the player should start an expedition with a 0
+            colored_hand: list[Card] = [card for card in self.hand if card.color == color]
+            if (
+                not self.board[color]
+                and any(card.value == 0 for card in colored_hand)
+                and (len(colored_hand) >= 4 or sum(card.value for card in colored_hand) >= 10)
+            ):
+                return ("play", Card(color, 0))
+
+            # Play close card
+            if self.board[color]:
+                last_card_value: int = self.board[color][-1].value if len(self.board[color]) > 0 else 0
+                closest_card: list[bool] = [card.value == last_card_value + 1 for card in colored_hand]
+                close_card: list[bool] = [card.value == last_card_value + 2 for card in colored_hand]
+                if any(closest_card):
+                    return ("play", Card(color, last_card_value + 1))
+                elif any(close_card):
+                    return ("play", Card(color, last_card_value + 2))
+
+        # Medium importance rules
+        for color in self.board:
+            # Discard if many card not playable
+            colored_hand = [card for card in self.hand if card.color == color]
+            last_value: int = self.board[color][-1].value if len(self.board[color]) > 0 else 0
+            not_playable: list[Card] = [card for card in colored_hand if card.value < last_value]
+            if len(not_playable) >= 3:
+                return ("discard", not_playable[0])
+
+        # Low importance
+        best_move: dict[str, Any] = dict()
+        for color in self.board:
+            # play the closest
+            colored_hand = [card for card in self.hand if card.color == color]
+            last_value = self.board[color][-1].value if len(self.board[color]) > 0 else 0
+            playable: list[Card] = [card for card in colored_hand if card.value >= last_value]
+            potential_diff: int = playable[0].value - last_value if len(playable) > 0 else 99
+            if playable and (best_move.get("card") is None or best_move.get("diff", 100) > potential_diff):
+                best_move = dict(card=playable[0], diff=potential_diff)
+        if best_move:
+            return ("play", best_move["card"])
+        else:
+            return ("discard", self.hand[0])
+
+
+def legacy_choose_pile(player, discard_card: Optional[Card], last_action: str) -> str:
+    """Rules of the computer to choose a pile when there was a single discard pile
+
+    Args:
+        player (ComputerPlayer): computer choosing
+        discard_card (Optional[Card]): last discarded card
+
+    Returns:
+        str: "deck" or "discard" choice
+    """
+    if discard_card is None or last_action == "discard":
+        return "deck"
+
+    board_color: list[Card] = player.board[discard_card.color]
+    hand_color_cards: list[Card] = [card for card in player.hand if card.color == discard_card.color]
+
+    if discard_card.value == 0 and not board_color and len(hand_color_cards) >= 2:
+        return "discard"
+
+    if not board_color and discard_card.value >= 4:
+        return "discard"
+
+    if board_color and discard_card.value > board_color[-1].value:
+        return "discard"
+
+    return "deck"
+
+
+def random_player(rng, cls):
+    player = cls("Computer")
+    deck = [Card(color, value) for color in player.board for value in [*range(2, 11), 0, 0, 0]]
+    rng.shuffle(deck)
+    for color in player.board:
+        expedition = sorted(rng.sample([card for card in deck if card.color == color], rng.choice([0, 0, 1, 2, 4])))
+        for card in expedition:
+            deck.remove(card)
+        player.board[color] = expedition
+    player.hand = sorted(deck[:8])
+    return player, deck[8]
+
+
+def test_choose_action_matches_legacy():
+    rng = random.Random(0)
+    for _ in range(1000):
+        state = rng.getstate()
+        player, discarded = random_player(rng, ComputerPlayer)
+        rng.setstate(state)
+        legacy, _ = random_player(rng, LegacyComputerPlayer)
+
+        assert player.choose_action() == legacy.choose_action()
+        tops = [None] * len(player.board)
+        tops[discarded.color_id] = discarded
+        assert player.choose_pile(tops) == (
+            ("discard", discarded.color)
+            if legacy_choose_pile(legacy, discarded, "play") == "discard"
+            else ("deck", None)
+        )
+        assert player.choose_pile(tops, discarded) == ("deck", None)
+
+
+@pytest.mark.parametrize("version", [5, 6])
+def test_games_match_legacy(version):
+    for seed in range(10):
+        games = []
+        for cls in (ComputerPlayer, LegacyComputerPlayer):
+            game = LostCitiesGame("Computer1", "Computer2", version=version, rng=seed)
+            game.players = [cls("Computer1", version), cls("Computer2", version)]
+            game.setup()
+            while game.deck:
+                game.play_round()
+            games.append(game)
+        assert games[0].moves == games[1].moves
@@ -0,0 +1,87 @@
+import pstats
+
+from lost_cities.game import LostCitiesGame
+from lost_cities.mcts import MCTSComputerPlayer
+from lost_cities.player import ComputerPlayer, Player
+from lost_cities.profiling import PROBE_FILE, Profiler
+from lost_cities.tournament import STRATEGIES, format_results, game_seed, play_game, register_strategy, run_tournament
+
+
+def test_disabled_profiler_leaves_methods():
+    originals = (LostCitiesGame.setup, ComputerPlayer.choose_action, MCTSComputerPlayer.choose_pile)
+    profiler = Profiler()
+    with profiler.probe("nothing"):
+        pass
+
+    with profiler:
+        assert LostCitiesGame.setup is not originals[0]
+        assert MCTSComputerPlayer.choose_pile is not originals[2]
+    assert (LostCitiesGame.setup, ComputerPlayer.choose_action, MCTSComputerPlayer.choose_pile) == originals
+    assert profiler.entries == {}
+
+
+def test_profile_game():
+    profiler = Profiler()
+    with profiler:
+        game = play_game(("computer", "computer"), 5, game_seed(0, 0))
+        game.players[0].compute_score()
+    stats = profiler.stats()
+
+    turns = len(game.moves)
+    assert stats["LostCitiesGame.setup"]["calls"] == 1
+    assert stats["ComputerPlayer.choose_action"]["calls"] == turns
+    assert stats["ComputerPlayer.choose_pile"]["calls"] == turns
+    assert stats["LostCitiesGame.pick_card"]["calls"] == turns
+    assert stats["Player.play_card"]["calls"] == sum(kind == "play" for kind, *_ in game.moves)
+    assert stats["Player.compute_score"]["calls"] >= 1
+    assert all(stat["seconds"] >= stat["own_seconds"] >= 0 for stat in stats.values())
+    assert list(stats.values())[0]["seconds"] == max(stat["seconds"] for stat in stats.values())
+
+
+def test_custom_probes(tmp_path):
+    profiler = Profiler(targets=[])
+    profiler.register(Player, "compute_score")
+    with profiler:
+        profiler.register(Player, "score_delta")
+        player = Player("Player")
+        with profiler.probe("scoring"):
+            player.compute_score()
+            with profiler.probe("scoring"):
+                player.compute_score()
+    stats = profiler.stats()
+
+    assert stats["Player.compute_score"]["calls"] == 2
+    assert stats["scoring"]["calls"] == 2
+    # the nested probe is included once in the cumulative time and removed from the own time
+    entry = profiler.entries[(PROBE_FILE, 0, "scoring")]
+    assert entry[1] == 1
+    assert entry[2] <= entry[3]
+
+    path = tmp_path / "probes.prof"
+    profiler.dump_stats(path)
+    loaded = pstats.Stats(str(path))
+    assert loaded.total_calls == 4
+    assert {name for _, _, name in loaded.stats} == {"Player.compute_score", "scoring"}
+
+    profiler.reset()
+    assert profiler.stats() == {}
+
+
+def test_tournament_profile(tmp_path):
+    @register_strategy("discarder")
+    class DiscardComputerPlayer(ComputerPlayer):
+        def choose_action(self):
+            return ("discard", self.hand[0])
+
+    path = tmp_path / "tournament.prof"
+    try:
+        sequential = run_tournament(("computer", "discarder"), nb_games=2, seed=1, profile=str(path))
+    finally:
+        del STRATEGIES["discarder"]
+    parallel = run_tournament(("computer", "computer"), nb_games=4, workers=2, seed=1, profile=str(path))
+
+    assert sequential["profile"]["test_tournament_profile.<locals>.DiscardComputerPlayer.choose_action"]["calls"] > 0
+    assert parallel["profile"]["LostCitiesGame.setup"]["calls"] == 4
+    assert pstats.Stats(str(path)).total_calls == sum(stat["calls"] for stat in parallel["profile"].values())
+    assert "LostCitiesGame.setup: 4 calls" in format_results(parallel)
+    assert "profile" not in run_tournament(("computer", "computer"), nb_games=1)
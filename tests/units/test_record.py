@@ -0,0 +1,165 @@
+import random
+
+import pytest
+
+from lost_cities.card import COLORS, Card
+from lost_cities.engine import Action, GameState, apply, scores
+from lost_cities.game import LostCitiesGame
+from lost_cities.record import (
+    FILE_HEADER,
+    FORMAT_VERSION,
+    GAME_HEADER,
+    MAGIC,
+    GameRecord,
+    RecordReader,
+    RecordWriter,
+    card_code,
+    code_card,
+    code_move,
+    move_code,
+    replay,
+)
+from lost_cities.tournament import STRATEGIES, game_seed, play_game, run_tournament
+
+
+def replay_state(record):
+    """Deal the recorded deck as LostCitiesGame.setup does and apply the moves with the engine"""
+    deck = list(record.deck)
+    hands = ([], [])
+    for _ in range(8):
+        for hand in hands:
+            hand.append(deck.pop())
+    empty = ((),) * record.nb_colors
+    state = GameState(tuple(deck), tuple(tuple(sorted(hand)) for hand in hands), (empty, empty), empty)
+    for move in record.moves:
+        state = apply(state, move)
+    return state
+
+
+def test_codes():
+    cards = [Card(color, value) for color in COLORS for value in [0, *range(2, 11)]]
+    assert sorted(card_code(card) for card in cards) == list(range(60))
+    assert all(code_card(card_code(card)) == card for card in cards)
+
+    move = Action("discard", Card("Purple", 10), "deck")
+    assert code_move(move_code(move)) == move
+    for color in COLORS:
+        move = Action("play", Card("Yellow", 0), "discard", color)
+        assert code_move(move_code(move)) == move
+    assert len({move_code(Action("discard", Card("Red", 5), "discard", color)) for color in COLORS}) == 6
+
+
+@pytest.mark.parametrize("version", [5, 6])
+def test_record_game(version):
+    game = play_game(("computer", "computer"), version, game_seed(0, version))
+    record = GameRecord.from_game(game)
+    encoded = record.encode()
+
+    assert len(encoded) == 3 + 9 * version + (10 * len(record.moves) + 7) // 8
+    assert len(record.deck) == 12 * version
+    decoded, end = GameRecord.decode(encoded)
+    assert decoded == record
+    assert end == len(encoded)
+
+    state = replay_state(decoded)
+    assert not state.deck
+    assert scores(state) == (game.players[0].compute_score()[0], game.players[1].compute_score()[0])
+
+    with pytest.raises(ValueError):
+        GameRecord.decode(encoded[:-1])
+
+
+def test_record_mixed_moves():
+    random.seed(2)
+    game = LostCitiesGame("Player", "Computer")
+    game.setup()
+    game.players[1].reorder_hand()
+    game.play_move("discard", game.players[0].hand[0], "deck")
+    game.play_move("discard", game.players[1].hand[0], "deck")
+    game.play_move("play", game.players[0].hand[-1], "discard", game.moves[1][1].color)
+    # a searched turn is not recorded
+    game.make_move("discard", game.players[1].hand[0], "deck")
+    assert len(game.moves) == 3
+    game.unmake_move()
+    game.play_round()
+    game.play_round("discard", "0", skip_card=True)
+    game.pick_card("deck")
+    game.switch_player()
+
+    assert len(game.moves) == 5
+    assert game.moves[2][2:] == ("discard", game.moves[1][1].color)
+    assert len(replay_state(GameRecord.from_game(game)).deck) == len(game.deck)
+
+
+def test_writer_and_reader(tmp_path):
+    path = tmp_path / "games.lcr"
+    games = [play_game(("computer", "computer"), 5, game_seed(2, i)) for i in range(3)]
+    with RecordWriter(path) as writer:
+        writer.write(games[0])
+        writer.write(GameRecord.from_game(games[1]))
+    with RecordWriter(path) as writer:
+        writer.write(GameRecord.from_game(games[2]).encode())
+        assert writer.games_written == 1
+
+    with RecordReader(path) as reader:
+        assert len(reader) == 3
+        assert list(reader) == [GameRecord.from_game(game) for game in games]
+
+
+def test_reader_errors(tmp_path):
+    path = tmp_path / "bad.lcr"
+    path.write_bytes(b"LC")
+    with pytest.raises(ValueError):
+        RecordReader(path)
+    path.write_bytes(FILE_HEADER.pack(b"ABCD", FORMAT_VERSION))
+    with pytest.raises(ValueError):
+        RecordReader(path)
+    path.write_bytes(FILE_HEADER.pack(MAGIC, 1))
+    with pytest.raises(ValueError):
+        RecordReader(path)
+
+
+@pytest.mark.parametrize("extra", [1, 2, GAME_HEADER.size + 1])
+def test_reader_truncated(tmp_path, extra):
+    path = tmp_path / "truncated.lcr"
+    encoded = GameRecord.from_game(play_game(("computer", "computer"), 5, game_seed(2, 0))).encode()
+    path.write_bytes(FILE_HEADER.pack(MAGIC, FORMAT_VERSION) + encoded + encoded[:extra])
+    with RecordReader(path) as reader:
+        with pytest.raises(ValueError):
+            len(reader)
+        games = iter(reader)
+        assert next(games) == GameRecord.decode(encoded)[0]
+        with pytest.raises(ValueError):
+            next(games)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_tournament_record(tmp_path, workers):
+    path = tmp_path / "tournament.lcr"
+    results = run_tournament(("computer", "computer"), nb_games=4, workers=workers, seed=1, record=str(path))
+
+    with RecordReader(path) as reader:
+        records = list(reader)
+    assert len(records) == results["games"] == 4
+    assert records[1] == GameRecord.from_game(play_game(("computer", "computer"), 5, game_seed(1, 0)))
+    assert "computer" in STRATEGIES
+
+
+@pytest.mark.parametrize("version", [5, 6])
+def test_replay(version):
+    game = play_game(("computer", "computer"), version, game_seed(3, version))
+    replayed = replay(GameRecord.decode(GameRecord.from_game(game).encode())[0], ("computer", "computer"))
+
+    assert replayed.deck == game.deck == []
+    assert replayed.discard_piles.piles == game.discard_piles.piles
+    assert replayed.moves == game.moves
+    for player, expected in zip(replayed.players, game.players):
+        assert player.hand == expected.hand
+        assert player.board == expected.board
+        assert player.compute_score() == expected.compute_score()
+
+
+def test_replay_illegal_move():
+    record = GameRecord.from_game(play_game(("computer", "computer"), 5, game_seed(3, 0)))
+    with pytest.raises(ValueError):
+        replay(record._replace(moves=record.moves[1:]))
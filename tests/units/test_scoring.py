@@ -0,0 +1,54 @@
+import random
+
+import numpy as np
+
+from lost_cities.card import COLORS, Card
+from lost_cities.game import LostCitiesGame
+from lost_cities.player import Player
+from lost_cities.scoring import EMPTY, MAX_EXPEDITION, board_array, score_boards, score_counters
+
+
+def random_expedition(rng):
+    cards = [Card("Red", 0)] * rng.randint(0, 3)
+    cards += sorted(rng.sample([Card("Red", value) for value in range(2, 11)], rng.randint(0, 9)))
+    return cards
+
+
+def test_score_boards_matches_player():
+    rng = random.Random(0)
+    expeditions = [random_expedition(rng) for _ in range(2000)]
+    boards = np.full((len(expeditions), 1, MAX_EXPEDITION), EMPTY, dtype=np.int16)
+    for index, expedition in enumerate(expeditions):
+        boards[index, 0, : len(expedition)] = [card.value for card in expedition]
+
+    total, detail = score_boards(boards)
+
+    expected = [Player.compute_one_score(expedition) for expedition in expeditions]
+    assert detail[:, 0].tolist() == expected == total.tolist()
+    assert any(len(expedition) >= 8 for expedition in expeditions)
+    assert min(expected) == -80 and max(expected) == 156
+
+
+def test_score_counters_shapes():
+    total, detail = score_counters(np.array([[0, 54], [7, 0]]), np.array([[0, 3], [0, 0]]), np.array([[0, 12], [2, 0]]))
+
+    assert detail.tolist() == [[0, 156], [-13, 0]]
+    assert total.tolist() == [156, -13]
+    assert score_counters(np.int16(10), np.int16(1), np.int16(3))[1] == -20
+
+
+def test_board_array_of_games():
+    games = []
+    for seed in range(20):
+        game = LostCitiesGame("Player1", "Computer", version=6, rng=seed)
+        game.players[0] = type(game.players[1])("Computer", 6)
+        game.setup()
+        while game.deck:
+            game.play_round()
+        games.append(game)
+    players = [player for game in games for player in game.players]
+
+    total, detail = score_boards(board_array([player.board for player in players], COLORS))
+
+    assert total.tolist() == [player.compute_score()[0] for player in players]
+    assert detail.tolist() == [list(player.compute_score()[1].values()) for player in players]
@@ -0,0 +1,178 @@
+import asyncio
+import json
+
+import pytest
+
+from lost_cities import loadgen
+from lost_cities.game import LostCitiesGame
+from lost_cities.server import GameServer, Table
+
+
+async def open_client(server):
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+
+    async def send(message):
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+
+    async def receive(event=None):
+        while True:
+            message = json.loads(await asyncio.wait_for(reader.readline(), 5))
+            if event is None or message["event"] == event:
+                return message
+
+    return send, receive, writer
+
+
+def test_protocol():
+    async def scenario():
+        server = GameServer(port=0, turn_timeout=None)
+        await server.start()
+        send, receive, writer = await open_client(server)
+
+        await send({"op": "oops"})
+        assert (await receive())["event"] == "error"
+        writer.write(b"not json\n")
+        assert (await receive())["event"] == "error"
+        await send({"op": "move", "table": 42})
+        assert "unknown table" in (await receive())["message"]
+
+        await send({"op": "new", "name": "Alice", "id": 1})
+        joined = await receive()
+        assert joined == {"event": "joined", "table": 1, "seat": 0}
+        state = await receive()
+        assert state["event"] == "state"
+        assert len(state["hand"]) == 8
+        assert state["turn"] == 0
+        assert state["discard"] == {}
+        assert (await receive()) == {"event": "ack", "id": 1, "table": 1}
+
+        await send({"op": "move", "table": 1, "kind": "play", "card": ["Purple", 5]})
+        assert (await receive())["event"] == "error"
+        await send({"op": "move", "table": 1, "kind": "play", "card": ["Pink", 3], "id": 7})
+        assert (await receive()) == {"event": "error", "message": "unknown card ['Pink', 3]", "id": 7}
+
+        move = loadgen.choose_move(state)
+        await send({**move, "pile": "desk", "id": 8})
+        assert (await receive()) == {"event": "error", "message": "desk is not a valid pile", "id": 8}
+        await send({**move, "pile": None, "id": 9})
+        assert (await receive()) == {"event": "error", "message": "None is not a valid pile", "id": 9}
+        await send({**move, "id": 2})
+        after_move = await receive("state")
+        assert after_move["turn"] == 1
+        assert len(after_move["hand"]) == 8
+        await receive("ack")
+        after_computer = await receive("state")
+        assert after_computer["turn"] == 0
+        assert after_computer["deck"] == state["deck"] - 2
+
+        await send({"op": "move", "table": 1, **{k: move[k] for k in ("kind", "card")}})
+        await send({"op": "state", "table": 1})
+        assert (await receive("state"))["turn"] in (0, 1)
+
+        await send({"op": "leave", "table": 1})
+        assert (await receive("closed"))["table"] == 1
+        assert server.tables == {}
+
+        writer.close()
+        await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_human_tables_and_timeout():
+    async def scenario():
+        server = GameServer(port=0, turn_timeout=0.05, max_tables=1)
+        await server.start()
+        send_a, receive_a, writer_a = await open_client(server)
+        send_b, receive_b, writer_b = await open_client(server)
+
+        await send_a({"op": "new", "name": "Alice", "opponent": "human"})
+        table = (await receive_a("joined"))["table"]
+        await send_b({"op": "new", "name": "Bob"})
+        assert (await receive_b("error"))["message"] == "the server is full"
+
+        await send_b({"op": "join", "table": table, "name": "Bob"})
+        assert (await receive_b("joined"))["seat"] == 1
+        assert (await receive_b("state"))["turn"] == 0
+        await send_b({"op": "join", "table": table, "name": "Eve"})
+        assert "full" in (await receive_b("error"))["message"]
+        await send_b({"op": "move", "table": table, "kind": "discard", "card": ["Red", 2]})
+        assert (await receive_b("error"))["message"] == "not your turn"
+
+        # nobody plays, the server plays for both seats
+        while (await receive_b("state"))["turn"] != 0:
+            pass
+        assert server.timeouts >= 2
+        assert server.tables[table].game.players[1].name == "Bob"
+
+        writer_a.close()
+        assert (await receive_b("closed"))["table"] == table
+        writer_b.close()
+        await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_table_view_discard_piles():
+    game = LostCitiesGame("Alice", "Computer", rng=0)
+    game.setup()
+    table = Table(1, game, [None, None])
+    game.play_move("discard", game.players[0].hand[0], "deck")
+    discarded = game.moves[0][1]
+    other = next(card for card in game.players[1].hand if card.color != discarded.color)
+    game.play_move("discard", other, "discard", discarded.color)
+
+    assert table.view(0)["discard"] == {other.color: other.value}
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        GameServer(strategy="unknown")
+
+
+def test_run_local():
+    results = asyncio.run(loadgen.run_local(nb_tables=6, connections=2, computer_workers=2))
+
+    assert results["tables"] == 6
+    assert results["errors"] == 0
+    assert results["moves"] >= 6 * 20
+    assert results["latency_ms"]["new"]["count"] == 6
+    assert results["latency_ms"]["move"]["count"] == results["moves"]
+    stats = results["latency_ms"]["move"]
+    assert stats["p50"] <= stats["p90"] <= stats["p99"] <= stats["max"]
+    assert "moves/s" in loadgen.format_results(results)
+
+
+def test_percentile():
+    assert loadgen.percentile([], 50) == 0.0
+    assert loadgen.percentile([3, 1, 2, 4], 50) == 2
+    assert loadgen.percentile(list(range(1, 101)), 99) == 99
+    assert loadgen.percentile([5], 0) == 5
+
+
+def test_choose_move():
+    state = {"table": 1, "seat": 0, "hand": [["Red", 2], ["Blue", 5]], "boards": [{"Red": [4]}, {}]}
+    assert loadgen.choose_move(state)["card"] == ["Blue", 5]
+    state["hand"] = [["Red", 2]]
+    assert loadgen.choose_move(state)["kind"] == "discard"
+
+
+def test_main(capsys):
+    loadgen.main(["--local", "-n", "2", "-c", "1"])
+    assert "2 tables" in capsys.readouterr().out
+
+
+def test_run_load_rejected_table():
+    async def scenario():
+        server = GameServer(port=0, turn_timeout=None, max_tables=2)
+        await server.start()
+        try:
+            return await asyncio.wait_for(loadgen.run_load(server.host, server.port, nb_tables=3, connections=1), 30)
+        finally:
+            await server.close()
+
+    results = asyncio.run(scenario())
+    assert results["errors"] == 1
+    assert results["latency_ms"]["new"]["count"] == 2
+    assert results["moves"] >= 2 * 20
@@ -0,0 +1,98 @@
+import logging
+import random
+
+import pytest
+
+from lost_cities import logger
+from lost_cities.player import ComputerPlayer, Player
+from lost_cities.tournament import (
+    STRATEGIES,
+    format_results,
+    game_seed,
+    main,
+    play_game,
+    register_strategy,
+    run_shard,
+    run_tournament,
+)
+
+
+@pytest.fixture
+def discard_strategy():
+    @register_strategy("discarder")
+    class DiscardComputerPlayer(ComputerPlayer):
+        def choose_action(self):
+            return ("discard", self.hand[0])
+
+    yield DiscardComputerPlayer
+    del STRATEGIES["discarder"]
+
+
+def test_register_strategy_error():
+    with pytest.raises(TypeError):
+        register_strategy("human")(Player)
+
+
+def test_run_shard(discard_strategy):
+    scores, records, profile = run_shard(("computer", "discarder"), 5, 0, range(4))
+    assert run_shard(("computer", "discarder"), 5, 0, range(4))[0] == scores
+    assert records == [] and profile == {}
+
+    # odd games swap the seats of the same deal, their scores stay in the order of the strategies
+    swapped = play_game(("discarder", "computer"), 5, game_seed(0, 0))
+    assert scores[1] == (swapped.players[1].compute_score()[0], 0)
+    assert all(score[1] == 0 for score in scores)
+
+
+def test_play_game_streams(discard_strategy):
+    class RandomComputer(ComputerPlayer):
+        def __init__(self, name, version=5):
+            super().__init__(name, version)
+            self.rng = random.Random()
+
+    STRATEGIES["random"] = RandomComputer
+    try:
+        games = [play_game(strategies, 5, game_seed(4, 2)) for strategies in [("computer", "random")] * 2]
+        other = play_game(("discarder", "computer"), 5, game_seed(4, 2))
+    finally:
+        del STRATEGIES["random"]
+
+    # same deal whatever the strategies, and the seats draw from their own reproducible streams
+    assert games[0].initial_deck == games[1].initial_deck == other.initial_deck
+    assert games[0].players[1].rng.random() == games[1].players[1].rng.random()
+    assert games[0].initial_deck != play_game(("computer", "computer"), 5, game_seed(4, 3)).initial_deck
+
+
+def test_run_tournament(discard_strategy):
+    results = run_tournament(("computer", "discarder"), nb_games=6, seed=3)
+
+    assert results["games"] == 6
+    assert set(results["players"]) == {"0:computer", "1:discarder"}
+    assert results["players"]["1:discarder"]["max"] == 0
+    assert results["players"]["0:computer"]["wins"] + results["players"]["1:discarder"]["wins"] + results["draws"] == 6
+    assert results["games_per_second"] > 0
+    assert logger.level == logging.DEBUG
+
+
+def test_run_tournament_workers():
+    sequential = run_tournament(("computer", "computer"), nb_games=8, seed=5)
+    parallel = run_tournament(("computer", "computer"), nb_games=8, workers=2, seed=5, chunk_size=3)
+
+    assert sequential["players"] == parallel["players"]
+
+
+def test_run_tournament_unknown_strategy():
+    with pytest.raises(ValueError):
+        run_tournament(("computer", "dummy"), nb_games=1)
+
+
+def test_main(capsys):
+    main(["computer", "-n", "2"])
+
+    output = capsys.readouterr().out
+    assert "2 games in" in output
+    assert "0:computer: win rate" in output
+    assert format_results(run_tournament(("computer", "computer"), nb_games=1)).count("\n") == 2
+
+    with pytest.raises(SystemExit):
+        main(["computer", "computer", "computer"])
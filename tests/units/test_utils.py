@@ -0,0 +1,26 @@
+import numpy as np
+import pygame
+
+from lost_cities.gui.utils import build_sprite_cache, extract_card, get_card_image, get_card_surface, get_deck_surface
+
+
+def test_get_card_image():
+    img = get_card_image("Red", 7)
+    assert img is get_card_image("Red", 7)
+    assert np.array_equal(img, extract_card("Red", 7))
+    assert not img.flags.writeable
+
+
+def test_get_card_surface():
+    upright = get_card_surface("Yellow", 0)
+    assert isinstance(upright, pygame.Surface)
+    assert upright.get_size() == (85, 133)
+    assert upright is get_card_surface("Yellow", 0)
+    assert get_deck_surface().get_size() == (133, 85)
+
+
+def test_build_sprite_cache():
+    get_card_surface.cache_clear()
+    build_sprite_cache()
+    assert get_card_surface.cache_info().currsize == 50
+    assert get_deck_surface.cache_info().currsize == 1